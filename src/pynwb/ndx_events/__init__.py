@@ -24,12 +24,31 @@ from .events import (
     DurationVectorData,
     CategoricalVectorData,
     MeaningsTable,
+    EventCounts,
     EventsTable,
     NdxEventsNWBFile,
 )
 
+from .table_builder import ColumnBuffer, EventsTableBuilder
+from .sparse import SparseDurations
+from .meanings import InternedMeanings, intern_meanings, clear_meanings_cache
+from .timeseries import get_sample_indices, get_snippets
+from .file_pool import NWBFilePool, get_default_pool
+from .instrumentation import (
+    enable_instrumentation,
+    disable_instrumentation,
+    is_instrumentation_enabled,
+    get_instrumentation_stats,
+    reset_instrumentation_stats,
+)
 
-from .ndx_events_nwb_file_io import NdxEventsNWBFileMap
+from .ndx_events_nwb_file_io import NdxEventsNWBFileMap, read_events_only
+from .events_table_io import (
+    EventsTableMap,
+    TimestampVectorDataMap,
+    CategoricalVectorDataMap,
+    MeaningsTableMap,
+)
 
 
 # Remove these functions from the package
@@ -0,0 +1,85 @@
+"""An asyncio API to read events from many NWB files concurrently without blocking the event loop.
+
+The blocking HDF5 reads run in a bounded thread pool. Concurrent requests for the same events are coalesced into a
+single read, and the files are kept open in the process-level NWBFilePool (see ndx_events.file_pool).
+
+Example::
+
+    import asyncio
+    from ndx_events.aio import read_events
+
+    async def main(paths):
+        return await asyncio.gather(*(read_events(path, "stimulus_events", t_start=10.0) for path in paths))
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from .file_pool import get_default_pool
+
+DEFAULT_MAX_WORKERS = 4
+
+_lock = threading.Lock()
+_max_workers = DEFAULT_MAX_WORKERS
+_executor = None
+_in_flight = weakref.WeakKeyDictionary()  # event loop -> {request key: future}
+
+
+def configure(max_workers=None, max_open_files=None):
+    """Set the maximum number of concurrent reads and the maximum number of open files of the default NWBFilePool.
+
+    The thread pool is recreated on the next read.
+    """
+    global _max_workers, _executor
+    with _lock:
+        if max_workers is not None:
+            _max_workers = max_workers
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+                _executor = None
+        if max_open_files is not None:
+            get_default_pool().max_open = max_open_files
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix="ndx_events.aio")
+        return _executor
+
+
+def _read_events(path, table, columns, t_start, t_stop, decode_categoricals):
+    with get_default_pool().open(path) as nwbfile:
+        return nwbfile.events[table].read_events(
+            columns=columns, t_start=t_start, t_stop=t_stop, decode_categoricals=decode_categoricals
+        )
+
+
+async def read_events(path, table, columns=None, t_start=None, t_stop=None, decode_categoricals=False):
+    """Read the given columns of the events in a time window of an EventsTable of an NWB file.
+
+    The arguments after table are passed to EventsTable.read_events. The read runs in a thread pool. Concurrent calls
+    with the same arguments share a single read and return the same DataFrame, which should therefore not be
+    modified in place.
+    """
+    loop = asyncio.get_running_loop()
+    key = (
+        os.path.abspath(path),
+        table,
+        None if columns is None else tuple(columns),
+        t_start,
+        t_stop,
+        decode_categoricals,
+    )
+    in_flight = _in_flight.setdefault(loop, dict())
+    future = in_flight.get(key)
+    if future is None:
+        future = loop.run_in_executor(_get_executor(), _read_events, *key)
+        in_flight[key] = future
+        future.add_done_callback(lambda _: in_flight.pop(key, None))
+    # a cancelled caller must not cancel the read shared with the other callers
+    return await asyncio.shield(future)
@@ -0,0 +1,298 @@
+"""A local SQLite catalog of the EventsTable objects of many NWB files, to find the files and tables that contain
+events of interest without opening the files.
+
+For each file, the catalog stores the number of events and the time range of each EventsTable, and for each value
+of each CategoricalVectorData column, its meaning, its number of events, and the time range of its events. The
+catalog is updated incrementally: only the files that are new or were modified since they were last scanned are
+read, in parallel.
+
+Example::
+
+    from ndx_events.catalog import EventsCatalog
+
+    with EventsCatalog("events_catalog.sqlite") as catalog:
+        catalog.update(glob.glob("archive/**/*.nwb", recursive=True), max_workers=8)
+        matches = catalog.find(column="pulse_value", value=66, t_start=3600.0)
+
+or, from the command line::
+
+    ndx-events-catalog events_catalog.sqlite archive/*.nwb --jobs 8
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pynwb import NWBHDF5IO
+
+from .events import CategoricalVectorData
+from .instrumentation import instrumented
+from .meanings import intern_meanings
+from .ndx_events_nwb_file_io import read_events_only
+from .summary import compute_timestamp_summary
+from .utils import DEFAULT_CHUNK_SIZE
+
+# Incremented when the schema of the catalog changes, so that catalogs with an older schema are rebuilt
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    identifier TEXT,
+    session_start_time TEXT
+);
+CREATE TABLE IF NOT EXISTS tables (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    table_name TEXT NOT NULL,
+    description TEXT,
+    num_events INTEGER NOT NULL,
+    min_timestamp REAL,
+    max_timestamp REAL,
+    PRIMARY KEY (path, table_name)
+);
+CREATE TABLE IF NOT EXISTS categories (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    table_name TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    value,
+    meaning TEXT,
+    count INTEGER NOT NULL,
+    min_timestamp REAL,
+    max_timestamp REAL
+);
+CREATE INDEX IF NOT EXISTS categories_value ON categories (column_name, value);
+"""
+
+
+def _compute_category_stats(table, columns, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Count the events of each value of the given CategoricalVectorData columns and find their time range in a
+    single streaming pass over the 'timestamp' column and the columns."""
+    timestamp = table["timestamp"].data
+    stats = {column.name: list() for column in columns}
+    for start in range(0, len(timestamp), chunk_size):
+        stop = min(start + chunk_size, len(timestamp))
+        times = np.asarray(timestamp[start:stop], dtype=np.float64)
+        for column in columns:
+            chunk = pd.DataFrame({"value": np.asarray(column.data[start:stop]), "time": times})
+            stats[column.name].append(chunk.groupby("value")["time"].agg(["size", "min", "max"]))
+    rows = list()
+    for column in columns:
+        interned = intern_meanings(column.meanings)
+        if stats[column.name]:
+            by_value = pd.concat(stats[column.name]).groupby(level=0).agg({"size": "sum", "min": "min", "max": "max"})
+        else:
+            by_value = pd.DataFrame(columns=["size", "min", "max"])
+        # list the values of the MeaningsTable that do not occur, so that the catalog lists all categories
+        values = list(interned.values) + [value for value in by_value.index.tolist() if value not in interned]
+        for value in values:
+            count, min_time, max_time = 0, None, None
+            if value in by_value.index:
+                count, min_time, max_time = by_value.loc[value].tolist()
+            rows.append(
+                (
+                    table.name,
+                    column.name,
+                    value.item() if isinstance(value, np.generic) else value,
+                    interned[value] if value in interned else None,
+                    int(count),
+                    None if min_time is None or np.isnan(min_time) else float(min_time),
+                    None if max_time is None or np.isnan(max_time) else float(max_time),
+                )
+            )
+    return rows
+
+
+def scan_file(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Read the catalog entries of the EventsTable objects of an NWB file.
+
+    Only the "events" group of the file is read. The number of events and the time range of each table are taken
+    from its precomputed summary attributes when they were written, and computed otherwise. Returns a dictionary
+    with the keys "path", "mtime_ns", "size", "identifier", "session_start_time", "tables", and "categories".
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    tables = list()
+    categories = list()
+    with NWBHDF5IO(path, mode="r") as io:
+        nwbfile = read_events_only(io)
+        for table in getattr(nwbfile, "events", dict()).values():
+            if table.num_events is not None:
+                num_events, min_timestamp, max_timestamp = table.num_events, table.min_timestamp, table.max_timestamp
+            else:
+                num_events, min_timestamp, max_timestamp, _ = compute_timestamp_summary(table["timestamp"], chunk_size)
+            tables.append(
+                (
+                    table.name,
+                    table.description,
+                    int(num_events),
+                    None if min_timestamp is None else float(min_timestamp),
+                    None if max_timestamp is None else float(max_timestamp),
+                )
+            )
+            columns = [column for column in table.columns if isinstance(column, CategoricalVectorData)]
+            categories.extend(_compute_category_stats(table, columns, chunk_size))
+        session_start_time = nwbfile.session_start_time
+        return dict(
+            path=path,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            identifier=nwbfile.identifier,
+            session_start_time=None if session_start_time is None else session_start_time.isoformat(),
+            tables=tables,
+            categories=categories,
+        )
+
+
+def _scan_file(args):
+    return scan_file(*args)
+
+
+class EventsCatalog:
+    """A catalog of the EventsTable objects of many NWB files, stored in a SQLite database at path.
+
+    The catalog has three tables: "files" (path, mtime_ns, size, identifier, session_start_time), "tables" (path,
+    table_name, description, num_events, min_timestamp, max_timestamp), and "categories" (path, table_name,
+    column_name, value, meaning, count, min_timestamp, max_timestamp). The paths are absolute. The database can be
+    queried directly with the connection attribute or with find.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            with self.connection:
+                for name in ("categories", "tables", "files"):
+                    self.connection.execute("DROP TABLE IF EXISTS %s" % name)
+                self.connection.execute("PRAGMA user_version = %d" % SCHEMA_VERSION)
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    @instrumented("EventsCatalog.update")
+    def update(self, paths, max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Scan the given NWB files that are not in the catalog or whose modification time or size changed since
+        they were scanned, in parallel, one file per worker process.
+
+        If max_workers is 1, the files are scanned in the current process. Returns the absolute paths of the scanned
+        files.
+        """
+        query = "SELECT path, mtime_ns, size FROM files"
+        known = {path: (mtime_ns, size) for path, mtime_ns, size in self.connection.execute(query)}
+        tasks = list()
+        for path in dict.fromkeys(os.path.abspath(path) for path in paths):
+            stat = os.stat(path)
+            if known.get(path) != (stat.st_mtime_ns, stat.st_size):
+                tasks.append((path, chunk_size))
+        if max_workers == 1 or len(tasks) <= 1:
+            results = [_scan_file(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_scan_file, tasks))
+        with self.connection:
+            for result in results:
+                self._insert(result)
+        return [result["path"] for result in results]
+
+    def _insert(self, result):
+        path = result["path"]
+        self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+        self.connection.execute(
+            "INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+            (path, result["mtime_ns"], result["size"], result["identifier"], result["session_start_time"]),
+        )
+        self.connection.executemany(
+            "INSERT INTO tables VALUES (?, ?, ?, ?, ?, ?)", [(path,) + row for row in result["tables"]]
+        )
+        self.connection.executemany(
+            "INSERT INTO categories VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [(path,) + row for row in result["categories"]]
+        )
+
+    def remove(self, paths):
+        """Remove the given files from the catalog."""
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM files WHERE path = ?", [(os.path.abspath(path),) for path in paths]
+            )
+
+    def prune(self):
+        """Remove the files that no longer exist from the catalog. Returns their paths."""
+        missing = [path for (path,) in self.connection.execute("SELECT path FROM files") if not os.path.exists(path)]
+        self.remove(missing)
+        return missing
+
+    def files(self):
+        """Get the files in the catalog as a pandas DataFrame."""
+        return pd.read_sql_query("SELECT * FROM files ORDER BY path", self.connection)
+
+    def find(self, table=None, column=None, value=None, meaning=None, t_start=None, t_stop=None):
+        """Find the EventsTable objects that have events in the time window [t_start, t_stop), without opening the
+        files.
+
+        If column, value, or meaning is given, only the events of the matching values of the CategoricalVectorData
+        columns are considered, and one row is returned per matching value; otherwise, one row is returned per
+        table. Returns a pandas DataFrame with the columns of the "tables" or "categories" table of the catalog and
+        the identifier of the file.
+
+        Since the catalog stores only the time range of the events of each table and value, a match with both
+        t_start and t_stop has events before t_stop and events at or after t_start, but not necessarily in the
+        window. A match with only one of them is exact.
+        """
+        by_category = column is not None or value is not None or meaning is not None
+        conditions = ["c.count > 0"] if by_category else ["c.num_events > 0"]
+        parameters = list()
+        for name, argument in (("table_name", table), ("column_name", column), ("value", value), ("meaning", meaning)):
+            if argument is not None:
+                conditions.append("c.%s = ?" % name)
+                parameters.append(argument.item() if isinstance(argument, np.generic) else argument)
+        if t_start is not None:
+            conditions.append("c.max_timestamp >= ?")
+            parameters.append(float(t_start))
+        if t_stop is not None:
+            conditions.append("c.min_timestamp < ?")
+            parameters.append(float(t_stop))
+        query = (
+            "SELECT f.identifier, c.* FROM %s AS c JOIN files AS f ON c.path = f.path WHERE %s "
+            "ORDER BY c.path, c.table_name" % ("categories" if by_category else "tables", " AND ".join(conditions))
+        )
+        return pd.read_sql_query(query, self.connection, params=parameters)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="ndx-events-catalog",
+        description="Add the EventsTable objects of NWB files to a SQLite catalog, scanning only the files that are "
+        "new or were modified since they were last scanned.",
+    )
+    parser.add_argument("catalog", help="the SQLite file of the catalog, which is created if it does not exist")
+    parser.add_argument("paths", nargs="*", help="the NWB files to scan")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="the number of files to scan in parallel")
+    parser.add_argument("--prune", action="store_true", help="remove the files that no longer exist")
+    args = parser.parse_args(argv)
+    with EventsCatalog(args.catalog) as catalog:
+        scanned = catalog.update(args.paths, max_workers=args.jobs)
+        removed = catalog.prune() if args.prune else []
+        sys.stdout.write(
+            "Scanned %d files, removed %d files; the catalog has %d files.\n"
+            % (len(scanned), len(removed), len(catalog))
+        )
+
+
+if __name__ == "__main__":
+    main()
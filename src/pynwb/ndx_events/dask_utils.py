@@ -0,0 +1,120 @@
+"""Functions to read the columns of an EventsTable lazily as a Dask DataFrame.
+
+Dask is an optional dependency. Install it with ``pip install ndx-events[dask]``.
+"""
+
+from contextlib import contextmanager
+
+import h5py
+import numpy as np
+import pandas as pd
+
+from .meanings import intern_meanings
+from .sparse import SparseDurations
+from .utils import DEFAULT_CHUNK_SIZE, get_data
+
+
+class _ColumnSource:
+    """A picklable reference to the data of a column that reads a range of rows.
+
+    HDF5 datasets are referenced by file name and path and opened on each read, so that partitions can be read in
+    other processes. Other data are kept as they are.
+    """
+
+    def __init__(self, data):
+        if isinstance(data, h5py.Dataset):
+            self.filename, self.path, self.data = data.file.filename, data.name, None
+        else:
+            self.filename, self.path, self.data = None, None, data
+
+    @contextmanager
+    def open(self):
+        """Get the data, opening its file if it is an HDF5 dataset."""
+        if self.data is not None:
+            yield self.data
+            return
+        with h5py.File(self.filename, "r") as f:
+            dataset = f[self.path]
+            if h5py.check_string_dtype(dataset.dtype) is not None:
+                dataset = dataset.asstr()
+            yield dataset
+
+    def read(self, start, stop):
+        with self.open() as data:
+            return np.asarray(data[start:stop])
+
+
+class _SparseDurationsSource:
+    """A picklable reference to sparse durations that reads the durations of a range of rows."""
+
+    def __init__(self, durations):
+        self.rows = _ColumnSource(durations.rows)
+        self.values = _ColumnSource(durations.values)
+        self.length = len(durations)
+
+    def read(self, start, stop):
+        with self.rows.open() as rows, self.values.open() as values:
+            return SparseDurations(rows, values, self.length)[start:stop]
+
+
+def _read_partition(row_range, sources, categories):
+    start, stop = row_range
+    data = dict()
+    for name, source in sources.items():
+        values = source.read(start, stop)
+        if name in categories:
+            values = pd.Categorical(values, categories=categories[name])
+        data[name] = values
+    return pd.DataFrame(data, index=pd.RangeIndex(start, stop))
+
+
+def get_partition_size(data, partition_size=DEFAULT_CHUNK_SIZE):
+    """Get the number of rows of the partitions of a column: a multiple of its HDF5 chunk length, if it is chunked,
+    that is close to partition_size."""
+    chunks = getattr(get_data(data), "chunks", None)
+    if not chunks:
+        return partition_size
+    return chunks[0] * max(partition_size // chunks[0], 1)
+
+
+def events_table_to_dask(table, columns=None, partition_size=DEFAULT_CHUNK_SIZE):
+    """Create a Dask DataFrame that reads the given columns of an EventsTable lazily.
+
+    The partitions are ranges of rows aligned with the HDF5 chunks of the 'timestamp' column, and the index is the
+    row number, so the divisions are known. CategoricalVectorData columns become categorical columns whose
+    categories are the values of their MeaningsTable; values that are not in the MeaningsTable become NaN. Sparse
+    durations are read as the 'duration' column. Ragged columns are not supported.
+    """
+    try:
+        import dask.dataframe as dd
+    except ImportError as e:
+        raise ImportError("EventsTable.to_dask requires Dask. Install it with 'pip install ndx-events[dask]'.") from e
+    # import here to avoid a circular import
+    from .events import CategoricalVectorData, _get_colnames
+
+    colnames = list(_get_colnames(table)) if columns is None else list(columns)
+    sources = dict()
+    categories = dict()
+    for name in colnames:
+        column = table[name]
+        if column.name != name:  # a ragged column, whose VectorIndex has the name of the column
+            raise ValueError("Cannot read the ragged column '%s' with Dask." % name)
+        data = get_data(column)
+        sources[name] = _SparseDurationsSource(data) if isinstance(data, SparseDurations) else _ColumnSource(data)
+        if isinstance(column, CategoricalVectorData):
+            categories[name] = list(intern_meanings(column.meanings).values)
+
+    n = len(table)
+    step = get_partition_size(table["timestamp"], partition_size)
+    row_ranges = [(start, min(start + step, n)) for start in range(0, n, step)] or [(0, 0)]
+    meta = _read_partition((0, min(n, 1)), sources, categories).iloc[:0]
+    divisions = [start for start, _ in row_ranges] + [max(n - 1, 0)]
+    return dd.from_map(
+        _read_partition,
+        row_ranges,
+        sources=sources,
+        categories=categories,
+        meta=meta,
+        divisions=divisions,
+        enforce_metadata=False,
+    )
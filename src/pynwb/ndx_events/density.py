@@ -0,0 +1,97 @@
+"""Functions to compute and query the multi-resolution pyramid of event counts stored with an EventsTable."""
+
+import math
+import numpy as np
+
+from .summary import compute_timestamp_summary
+from .utils import DEFAULT_CHUNK_SIZE, get_data, iter_chunks
+
+
+def compute_event_counts(table, bin_width, category_column=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Compute the pyramid of event counts of an EventsTable by streaming over its columns.
+
+    The finest level is computed in a single pass over the 'timestamp' column (and the category column, if given),
+    and every coarser level is computed by summing pairs of bins of the level below it, until a level with a single
+    bin is reached.
+
+    Returns a tuple of (counts, start_time, level_offsets), where counts is a 2D NumPy integer array with the levels
+    concatenated along the first dimension as described in the EventCounts spec.
+    """
+    if bin_width <= 0:
+        raise ValueError("bin_width must be positive, got %s." % bin_width)
+    timestamp_summary = compute_timestamp_summary(table["timestamp"], chunk_size)
+    if timestamp_summary is None:
+        raise ValueError("Cannot compute event counts because the 'timestamp' column cannot be read.")
+    num_events, min_timestamp, max_timestamp, _ = timestamp_summary
+    values = sorter = None
+    if category_column is not None:
+        values = np.asarray(table[category_column].meanings["value"].data[:])
+        sorter = np.argsort(values)
+
+    num_counts = 1 if values is None else len(values) + 1
+    if num_events == 0:
+        start_time, num_bins = 0.0, 1
+    else:
+        start_time = math.floor(min_timestamp / bin_width) * bin_width
+        num_bins = int((max_timestamp - start_time) // bin_width) + 1
+
+    level = np.zeros((num_bins, num_counts), dtype=np.int64)
+    timestamps = iter_chunks(get_data(table["timestamp"]), chunk_size)
+    categories = None if values is None else iter_chunks(get_data(table[category_column]), chunk_size)
+    for chunk in timestamps:
+        bins = np.clip(((chunk - start_time) // bin_width).astype(np.int64), 0, num_bins - 1)
+        level[:, 0] += np.bincount(bins, minlength=num_bins)
+        if categories is not None:
+            category_chunk = next(categories)
+            # map each value to its column in the counts array, dropping values not listed in the MeaningsTable
+            positions = np.searchsorted(values, category_chunk, sorter=sorter)
+            positions = np.clip(positions, 0, len(values) - 1)
+            found = values[sorter[positions]] == category_chunk
+            columns = sorter[positions[found]] + 1
+            flat = np.bincount(bins[found] * num_counts + columns, minlength=num_bins * num_counts)
+            level += flat.reshape(num_bins, num_counts)
+
+    levels = [level]
+    while len(level) > 1:
+        if len(level) % 2:
+            level = np.concatenate([level, np.zeros((1, num_counts), dtype=level.dtype)])
+        level = level[0::2] + level[1::2]
+        levels.append(level)
+    level_offsets = np.cumsum([0] + [len(lvl) for lvl in levels])
+    return np.concatenate(levels), float(start_time), level_offsets
+
+
+def select_level(event_counts, t_start, t_stop, num_bins):
+    """Return the coarsest level of the pyramid whose bins are no wider than (t_stop - t_start) / num_bins."""
+    num_levels = len(event_counts.level_offsets) - 1
+    target_width = (t_stop - t_start) / num_bins
+    if target_width < event_counts.bin_width:
+        return 0
+    return min(int(math.floor(math.log2(target_width / event_counts.bin_width))), num_levels - 1)
+
+
+def query_event_counts(event_counts, t_start, t_stop, num_bins=None, level=None, column=0):
+    """Get the number of events in the bins of one level of the pyramid that overlap the window [t_start, t_stop).
+
+    If level is None, the coarsest level with at least num_bins bins in the window is used, so that only
+    O(num_bins) values are read. The column selects the total counts (0) or the counts of one category (i + 1).
+
+    Returns a tuple of (bin_edges, counts), where bin_edges has one more element than counts.
+    """
+    if t_stop <= t_start:
+        raise ValueError("t_stop (%s) must be greater than t_start (%s)." % (t_stop, t_start))
+    if level is None:
+        if num_bins is None:
+            raise ValueError("Either num_bins or level must be provided.")
+        level = select_level(event_counts, t_start, t_stop, num_bins)
+    level_offsets = np.asarray(event_counts.level_offsets)
+    if not 0 <= level < len(level_offsets) - 1:
+        raise ValueError("level must be between 0 and %d, got %d." % (len(level_offsets) - 2, level))
+    width = event_counts.bin_width * 2**level
+    level_length = int(level_offsets[level + 1] - level_offsets[level])
+    first = int(np.clip(math.floor((t_start - event_counts.start_time) / width), 0, level_length))
+    last = int(np.clip(math.ceil((t_stop - event_counts.start_time) / width), first, level_length))
+    offset = int(level_offsets[level])
+    counts = np.asarray(event_counts.data[offset + first : offset + last, column])
+    bin_edges = event_counts.start_time + width * np.arange(first, last + 1)
+    return bin_edges, counts
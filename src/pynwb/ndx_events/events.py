@@ -1,23 +1,122 @@
+import functools
+from time import perf_counter
+
 from pynwb import get_class, register_class, NWBFile
+from hdmf.common import DynamicTable
 from hdmf.utils import docval, get_docval
+import h5py
+import numpy as np
 import pandas as pd
 
+from .instrumentation import emit, instrumented, is_instrumentation_enabled, timer
+from .dask_utils import events_table_to_dask
+from .density import compute_event_counts, query_event_counts
+from .meanings import intern_meanings
+from .sequences import find_sequences, sequences_to_events_table
+from .query import compute_row_index, get_row_index_name, scan_rows, find_time_window, read_rows
+from .sparse import SparseDurations
+from .summary import compute_events_table_summary
+from .utils import DEFAULT_CHUNK_SIZE
+
 
 TimestampVectorData = get_class("TimestampVectorData", "ndx-events")
 DurationVectorData = get_class("DurationVectorData", "ndx-events")
 CategoricalVectorData = get_class("CategoricalVectorData", "ndx-events")
 MeaningsTable = get_class("MeaningsTable", "ndx-events")
+EventCounts = get_class("EventCounts", "ndx-events")
 EventsTable = get_class("EventsTable", "ndx-events")
 
 
+def _validate_sparse_durations(table):
+    """Check that the 'duration_rows' and 'duration_values' datasets of the table are given together, have the same
+    length, and are not given with a 'duration' column, and that the rows are sorted and in range.
+
+    The rows are only checked if they are in memory, so that reading a table from a file does not read them.
+    """
+    rows, values = table.duration_rows, table.duration_values
+    if rows is None and values is None:
+        return
+    if rows is None or values is None:
+        raise ValueError("EventsTable '%s' must have both duration_rows and duration_values, or neither." % table.name)
+    if "duration" in table.colnames:
+        raise ValueError(
+            "EventsTable '%s' cannot have both a 'duration' column and sparse durations in duration_rows and "
+            "duration_values." % table.name
+        )
+    if len(rows) != len(values):
+        raise ValueError(
+            "The duration_rows (%d) and duration_values (%d) of EventsTable '%s' must have the same length."
+            % (len(rows), len(values), table.name)
+        )
+    if isinstance(rows, h5py.Dataset) or len(rows) == 0:
+        return
+    rows = np.asarray(rows)
+    if np.any(rows[1:] <= rows[:-1]):
+        raise ValueError("The duration_rows of EventsTable '%s' must be strictly increasing." % table.name)
+    num_rows = len(table.id.data) if hasattr(table.id.data, "__len__") else None
+    if rows[0] < 0 or (num_rows is not None and rows[-1] >= num_rows):
+        raise ValueError(
+            "The duration_rows of EventsTable '%s' must be between 0 and the number of rows of the table." % table.name
+        )
+
+
+_events_table_init = EventsTable.__init__
+
+
+@functools.wraps(_events_table_init)
+def __init__(self, *args, **kwargs):
+    _events_table_init(self, *args, **kwargs)
+    _validate_sparse_durations(self)
+
+
+EventsTable.__init__ = __init__
+del __init__
+
+
+def _has_sparse_durations(table):
+    """Return True if the durations of the table are stored in its 'duration_rows' and 'duration_values' datasets."""
+    return "duration" not in table.colnames and table.duration_values is not None
+
+
+def _get_sparse_duration_column(table):
+    """Get a DurationVectorData over the sparse durations of the table, which is not a column of the table."""
+    return DurationVectorData(
+        name="duration",
+        description="The duration of each event, in seconds, with NaN for the events without a duration.",
+        data=table.get_durations(),
+    )
+
+
+def _add_sparse_durations(table, df, rows):
+    """Add the sparse durations of the given rows of the table to a DataFrame of these rows, after the timestamps."""
+    position = df.columns.get_loc("timestamp") + 1 if "timestamp" in df.columns else len(df.columns)
+    df.insert(position, "duration", table.get_durations()[rows])
+    return df
+
+
+def _get_colnames(table):
+    """Get the names of the columns of the table, including 'duration' if its durations are stored sparsely."""
+    return tuple(table.colnames) + (("duration",) if _has_sparse_durations(table) else ())
+
+
 # Replace the __getitem__ method with a custom one from DynamicTable instead of the one from MultiContainerInterface
 # NOTE: When the NWBEP001 is merged into the core NWB schema and software, this class will be explicitly defined
 # in PyNWB and will use the following __getitem__ method.
 def __new_getitem__(self, key):
-    """Get the table row, column, or selection of cells with the given name."""
+    """Get the table row, column, or selection of cells with the given name.
+
+    If the durations are stored sparsely, they are returned as the 'duration' column of the table.
+    """
+    if _has_sparse_durations(self):
+        if isinstance(key, str) and key == "duration":
+            return _get_sparse_duration_column(self)
+        if isinstance(key, tuple) and isinstance(key[1], str) and key[1] == "duration":
+            return self.get_durations()[key[0]]
     ret = self.get(key)
     if ret is None:
         raise KeyError(key)
+    if isinstance(ret, pd.DataFrame) and _has_sparse_durations(self):
+        ret = _add_sparse_durations(self, ret, key)
     return ret
 
 
@@ -25,6 +124,548 @@ EventsTable.__getitem__ = __new_getitem__
 del __new_getitem__
 
 
+def __get_duration(self):
+    # DynamicTable sets the attribute of each column, or None for the optional predefined columns that were not
+    # added, and warns if the attribute of a column that it adds already exists
+    if "_duration_column" not in self.__dict__:
+        raise AttributeError("duration")
+    column = self.__dict__["_duration_column"]
+    if column is None and _has_sparse_durations(self):
+        return _get_sparse_duration_column(self)
+    return column
+
+
+def __set_duration(self, column):
+    self.__dict__["_duration_column"] = column
+
+
+EventsTable.duration = property(
+    __get_duration,
+    __set_duration,
+    doc="The 'duration' column, or a DurationVectorData over the durations if they are stored sparsely.",
+)
+del __get_duration, __set_duration
+
+
+@instrumented("EventsTable.summary")
+def __summary(self):
+    """Get the summary statistics of the table.
+
+    If the table was read from a file that stores the precomputed summary attributes, only those attributes (and the
+    small "value" columns of the MeaningsTable objects) are read. Otherwise, the summary is computed by streaming
+    over the columns of the table.
+
+    Returns a dictionary with the keys "num_events", "min_timestamp", "max_timestamp", "duration_quantile_levels",
+    "duration_quantiles", and "value_counts". "value_counts" maps the name of each CategoricalVectorData column to a
+    dictionary mapping each value of its MeaningsTable to its count.
+    """
+    if self.num_events is None:
+        return compute_events_table_summary(self)
+    value_counts = dict()
+    for column in self.columns:
+        if isinstance(column, CategoricalVectorData) and column.value_counts is not None:
+            values = column.meanings["value"].data[:]
+            value_counts[column.name] = dict(zip(np.asarray(values).tolist(), np.asarray(column.value_counts).tolist()))
+    return dict(
+        num_events=int(self.num_events),
+        min_timestamp=None if self.min_timestamp is None else float(self.min_timestamp),
+        max_timestamp=None if self.max_timestamp is None else float(self.max_timestamp),
+        duration_quantile_levels=(
+            None if self.duration_quantile_levels is None else np.asarray(self.duration_quantile_levels).tolist()
+        ),
+        duration_quantiles=None if self.duration_quantiles is None else np.asarray(self.duration_quantiles).tolist(),
+        value_counts=value_counts,
+    )
+
+
+EventsTable.summary = __summary
+del __summary
+
+
+def __get_durations(self):
+    """Get the durations of the events, with NaN for the events without a duration.
+
+    Returns the data of the 'duration' column, or a SparseDurations over the 'duration_rows' and 'duration_values'
+    datasets if the durations are stored sparsely, or None if the table has no durations.
+    """
+    if "duration" in self.colnames:
+        return self["duration"].data
+    if self.duration_values is not None:
+        return SparseDurations(self.duration_rows, self.duration_values, len(self))
+    return None
+
+
+EventsTable.get_durations = __get_durations
+del __get_durations
+
+
+@docval(
+    {"name": "bin_width", "type": (int, float), "doc": "The width of the bins of the finest level, in seconds"},
+    {
+        "name": "category_column",
+        "type": str,
+        "doc": "The name of a CategoricalVectorData column by which to also count the events",
+        "default": None,
+    },
+    returns="the EventCounts pyramid that was added to this table",
+    rtype=EventCounts,
+)
+def __build_event_counts(self, **kwargs):
+    """Compute the multi-resolution pyramid of event counts and store it with this table.
+
+    The pyramid should be built after all rows have been added; adding a row drops it.
+    """
+    bin_width, category_column = kwargs["bin_width"], kwargs["category_column"]
+    if category_column is not None and not isinstance(self[category_column], CategoricalVectorData):
+        raise ValueError("Column '%s' is not a CategoricalVectorData column." % category_column)
+    counts, start_time, level_offsets = compute_event_counts(self, bin_width, category_column)
+    _drop_event_counts(self)
+    data = self["timestamp"].data
+    if _is_writable_dataset(data) and "event_counts" in data.parent:
+        # HDF5IO does not rewrite datasets that were already written, so remove the dataset from the file so that the
+        # new pyramid is written
+        del data.parent["event_counts"]
+    self.event_counts = EventCounts(
+        name="event_counts",
+        data=counts,
+        start_time=start_time,
+        bin_width=bin_width,
+        level_offsets=level_offsets,
+        category_column=category_column,
+    )
+    return self.event_counts
+
+
+EventsTable.build_event_counts = __build_event_counts
+del __build_event_counts
+
+
+@docval(
+    {"name": "t_start", "type": (int, float), "doc": "The start of the time window, in seconds"},
+    {"name": "t_stop", "type": (int, float), "doc": "The end of the time window, in seconds"},
+    {"name": "num_bins", "type": int, "doc": "The minimum number of bins to return, e.g., pixels", "default": None},
+    {"name": "level", "type": int, "doc": "The level of the pyramid to read, instead of num_bins", "default": None},
+    {"name": "category", "type": None, "doc": "Count only events with this category value", "default": None},
+    returns="a tuple of the bin edges and the number of events in each bin",
+    rtype=tuple,
+)
+def __get_event_counts(self, **kwargs):
+    """Get the number of events in time bins that cover a time window, reading only the precomputed pyramid.
+
+    The coarsest level of the pyramid with at least num_bins bins in the window is read, so the cost of the query
+    depends on the number of bins requested, not on the number of events. Use build_event_counts to compute the
+    pyramid before writing the table.
+    """
+    if self.event_counts is None:
+        raise ValueError("EventsTable '%s' has no event counts. Call build_event_counts first." % self.name)
+    column = 0
+    category = kwargs.pop("category")
+    if category is not None:
+        if self.event_counts.category_column is None:
+            raise ValueError("The event counts of EventsTable '%s' are not counted by category." % self.name)
+        values = np.asarray(self[self.event_counts.category_column].meanings["value"].data[:]).tolist()
+        if category not in values:
+            raise ValueError("Category value %r is not in the MeaningsTable." % (category,))
+        column = values.index(category) + 1
+    return query_event_counts(self.event_counts, column=column, **kwargs)
+
+
+EventsTable.get_event_counts = __get_event_counts
+del __get_event_counts
+
+
+@docval(
+    {"name": "name", "type": str, "doc": "The name of the column"},
+    {"name": "description", "type": str, "doc": "A description of the column"},
+    {"name": "meanings", "type": MeaningsTable, "doc": "The MeaningsTable with the meanings of the values"},
+    {"name": "data", "type": ("array_data", "data"), "doc": "The values of the column", "default": None},
+    {"name": "filter_values", "type": ("array_data", "data"), "doc": "Missing or invalid values", "default": None},
+    returns="the CategoricalVectorData column that was added",
+    rtype=CategoricalVectorData,
+)
+def __add_categorical_column(self, **kwargs):
+    """Add a CategoricalVectorData column whose meanings are given by the MeaningsTable.
+
+    If the MeaningsTable is not yet stored in any EventsTable, it is added to this table. Otherwise, the column
+    references the MeaningsTable stored in the other table, so that a MeaningsTable shared by multiple columns and
+    tables is written only once to the file.
+    """
+    meanings = kwargs["meanings"]
+    if meanings.parent is None:
+        self.add_meanings_tables(meanings)
+    if kwargs["data"] is None:
+        kwargs.pop("data")
+    self.add_column(col_cls=CategoricalVectorData, **kwargs)
+    return self[kwargs["name"]]
+
+
+EventsTable.add_categorical_column = __add_categorical_column
+del __add_categorical_column
+
+
+def _get_categorical_column(table, column):
+    col = table[column]
+    if not isinstance(col, CategoricalVectorData):
+        raise ValueError("Column '%s' is not a CategoricalVectorData column." % column)
+    return col
+
+
+@docval(
+    {"name": "column", "type": str, "doc": "The name of the CategoricalVectorData column to index"},
+    returns="the VectorIndex of the ragged MeaningsTable column that stores the row index",
+)
+def __build_row_index(self, **kwargs):
+    """Store an inverted index of a CategoricalVectorData column in its MeaningsTable.
+
+    The index is stored as a ragged column named "<column>_rows" in the MeaningsTable, where the row for each value
+    lists the sorted indices of the events that have that value, and the number of rows of the table is stored in
+    the 'row_index_num_events' attribute of the MeaningsTable. It is used by EventsTable.where to select rows
+    without scanning the column, until rows are added to the table, so it should be built after all rows have been
+    added.
+    """
+    column = _get_categorical_column(self, kwargs["column"])
+    if column.meanings.parent is not self:
+        raise ValueError(
+            "Cannot build a row index for column '%s' because its MeaningsTable '%s' is not stored in EventsTable "
+            "'%s'." % (column.name, column.meanings.name, self.name)
+        )
+    num_events = column.meanings.row_index_num_events
+    if num_events is not None and num_events != len(self):
+        raise ValueError(
+            "Cannot build a row index for column '%s' because the row indexes of MeaningsTable '%s' were built for "
+            "%d rows and EventsTable '%s' has %d rows."
+            % (column.name, column.meanings.name, num_events, self.name, len(self))
+        )
+    rows, ends = compute_row_index(column)
+    column.meanings.add_column(
+        name=get_row_index_name(column.name),
+        description="The indices of the rows of EventsTable '%s' that have each value in column '%s'."
+        % (self.name, column.name),
+        data=rows,
+        index=ends,
+    )
+    if num_events is None:
+        column.meanings.row_index_num_events = len(self)
+    return column.meanings[get_row_index_name(column.name)]
+
+
+EventsTable.build_row_index = __build_row_index
+del __build_row_index
+
+
+@instrumented("EventsTable.where")
+@docval(
+    {"name": "column", "type": str, "doc": "The name of the CategoricalVectorData column to filter on"},
+    {
+        "name": "isin",
+        "type": (list, tuple, set, np.ndarray),
+        "doc": "The values to select. If None, all rows are selected, except those excluded by filter_values",
+        "default": None,
+    },
+    {
+        "name": "exclude_filter_values",
+        "type": bool,
+        "doc": "Whether to exclude the rows whose value is in the filter_values of the column",
+        "default": True,
+    },
+    returns="the sorted indices of the matching rows",
+    rtype=np.ndarray,
+)
+def __where(self, **kwargs):
+    """Get the indices of the rows whose value in a CategoricalVectorData column is in the given values.
+
+    If the column has a row index built with EventsTable.build_row_index, no rows were added since, and all
+    requested values are listed in its MeaningsTable, only the index entries of those values are read. Otherwise,
+    the column is scanned in chunks.
+    """
+    column = _get_categorical_column(self, kwargs["column"])
+    isin, exclude_filter_values = kwargs["isin"], kwargs["exclude_filter_values"]
+    exclude = list(column.filter_values) if exclude_filter_values and column.filter_values is not None else []
+    if isin is not None:
+        isin = [value for value in isin if value not in exclude]
+
+    index_name = get_row_index_name(column.name)
+    num_events = column.meanings.row_index_num_events
+    if isin is not None and index_name in column.meanings.colnames and num_events == len(self):
+        values = np.asarray(column.meanings["value"].data[:]).tolist()
+        if all(value in values for value in isin):
+            index = column.meanings[index_name]
+            rows = [np.asarray(index[values.index(value)], dtype=np.int64) for value in set(isin)]
+            return np.sort(np.concatenate(rows)) if rows else np.empty(0, dtype=np.int64)
+    return scan_rows(column, isin, exclude)
+
+
+EventsTable.where = __where
+del __where
+
+
+def __build_timestamp_order(self):
+    """Store the permutation of the rows that sorts the 'timestamp' column as the 'timestamp_order' dataset.
+
+    The permutation lets EventsTable.where_time find the events in a time window with a binary search even though
+    the rows of the table are not sorted by timestamp. It should be built after all rows have been added; adding a
+    row drops it.
+    """
+    data = self["timestamp"].data
+    order = np.argsort(np.asarray(data[:]), kind="stable")
+    self.fields.pop("timestamp_order", None)
+    if _is_writable_dataset(data) and "timestamp_order" in data.parent:
+        # HDF5IO does not rewrite datasets that were already written, so replace the dataset in the file
+        del data.parent["timestamp_order"]
+        order = data.parent.create_dataset("timestamp_order", data=order)
+    self.timestamp_order = order
+    return self.timestamp_order
+
+
+EventsTable.build_timestamp_order = __build_timestamp_order
+del __build_timestamp_order
+
+
+@instrumented("EventsTable.where_time")
+@docval(
+    {"name": "t_start", "type": (int, float), "doc": "The start of the time window, in seconds", "default": None},
+    {"name": "t_stop", "type": (int, float), "doc": "The end of the time window (exclusive)", "default": None},
+    returns="the sorted indices of the rows whose timestamp is in the window",
+    rtype=np.ndarray,
+)
+def __where_time(self, **kwargs):
+    """Get the indices of the rows whose timestamp is in the half-open window [t_start, t_stop).
+
+    If the 'sorted' attribute of the 'timestamp' column is True, or the table has a 'timestamp_order' dataset, the
+    window is found with a binary search that reads only O(log n) timestamps. Otherwise, the column is scanned in
+    chunks.
+    """
+    return find_time_window(self["timestamp"], order=self.timestamp_order, **kwargs)
+
+
+EventsTable.where_time = __where_time
+del __where_time
+
+
+@instrumented("EventsTable.read_events")
+@docval(
+    {"name": "columns", "type": (list, tuple), "doc": "The columns to read besides 'timestamp'", "default": None},
+    {"name": "t_start", "type": (int, float), "doc": "The start of the time window, in seconds", "default": None},
+    {"name": "t_stop", "type": (int, float), "doc": "The end of the time window (exclusive)", "default": None},
+    {
+        "name": "decode_categoricals",
+        "type": bool,
+        "doc": "Whether to replace the values of CategoricalVectorData columns with their meanings",
+        "default": False,
+    },
+    returns="a DataFrame of the selected columns of the events in the time window, indexed by row ID",
+    rtype=pd.DataFrame,
+)
+def __read_events(self, **kwargs):
+    """Read only the given columns of the events in a time window.
+
+    The time window is applied first, using EventsTable.where_time, and only the selected rows of the selected
+    columns are read. If columns is None, all columns are read. Columns that are not in the table are ignored, except
+    'duration', which is read from the sparse durations of the table if it has no 'duration' column.
+    """
+    columns, t_start, t_stop = kwargs["columns"], kwargs["t_start"], kwargs["t_stop"]
+    if t_start is None and t_stop is None:
+        rows = np.arange(len(self), dtype=np.int64)
+    else:
+        rows = self.where_time(t_start=t_start, t_stop=t_stop)
+    sparse_duration = _has_sparse_durations(self)
+    columns = _get_colnames(self) if columns is None else columns
+    colnames = ["timestamp"] + [name for name in columns if name != "timestamp" and name in self.colnames]
+    if sparse_duration and "duration" in columns:
+        colnames.append("duration")
+    data = dict()
+    for name in colnames:
+        if name == "duration" and sparse_duration:
+            data[name] = self.get_durations()[rows]
+            continue
+        column = self[name]
+        if column.name != name:  # a ragged column, whose VectorIndex has the name of the column
+            data[name] = [column[row] for row in rows.tolist()]
+        elif kwargs["decode_categoricals"] and isinstance(column, CategoricalVectorData):
+            data[name] = intern_meanings(column.meanings).decode(read_rows(column, rows))
+        else:
+            data[name] = read_rows(column, rows)
+    return pd.DataFrame(data, index=pd.Index(read_rows(self.id, rows), name="id"))
+
+
+EventsTable.read_events = __read_events
+del __read_events
+
+
+@docval(
+    {"name": "column", "type": str, "doc": "The name of the column whose values are matched against the steps"},
+    {
+        "name": "steps",
+        "type": (list, tuple),
+        "doc": "The steps of the sequence, each a value or a collection of values of the column",
+    },
+    {"name": "within", "type": (int, float), "doc": "The maximum time from the first to the last event, in seconds"},
+    {
+        "name": "overlapping",
+        "type": bool,
+        "doc": "Whether to keep sequences that start before the end of the previous sequence",
+        "default": False,
+    },
+    {"name": "name", "type": str, "doc": "The name of the returned EventsTable", "default": "sequences"},
+    {
+        "name": "description",
+        "type": str,
+        "doc": "The description of the returned EventsTable",
+        "default": "Sequences of events.",
+    },
+    {
+        "name": "chunk_size",
+        "type": int,
+        "doc": "The number of rows to read at a time",
+        "default": DEFAULT_CHUNK_SIZE,
+    },
+    returns="an EventsTable with one event per sequence",
+    rtype="EventsTable",
+)
+def __find_sequences(self, **kwargs):
+    """Find the sequences of events, e.g., a stimulus onset, then a question, then a response within 5 seconds.
+
+    For example, ``table.find_sequences("pulse_value", [1, 3, range(31, 37)], within=5.0)``. See
+    ndx_events.sequences.find_sequences for how sequences are matched. The rows of the table must be sorted by
+    timestamp. The timestamp of each returned event is the timestamp of the first event of the sequence and its
+    duration is the time to the last event. Its 'event_rows' column holds the row indices of the events of the
+    sequence in this table.
+    """
+    sequences = find_sequences(
+        self,
+        kwargs["column"],
+        kwargs["steps"],
+        kwargs["within"],
+        overlapping=kwargs["overlapping"],
+        chunk_size=kwargs["chunk_size"],
+    )
+    return sequences_to_events_table(self, sequences, kwargs["name"], kwargs["description"])
+
+
+EventsTable.find_sequences = __find_sequences
+del __find_sequences
+
+
+@docval(
+    {"name": "columns", "type": (list, tuple), "doc": "The columns to read. By default, all columns", "default": None},
+    {
+        "name": "partition_size",
+        "type": int,
+        "doc": "The approximate number of rows of each partition, rounded to a multiple of the HDF5 chunk length",
+        "default": DEFAULT_CHUNK_SIZE,
+    },
+    returns="a Dask DataFrame of the columns, indexed by row number",
+)
+def __to_dask(self, **kwargs):
+    """Read the columns of this table lazily as a Dask DataFrame whose partitions are HDF5 chunk ranges.
+
+    CategoricalVectorData columns become categorical columns whose categories are the values of their
+    MeaningsTable. Requires Dask (``pip install ndx-events[dask]``).
+    """
+    return events_table_to_dask(self, **kwargs)
+
+
+EventsTable.to_dask = __to_dask
+del __to_dask
+
+
+def _is_writable_dataset(data):
+    return isinstance(data, h5py.Dataset) and data.file.mode != "r"
+
+
+def _invalidate_timestamp_order(table):
+    """Clear the 'sorted' flag of the 'timestamp' column if the last row is earlier than the row before it, and drop
+    the 'timestamp_order' permutation, which no longer covers all rows.
+
+    HDF5IO does not rewrite the attributes of datasets that were already written, so if the table was read from a
+    file opened in append mode, the 'sorted' attribute is updated in the file, as the appended values are. A
+    'timestamp_order' dataset in the file is ignored on read once rows are appended, until it is rebuilt.
+    """
+    timestamp = table["timestamp"]
+    data = timestamp.data
+    if timestamp.sorted and len(data) >= 2 and not data[len(data) - 1] >= data[len(data) - 2]:
+        timestamp.fields["sorted"] = False
+        if _is_writable_dataset(data) and "sorted" in data.attrs:
+            data.attrs["sorted"] = False
+    table.fields.pop("timestamp_order", None)
+
+
+def _drop_event_counts(table):
+    """Drop the EventCounts pyramid of the table, which no longer counts all rows.
+
+    An 'event_counts' dataset in a file opened in append mode is ignored on read once rows are appended, until it is
+    rebuilt.
+    """
+    table.fields.pop("event_counts", None)
+
+
+def _invalidate_summary(table):
+    """Drop the summary attributes of the table and the value counts of its CategoricalVectorData columns, which no
+    longer count the last row, so that EventsTable.summary recomputes them and they are rewritten on write.
+
+    HDF5IO does not rewrite the attributes of datasets that were already written, so if a column was read from a
+    file opened in append mode, the count of the value of the last row is incremented in its 'value_counts'
+    attribute in the file, as the appended value is written. This is done for every appended row, including the rows
+    appended after the value counts were dropped.
+    """
+    for name in ("num_events", "min_timestamp", "max_timestamp", "duration_quantiles"):
+        table.fields.pop(name, None)
+    for column in table.columns:
+        if not isinstance(column, CategoricalVectorData):
+            continue
+        column.fields.pop("value_counts", None)
+        data = column.data
+        if _is_writable_dataset(data) and "value_counts" in data.attrs:
+            is_value = np.asarray(column.meanings["value"].data[:]) == data[len(data) - 1]
+            data.attrs["value_counts"] = data.attrs["value_counts"] + is_value
+
+
+# Name of the keyword argument with which the start time of the argument validation of EventsTable.add_row is passed
+# through docval, which passes unknown keyword arguments through because add_row takes column values as keywords
+_VALIDATION_START = "_ndx_events_validation_start"
+
+
+@docval(*get_docval(DynamicTable.add_row), allow_extra=True)
+def _add_validated_row(self, **kwargs):
+    """Add a row to the table, drop the summary statistics that it makes stale, and mark the table as modified so
+    that its summary is rewritten on write."""
+    validation_start = kwargs.pop(_VALIDATION_START, None)
+    if validation_start is not None:
+        emit("EventsTable.add_row.docval", perf_counter() - validation_start)
+    with timer("DynamicTable.add_row"):
+        DynamicTable.add_row(self, **kwargs)
+    _invalidate_timestamp_order(self)
+    _invalidate_summary(self)
+    _drop_event_counts(self)
+    self.set_modified()
+
+
+@instrumented("EventsTable.add_row")
+@functools.wraps(_add_validated_row)
+def __add_row(self, *args, **kwargs):
+    if is_instrumentation_enabled():
+        kwargs[_VALIDATION_START] = perf_counter()
+    return _add_validated_row(self, *args, **kwargs)
+
+
+EventsTable.add_row = __add_row
+del __add_row
+
+
+@instrumented("EventsTable.to_dataframe")
+@functools.wraps(DynamicTable.to_dataframe)
+def __to_dataframe(self, **kwargs):
+    df = DynamicTable.to_dataframe(self, **kwargs)
+    exclude = kwargs.get("exclude") or ()
+    if _has_sparse_durations(self) and "duration" not in exclude:
+        df = _add_sparse_durations(self, df, slice(None))
+    return df
+
+
+EventsTable.to_dataframe = __to_dataframe
+del __to_dataframe
+
+
 # NOTE: When the NWBEP001 is merged into the core NWB schema and software, this class will be merged
 # with the core NWBFile class.
 @register_class("NdxEventsNWBFile", "ndx-events")
@@ -48,8 +689,62 @@ class NdxEventsNWBFile(NWBFile):
         super().__init__(**kwargs)
         self.events = events
 
+    @instrumented("NdxEventsNWBFile.merge_events_tables")
     def merge_events_tables(self, tables):  # tables: list[EventsTable]
         return pd.concat([table.to_dataframe().set_index("timestamp") for table in tables], sort=True)
 
-    def get_all_events(self):
-        return self.merge_events_tables(list(self.events.values()))
+    @instrumented("NdxEventsNWBFile.get_all_events")
+    def get_all_events(
+        self, tables=None, columns=None, t_start=None, t_stop=None, decode_categoricals=False, long_format=False
+    ):
+        """Get the events of all or some of the EventsTable objects.
+
+        Without arguments, all columns of all tables are merged as with merge_events_tables. Otherwise, the time
+        window and the column selection are applied to each table before its data are read (see
+        EventsTable.read_events), and the events are sorted by timestamp.
+
+        tables is a list of EventsTable objects or names, columns a list of column names (the 'timestamp' column is
+        always included). If long_format is True, the result has one row per event and column, with the columns
+        "table" and "column" (both categorical), "id", "timestamp", and "value", instead of one wide frame with a
+        column for each column name and NaN for the columns that a table does not have.
+        """
+        if (
+            tables is None
+            and columns is None
+            and t_start is None
+            and t_stop is None
+            and not (decode_categoricals or long_format)
+        ):
+            return self.merge_events_tables(list(self.events.values()))
+        tables = (
+            list(self.events.values())
+            if tables is None
+            else [self.events[table] if isinstance(table, str) else table for table in tables]
+        )
+        if columns is not None:
+            missing = set(columns) - set().union(*(_get_colnames(table) for table in tables)) - {"timestamp"}
+            if missing:
+                raise ValueError("Columns %s are not in any of the selected tables." % sorted(missing))
+        frames = [
+            table.read_events(
+                columns=columns, t_start=t_start, t_stop=t_stop, decode_categoricals=decode_categoricals
+            ).reset_index()
+            for table in tables
+        ]
+        if not long_format:
+            merged = pd.concat([frame.drop(columns="id").set_index("timestamp") for frame in frames], sort=True)
+            return merged.sort_index(kind="stable")
+        names = [table.name for table in tables]
+        long_frames = list()
+        for name, frame in zip(names, frames):
+            long_frame = frame.melt(id_vars=["id", "timestamp"], var_name="column", value_name="value")
+            long_frame.insert(0, "table", name)
+            long_frames.append(long_frame)
+        events = (
+            pd.concat(long_frames, ignore_index=True)
+            if long_frames
+            else pd.DataFrame(columns=["table", "id", "timestamp", "column", "value"])
+        )
+        events["table"] = pd.Categorical(events["table"], categories=names)
+        events["column"] = events["column"].astype("category")
+        return events.sort_values("timestamp", kind="stable", ignore_index=True)
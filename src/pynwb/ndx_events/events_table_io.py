@@ -0,0 +1,161 @@
+import numpy as np
+from hdmf.build import ObjectMapper
+from hdmf.common.io.table import DynamicTableMap
+from hdmf.utils import docval, get_docval
+from pynwb import register_map
+
+from .events import EventsTable, TimestampVectorData, CategoricalVectorData, MeaningsTable
+from .instrumentation import instrumented
+from .meanings import compute_content_hash
+from .summary import (
+    DURATION_QUANTILE_LEVELS,
+    is_readable,
+    compute_timestamp_summary,
+    compute_duration_quantiles,
+    compute_value_counts,
+)
+
+
+@register_map(EventsTable)
+class EventsTableMap(DynamicTableMap):
+    """Map an EventsTable and compute its summary attributes at write time.
+
+    The summary attributes are recomputed by streaming over the columns every time the table is built, so they stay
+    up to date when rows are appended. If a column cannot be read without consuming it (e.g., it is
+    wrapped in a DataChunkIterator), the values set on the container, if any, are written instead.
+    """
+
+    @instrumented("EventsTableMap.construct")
+    @docval(*get_docval(DynamicTableMap.construct), returns="the AbstractContainer representing the given Builder")
+    def construct(self, **kwargs):
+        container = super().construct(**kwargs)
+        if container.timestamp_order is not None and len(container.timestamp_order) != len(container):
+            # rows were appended after the order was built, so it no longer covers all rows
+            container.fields.pop("timestamp_order")
+        event_counts = container.event_counts
+        # the single bin of the coarsest level counts all events, like the finest level
+        if event_counts is not None and event_counts.data[len(event_counts.data) - 1, 0] != len(container):
+            # rows were appended after the pyramid was built, so it does not count all rows
+            container.fields.pop("event_counts")
+        return container
+
+    @instrumented("EventsTableMap.build")
+    @docval(*get_docval(DynamicTableMap.build), returns="the Builder representing the given AbstractContainer")
+    def build(self, **kwargs):
+        container = kwargs["container"]
+        builder = kwargs["builder"]
+        if builder is not None and "event_counts" in builder.datasets:
+            read_event_counts = builder.datasets["event_counts"]
+            event_counts = container.event_counts
+            if event_counts is None or kwargs["manager"].get_builder(event_counts) is not read_event_counts:
+                # the pyramid that was read was dropped or rebuilt since; forget its builder so that it is not
+                # compared with the builder of the new pyramid
+                builder.datasets.pop("event_counts")
+                builder.obj_type.pop("event_counts", None)
+        self.__timestamp_summary = None
+        timestamp_map = None
+        if "timestamp" in container.colnames:
+            timestamp = container["timestamp"]
+            self.__timestamp_summary = compute_timestamp_summary(timestamp)
+            # let the mapper of the 'timestamp' column reuse the summary for its 'sorted' attribute
+            timestamp_map = kwargs["manager"].type_map.get_map(timestamp)
+            if isinstance(timestamp_map, TimestampVectorDataMap):
+                timestamp_map.timestamp_summaries[timestamp.object_id] = self.__timestamp_summary
+            else:
+                timestamp_map = None
+        self.__duration_quantiles = None
+        durations = container.get_durations()
+        if durations is not None:
+            levels = container.duration_quantile_levels
+            if levels is None:
+                levels = DURATION_QUANTILE_LEVELS
+            quantiles = compute_duration_quantiles(durations, levels)
+            if quantiles is not None:
+                self.__duration_quantiles = (np.asarray(levels).tolist(), quantiles)
+        try:
+            return super().build(**kwargs)
+        finally:
+            if timestamp_map is not None:
+                timestamp_map.timestamp_summaries.pop(container["timestamp"].object_id, None)
+            self.__timestamp_summary = None
+            self.__duration_quantiles = None
+
+    @docval(*get_docval(DynamicTableMap.get_attr_value), returns="the value of the attribute")
+    def get_attr_value(self, **kwargs):
+        if kwargs["spec"].name == "duration" and "duration" not in kwargs["container"].colnames:
+            # EventsTable.duration returns a view of the sparse durations, which are written in 'duration_rows' and
+            # 'duration_values' instead of as a column
+            return None
+        return super().get_attr_value(**kwargs)
+
+    @ObjectMapper.object_attr("num_events")
+    def num_events_attr(self, container, manager):
+        return None if self.__timestamp_summary is None else self.__timestamp_summary[0]
+
+    @ObjectMapper.object_attr("min_timestamp")
+    def min_timestamp_attr(self, container, manager):
+        return None if self.__timestamp_summary is None else self.__timestamp_summary[1]
+
+    @ObjectMapper.object_attr("max_timestamp")
+    def max_timestamp_attr(self, container, manager):
+        return None if self.__timestamp_summary is None else self.__timestamp_summary[2]
+
+    @ObjectMapper.object_attr("duration_quantile_levels")
+    def duration_quantile_levels_attr(self, container, manager):
+        return None if self.__duration_quantiles is None else self.__duration_quantiles[0]
+
+    @ObjectMapper.object_attr("duration_quantiles")
+    def duration_quantiles_attr(self, container, manager):
+        return None if self.__duration_quantiles is None else self.__duration_quantiles[1]
+
+
+@register_map(TimestampVectorData)
+class TimestampVectorDataMap(ObjectMapper):
+    """Map a TimestampVectorData and determine whether its timestamps are sorted at write time.
+
+    When the column is built as part of an EventsTable, the summary that EventsTableMap computed for the table is
+    reused, so that the timestamps are read only once.
+    """
+
+    build = instrumented("TimestampVectorDataMap.build")(ObjectMapper.build)
+    construct = instrumented("TimestampVectorDataMap.construct")(ObjectMapper.construct)
+
+    def __init__(self, spec):
+        super().__init__(spec)
+        # the summaries computed by EventsTableMap for the columns of the tables being built, by column object ID
+        self.timestamp_summaries = dict()
+
+    @ObjectMapper.object_attr("sorted")
+    def sorted_attr(self, container, manager):
+        if container.object_id in self.timestamp_summaries:
+            timestamp_summary = self.timestamp_summaries[container.object_id]
+        else:
+            timestamp_summary = compute_timestamp_summary(container)
+        return None if timestamp_summary is None else timestamp_summary[3]
+
+
+@register_map(CategoricalVectorData)
+class CategoricalVectorDataMap(ObjectMapper):
+    """Map a CategoricalVectorData and compute the counts of the values of its MeaningsTable at write time."""
+
+    build = instrumented("CategoricalVectorDataMap.build")(ObjectMapper.build)
+    construct = instrumented("CategoricalVectorDataMap.construct")(ObjectMapper.construct)
+
+    @ObjectMapper.object_attr("value_counts")
+    def value_counts_attr(self, container, manager):
+        return compute_value_counts(container)
+
+
+@register_map(MeaningsTable)
+class MeaningsTableMap(DynamicTableMap):
+    """Map a MeaningsTable and compute the hash of its contents at write time."""
+
+    build = instrumented("MeaningsTableMap.build")(DynamicTableMap.build)
+    construct = instrumented("MeaningsTableMap.construct")(DynamicTableMap.construct)
+
+    @ObjectMapper.object_attr("content_hash")
+    def content_hash_attr(self, container, manager):
+        columns = [container[name].data for name in ("value", "meaning") if name in container.colnames]
+        if len(columns) != 2 or not all(is_readable(data) for data in columns):
+            return None
+        return compute_content_hash(container)
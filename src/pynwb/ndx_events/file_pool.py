@@ -0,0 +1,139 @@
+"""A process-level pool of NWB files opened in read mode, to skip namespace loading and object construction when the
+same files are queried repeatedly.
+
+Example::
+
+    from ndx_events import get_default_pool
+
+    with get_default_pool().open(path) as nwbfile:
+        events = nwbfile.events["stimulus_events"].read_events(t_start=10.0, t_stop=20.0)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from pynwb import NWBHDF5IO
+
+from .instrumentation import timer
+
+DEFAULT_MAX_OPEN_FILES = 16
+
+
+class _PoolEntry:
+    __slots__ = ("io", "nwbfile", "users")
+
+    def __init__(self, io, nwbfile):
+        self.io = io
+        self.nwbfile = nwbfile
+        self.users = 0
+
+
+class NWBFilePool:
+    """A thread-safe pool of NdxEventsNWBFile objects read from files opened in read mode.
+
+    Files are identified by their absolute path and modification time, so a file that was modified since it was
+    opened is opened again. When more than max_open files are open, the least recently used files that are not in
+    use are closed. The objects read from a file must not be used after the file is released, since it may then be
+    closed. Files are opened outside of the lock of the pool: different files are opened in parallel, and the threads
+    that request a file that another thread is opening wait for it instead of opening it again.
+    """
+
+    def __init__(self, max_open=DEFAULT_MAX_OPEN_FILES):
+        self.max_open = max_open
+        self._entries = OrderedDict()  # (path, mtime) -> _PoolEntry
+        self._opening = dict()  # (path, mtime) -> Future of the _PoolEntry of a file that is being opened
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    @contextmanager
+    def open(self, path):
+        """Get the NdxEventsNWBFile read from the file at path, opening the file if it is not in the pool."""
+        path = os.path.abspath(path)
+        entry = self._acquire((path, os.stat(path).st_mtime_ns))
+        try:
+            yield entry.nwbfile
+        finally:
+            with self._lock:
+                entry.users -= 1
+                self._evict()
+
+    def _acquire(self, key):
+        while True:
+            with self._lock:
+                self._check_fork()
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    entry.users += 1
+                    self._evict()
+                    return entry
+                opening = self._opening.get(key)
+                if opening is None:
+                    opening = self._opening[key] = Future()
+                    is_opener = True
+                else:
+                    is_opener = False
+            if is_opener:
+                return self._open_file(key, opening)
+            # another thread is opening the file; look it up again once it is open, since it may have been closed in
+            # the meantime
+            opening.result()
+
+    def _open_file(self, key, opening):
+        try:
+            with timer("NWBFilePool.open_file"):
+                io = NWBHDF5IO(key[0], mode="r")
+                try:
+                    entry = _PoolEntry(io, io.read())
+                except BaseException:
+                    io.close()
+                    raise
+        except BaseException as error:
+            with self._lock:
+                self._opening.pop(key, None)
+            opening.set_exception(error)
+            raise
+        with self._lock:
+            self._opening.pop(key, None)
+            self._entries[key] = entry
+            entry.users += 1
+            self._evict()
+        opening.set_result(entry)
+        return entry
+
+    def _check_fork(self):
+        # HDF5 file handles cannot be used in a forked process, so start from an empty pool
+        if os.getpid() != self._pid:
+            self._entries = OrderedDict()
+            self._opening = dict()
+            self._pid = os.getpid()
+
+    def _evict(self):
+        # close the unused files that were modified since they were opened, then the least recently used unused
+        # files while too many files are open
+        latest = dict()
+        for path, mtime in self._entries:
+            latest[path] = max(latest.get(path, mtime), mtime)
+        for key, entry in list(self._entries.items()):
+            if entry.users == 0 and (key[1] != latest[key[0]] or len(self._entries) > self.max_open):
+                self._entries.pop(key).io.close()
+
+    def clear(self):
+        """Close all files that are not in use."""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry.users == 0]:
+                self._entries.pop(key).io.close()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_default_pool = NWBFilePool()
+
+
+def get_default_pool():
+    """Get the process-level NWBFilePool."""
+    return _default_pool
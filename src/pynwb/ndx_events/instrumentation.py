@@ -0,0 +1,151 @@
+"""Opt-in timers and counters around the I/O paths of the ndx-events API.
+
+Instrumentation is disabled by default, in which case every instrumented call costs a single boolean check. When
+enabled, each instrumented call emits a record dictionary with the keys "name" (e.g., "EventsTable.add_row"),
+"duration" (in seconds), and any additional information (e.g., "rows"), to every registered callback and
+aggregates the call counts and total durations per name.
+
+Example::
+
+    from ndx_events import enable_instrumentation, get_instrumentation_stats
+
+    enable_instrumentation(log=True)
+    with NWBHDF5IO(path, "r") as io:
+        io.read().get_all_events()
+    print(get_instrumentation_stats())
+"""
+
+import functools
+import logging
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+
+logger = logging.getLogger(__name__)
+
+_enabled = False
+_callbacks = list()
+_stats = dict()  # name -> {"count": int, "total_duration": float}
+_lock = threading.Lock()
+# Methods of classes of other packages that are timed while instrumentation is enabled: (class, method name) -> name
+_external_methods = dict()
+# The original methods of those classes, while they are replaced by timed wrappers: (class, method name) -> method
+_original_methods = dict()
+
+
+def log_record(record):
+    """Log an instrumentation record at the DEBUG level, with the record attached as the "ndx_events" extra."""
+    info = "".join(" %s=%s" % (key, value) for key, value in record.items() if key not in ("name", "duration"))
+    logger.debug("%s took %.6f s%s", record["name"], record["duration"], info, extra={"ndx_events": record})
+
+
+def _wrap_external_method(cls, method_name, name):
+    if (cls, method_name) not in _original_methods:
+        _original_methods[(cls, method_name)] = cls.__dict__[method_name]
+        setattr(cls, method_name, instrumented(name)(cls.__dict__[method_name]))
+
+
+def _restore_external_methods():
+    for (cls, method_name), method in _original_methods.items():
+        setattr(cls, method_name, method)
+    _original_methods.clear()
+
+
+def instrument_external_method(cls, method_name, name):
+    """Time the calls to a method defined by a class of another package, e.g., HDF5IO.write, while instrumentation
+    is enabled.
+
+    The method is replaced by a timed wrapper when instrumentation is enabled and restored when it is disabled, so
+    the class is not modified while instrumentation is disabled.
+    """
+    with _lock:
+        _external_methods[(cls, method_name)] = name
+        if _enabled:
+            _wrap_external_method(cls, method_name, name)
+
+
+def enable_instrumentation(callback=None, log=False):
+    """Enable instrumentation, optionally registering a callback and/or logging every record."""
+    global _enabled
+    with _lock:
+        if callback is not None and callback not in _callbacks:
+            _callbacks.append(callback)
+        if log and log_record not in _callbacks:
+            _callbacks.append(log_record)
+        for (cls, method_name), name in _external_methods.items():
+            _wrap_external_method(cls, method_name, name)
+        _enabled = True
+
+
+def disable_instrumentation():
+    """Disable instrumentation and unregister all callbacks. The aggregated statistics are kept."""
+    global _enabled
+    with _lock:
+        _enabled = False
+        _callbacks.clear()
+        _restore_external_methods()
+
+
+def is_instrumentation_enabled():
+    return _enabled
+
+
+def get_instrumentation_stats():
+    """Get a copy of the call count and total duration, in seconds, of each instrumented call name."""
+    with _lock:
+        return {name: dict(stats) for name, stats in _stats.items()}
+
+
+def reset_instrumentation_stats():
+    with _lock:
+        _stats.clear()
+
+
+def emit(name, duration, **info):
+    """Record an instrumented call and pass its record to the registered callbacks."""
+    record = dict(name=name, duration=duration, **info)
+    with _lock:
+        stats = _stats.setdefault(name, dict(count=0, total_duration=0.0))
+        stats["count"] += 1
+        stats["total_duration"] += duration
+        callbacks = list(_callbacks)
+    for callback in callbacks:
+        callback(record)
+
+
+@contextmanager
+def timer(name, **info):
+    """Time the enclosed block if instrumentation is enabled.
+
+    In hot paths, check is_instrumentation_enabled() first to avoid the cost of creating the context manager.
+    """
+    if not _enabled:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        emit(name, perf_counter() - start, **info)
+
+
+def instrumented(name):
+    """Decorate a function or method so that its calls are timed when instrumentation is enabled.
+
+    The wrapper keeps the attributes of the wrapped function, including the docval specification.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                emit(name, perf_counter() - start)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,104 @@
+"""A process-wide cache that loads and decodes identical MeaningsTable objects only once."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+MAX_CACHED_MEANINGS = 1024
+
+
+def compute_content_hash(meanings_table):
+    """Compute the SHA-256 hash of the contents of the 'value' and 'meaning' columns of a MeaningsTable."""
+    values = np.asarray(meanings_table["value"].data[:]).tolist()
+    meanings = np.asarray(meanings_table["meaning"].data[:]).tolist()
+    return hashlib.sha256(repr((values, meanings)).encode("utf-8")).hexdigest()
+
+
+class InternedMeanings:
+    """An immutable, decoded copy of the 'value' and 'meaning' columns of a MeaningsTable.
+
+    Instances are shared by all MeaningsTable objects with the same contents, so get them with intern_meanings.
+    """
+
+    __slots__ = ("values", "meanings", "content_hash", "_lookup")
+
+    def __init__(self, values, meanings, content_hash):
+        self.values = tuple(values)
+        self.meanings = tuple(meanings)
+        self.content_hash = content_hash
+        self._lookup = dict(zip(self.values, self.meanings))
+
+    def __len__(self):
+        return len(self.values)
+
+    def __contains__(self, value):
+        return value in self._lookup
+
+    def __getitem__(self, value):
+        """Get the meaning of a value."""
+        return self._lookup[value]
+
+    def decode(self, data, default=None):
+        """Map an array of values to an object array of their meanings, using default for unknown values."""
+        return np.array([self._lookup.get(value, default) for value in np.asarray(data).tolist()], dtype=object)
+
+
+_lock = threading.Lock()
+_interned_by_hash = OrderedDict()  # content hash -> InternedMeanings, least recently used first
+_hash_by_object_id = OrderedDict()  # object ID of a MeaningsTable read from a file -> content hash, LRU first
+
+
+def _cache_get(cache, key):
+    # call with _lock held
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _cache_put(cache, key, value):
+    # call with _lock held; return the cached value if another thread added one first
+    value = cache.setdefault(key, value)
+    cache.move_to_end(key)
+    while len(cache) > MAX_CACHED_MEANINGS:
+        cache.popitem(last=False)
+    return value
+
+
+def intern_meanings(meanings_table):
+    """Get the InternedMeanings for a MeaningsTable, loading and decoding its columns only if no identical table
+    was loaded before in this process.
+
+    MeaningsTable objects are identified by the 'content_hash' attribute that is written with the file. For tables
+    read from files written without that attribute, the hash is computed once per table object ID. Both caches keep
+    only the MAX_CACHED_MEANINGS most recently used entries, so long-running processes do not grow without bound.
+    """
+    content_hash = meanings_table.content_hash
+    from_file = meanings_table.container_source is not None
+    if content_hash is None and from_file:
+        with _lock:
+            content_hash = _cache_get(_hash_by_object_id, meanings_table.object_id)
+    if content_hash is None:
+        content_hash = compute_content_hash(meanings_table)
+        if from_file:
+            with _lock:
+                _cache_put(_hash_by_object_id, meanings_table.object_id, content_hash)
+    with _lock:
+        interned = _cache_get(_interned_by_hash, content_hash)
+    if interned is None:
+        interned = InternedMeanings(
+            values=np.asarray(meanings_table["value"].data[:]).tolist(),
+            meanings=np.asarray(meanings_table["meaning"].data[:]).tolist(),
+            content_hash=content_hash,
+        )
+        with _lock:
+            interned = _cache_put(_interned_by_hash, content_hash, interned)
+    return interned
+
+
+def clear_meanings_cache():
+    """Remove all interned meanings from the process-wide cache."""
+    with _lock:
+        _interned_by_hash.clear()
+        _hash_by_object_id.clear()
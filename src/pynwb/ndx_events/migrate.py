@@ -0,0 +1,302 @@
+"""Convert the event data of existing NWB files to EventsTable objects in new files.
+
+The following objects are converted:
+
+- ``Events``, ``LabeledEvents``, and ``TTLs`` from ndx-events 0.2. The timestamps become the 'timestamp' column. The
+  integer data of ``LabeledEvents`` and ``TTLs`` becomes a CategoricalVectorData column, "label" or "pulse_value",
+  whose MeaningsTable is built from the 'labels' attribute.
+- ``TimeIntervals`` from the NWB core, e.g., the trials table. The 'start_time' column becomes the 'timestamp' column
+  and 'stop_time' - 'start_time' becomes the 'duration' column. The other one-dimensional columns are kept and can be
+  converted to CategoricalVectorData columns. Ragged and reference columns are skipped with a warning.
+
+The source files are read with h5py rather than pynwb because the ndx-events 0.2 namespace cached in them has the
+same name as the current namespace. Column datasets are copied to the new file by HDF5 without being loaded into
+memory; only derived columns (durations) and the unique values of categorical columns are computed, in chunks.
+
+Example::
+
+    from ndx_events.migrate import migrate_files
+
+    migrate_files(["session1.nwb", "session2.nwb"], output_dir="migrated", max_workers=4)
+
+or, from the command line::
+
+    ndx-events-migrate session1.nwb session2.nwb --output-dir migrated --jobs 4
+"""
+
+import argparse
+import os
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import h5py
+import numpy as np
+from dateutil.parser import parse as parse_datetime
+from hdmf.common import VectorData
+from hdmf.utils import StrDataset
+from pynwb import NWBHDF5IO
+
+from .events import (
+    TimestampVectorData,
+    DurationVectorData,
+    CategoricalVectorData,
+    MeaningsTable,
+    EventsTable,
+    NdxEventsNWBFile,
+)
+from .utils import DEFAULT_CHUNK_SIZE, iter_chunks
+
+# Neurodata types from ndx-events 0.2 that are converted, mapped to the name of their categorical column
+LEGACY_EVENTS_TYPES = {"Events": None, "LabeledEvents": "label", "TTLs": "pulse_value"}
+
+# Columns of a TimeIntervals table that are converted to the 'timestamp' and 'duration' columns
+_INTERVALS_TIME_COLUMNS = ("start_time", "stop_time")
+
+
+def _decode(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _get_attr(obj, name, default=None):
+    """Get an HDF5 attribute, decoding bytes strings."""
+    return _decode(obj.attrs.get(name, default))
+
+
+def _as_readable(dataset):
+    """Wrap a string dataset so that it is read as Python strings rather than bytes."""
+    if h5py.check_string_dtype(dataset.dtype) is not None:
+        return StrDataset(dataset, None)
+    return dataset
+
+
+def find_legacy_events(h5file):
+    """Find the objects of an open NWB HDF5 file that can be converted to an EventsTable.
+
+    Returns a list of (path, neurodata_type) tuples sorted by path. Objects under "/events" are not returned.
+    """
+    found = list()
+
+    def visit(path, obj):
+        if not isinstance(obj, h5py.Group) or path.startswith("events/"):
+            return
+        neurodata_type = _get_attr(obj, "neurodata_type")
+        namespace = _get_attr(obj, "namespace")
+        if (namespace == "ndx-events" and neurodata_type in LEGACY_EVENTS_TYPES and "timestamps" in obj) or (
+            namespace == "core" and neurodata_type == "TimeIntervals"
+        ):
+            found.append(("/" + path, neurodata_type))
+
+    h5file.visititems(visit)
+    return sorted(found)
+
+
+def _compute_unique_values(dataset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Compute the sorted unique values of a 1D dataset in chunks."""
+    values = None
+    for chunk in iter_chunks(dataset, chunk_size):
+        values = np.unique(chunk) if values is None else np.union1d(values, chunk)
+    return np.empty(0) if values is None else values
+
+
+def _create_meanings_table(name, values, meanings):
+    meanings_table = MeaningsTable(name=name + "_meanings", description="Meanings of the values of '%s'." % name)
+    for value, meaning in zip(values, meanings):
+        meanings_table.add_row(value=value, meaning=meaning)
+    return meanings_table
+
+
+def convert_legacy_events(group, name=None):
+    """Convert an ndx-events 0.2 Events, LabeledEvents, or TTLs group of an open HDF5 file to an EventsTable.
+
+    The columns of the returned EventsTable reference the datasets of the group, so the file must stay open until
+    the table is written, which copies the datasets without loading them into memory.
+    """
+    name = name or group.name.split("/")[-1]
+    timestamps = group["timestamps"]
+    categorical_name = LEGACY_EVENTS_TYPES[_get_attr(group, "neurodata_type")]
+    columns = [
+        TimestampVectorData(
+            name="timestamp",
+            description="Column containing the time that each event occurred, in seconds, from the session start time.",
+            data=timestamps,
+            resolution=_get_attr(timestamps, "resolution"),
+        )
+    ]
+    meanings_tables = list()
+    if categorical_name is not None:
+        labels = [_decode(label) for label in group.attrs["labels"]]
+        # unused label values are stored as empty strings in the 'labels' attribute
+        values = [value for value, label in enumerate(labels) if label != ""]
+        meanings_table = _create_meanings_table(categorical_name, values, [labels[value] for value in values])
+        columns.append(
+            CategoricalVectorData(
+                name=categorical_name,
+                description=_get_attr(group["data"], "description", None) or "The %s of each event." % categorical_name,
+                data=group["data"],
+                meanings=meanings_table,
+            )
+        )
+        meanings_tables.append(meanings_table)
+    return EventsTable(
+        name=name,
+        description=_get_attr(group, "description", None) or "Events converted from %s." % group.name,
+        columns=columns,
+        meanings_tables=meanings_tables or None,
+        id=np.arange(len(timestamps)),
+    )
+
+
+def convert_time_intervals(group, name=None, categorical_columns=(), chunk_size=DEFAULT_CHUNK_SIZE):
+    """Convert a TimeIntervals group, e.g., the trials table, of an open HDF5 file to an EventsTable.
+
+    The intervals become events with a timestamp equal to their start time and a duration equal to their stop time
+    minus their start time. The durations are computed in chunks. The columns whose names are in categorical_columns
+    become CategoricalVectorData columns whose MeaningsTable lists their unique values. As with
+    convert_legacy_events, the file must stay open until the returned table is written.
+    """
+    name = name or group.name.split("/")[-1]
+    start_time, stop_time = group["start_time"], group["stop_time"]
+    duration = np.empty(len(start_time), dtype=np.float64)
+    offset = 0
+    for start_chunk, stop_chunk in zip(iter_chunks(start_time, chunk_size), iter_chunks(stop_time, chunk_size)):
+        duration[offset : offset + len(start_chunk)] = stop_chunk - start_chunk
+        offset += len(start_chunk)
+    columns = [
+        TimestampVectorData(
+            name="timestamp",
+            description="Column containing the time that each event occurred, in seconds, from the session start time.",
+            data=start_time,
+        ),
+        DurationVectorData(
+            name="duration",
+            description="Column containing the duration of each event, in seconds.",
+            data=duration,
+        ),
+    ]
+    meanings_tables = list()
+    colnames = [_decode(colname) for colname in group.attrs.get("colnames", [])]
+    skipped = list()
+    for colname in colnames:
+        if colname in _INTERVALS_TIME_COLUMNS:
+            continue
+        dataset = group[colname]
+        if (
+            colname + "_index" in group
+            or dataset.ndim != 1
+            or dataset.dtype.names is not None
+            or h5py.check_ref_dtype(dataset.dtype) is not None
+        ):
+            skipped.append(colname)
+            continue
+        data = _as_readable(dataset)
+        description = _get_attr(dataset, "description", None) or "The %s of each event." % colname
+        if colname in categorical_columns:
+            values = _compute_unique_values(data, chunk_size).tolist()
+            meanings_table = _create_meanings_table(colname, values, [str(value) for value in values])
+            meanings_tables.append(meanings_table)
+            columns.append(
+                CategoricalVectorData(name=colname, description=description, data=data, meanings=meanings_table)
+            )
+        else:
+            columns.append(VectorData(name=colname, description=description, data=data))
+    if skipped:
+        warnings.warn("Skipped the ragged or reference columns %s of %s." % (skipped, group.name))
+    return EventsTable(
+        name=name,
+        description=_get_attr(group, "description", None) or "Intervals converted from %s." % group.name,
+        columns=columns,
+        meanings_tables=meanings_tables or None,
+        id=group["id"],
+    )
+
+
+def migrate_file(source_path, target_path, categorical_columns=(), chunk_size=DEFAULT_CHUNK_SIZE):
+    """Convert the event data of an NWB file to EventsTable objects and write them to a new NdxEventsNWBFile.
+
+    The new file has the identifier, session description, and session start time of the source file. The name of
+    each EventsTable is the name of the converted object. Returns the names of the converted tables.
+    """
+    with h5py.File(source_path, "r") as source:
+        nwbfile = NdxEventsNWBFile(
+            identifier=_decode(source["identifier"][()]),
+            session_description=_decode(source["session_description"][()]),
+            session_start_time=parse_datetime(_decode(source["session_start_time"][()])),
+        )
+        for path, neurodata_type in find_legacy_events(source):
+            group = source[path]
+            name = group.name.split("/")[-1]
+            if name in nwbfile.events:
+                raise ValueError(
+                    "Cannot convert '%s' because a table named '%s' was already converted from %s."
+                    % (path, name, source_path)
+                )
+            if neurodata_type == "TimeIntervals":
+                table = convert_time_intervals(group, categorical_columns=categorical_columns, chunk_size=chunk_size)
+            else:
+                table = convert_legacy_events(group)
+            nwbfile.add_events_table(table)
+        # copy the datasets of the source file instead of linking to them
+        with NWBHDF5IO(target_path, mode="w") as io:
+            io.write(nwbfile, link_data=False)
+        return list(nwbfile.events)
+
+
+def _migrate_file(args):
+    source_path, target_path, kwargs = args
+    return migrate_file(source_path, target_path, **kwargs)
+
+
+def migrate_files(source_paths, output_dir, max_workers=None, **kwargs):
+    """Convert the event data of multiple NWB files in parallel, one file per worker process.
+
+    Each file is written to output_dir with the name of its source file. The keyword arguments are passed to
+    migrate_file. If max_workers is 1, the files are converted in the current process. Returns a dictionary
+    mapping each source path to the names of its converted tables.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [(path, os.path.join(output_dir, os.path.basename(path)), kwargs) for path in source_paths]
+    if len(set(task[1] for task in tasks)) != len(tasks):
+        raise ValueError("The source files must have different names to be written to the same output directory.")
+    if max_workers == 1:
+        results = [_migrate_file(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_migrate_file, tasks))
+    return dict(zip(source_paths, results))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="ndx-events-migrate",
+        description="Convert ndx-events 0.2 Events, LabeledEvents, and TTLs objects and TimeIntervals tables of NWB "
+        "files to EventsTable objects in new files.",
+    )
+    parser.add_argument("paths", nargs="+", help="the NWB files to convert")
+    parser.add_argument("-o", "--output-dir", required=True, help="the directory to write the new files to")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="the number of files to convert in parallel")
+    parser.add_argument(
+        "-c",
+        "--categorical",
+        action="append",
+        default=[],
+        metavar="COLUMN",
+        help="a TimeIntervals column to convert to a CategoricalVectorData column; can be repeated",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="the number of rows to read at a time"
+    )
+    args = parser.parse_args(argv)
+    results = migrate_files(
+        args.paths,
+        args.output_dir,
+        max_workers=args.jobs,
+        categorical_columns=tuple(args.categorical),
+        chunk_size=args.chunk_size,
+    )
+    for path, names in results.items():
+        sys.stdout.write("%s: %s\n" % (path, ", ".join(names) if names else "no event data found"))
+
+
+if __name__ == "__main__":
+    main()
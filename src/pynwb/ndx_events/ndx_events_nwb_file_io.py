@@ -1,6 +1,12 @@
+import h5py
+import hdmf
+from hdmf.backends.hdf5 import HDF5IO
+from hdmf.backends.hdf5.h5tools import ROOT_NAME, SPEC_LOC_ATTR
+from hdmf.build import BuildManager, GroupBuilder
 from pynwb import register_map
 from pynwb.io.file import NWBFileMap
 from .events import NdxEventsNWBFile
+from .instrumentation import instrument_external_method, instrumented
 
 
 # NOTE: When the NWBEP001 is merged into the core NWB schema and software, this class will be merged
@@ -15,3 +21,46 @@ class NdxEventsNWBFileMap(NWBFileMap):
         events_spec = self.spec.get_group("events")
         self.unmap(events_spec)
         self.map_spec("events", events_spec.get_neurodata_type("EventsTable"))
+
+    build = instrumented("NdxEventsNWBFileMap.build")(NWBFileMap.build)
+    construct = instrumented("NdxEventsNWBFileMap.construct")(NWBFileMap.construct)
+
+
+# Time the writes to HDF5 while instrumentation is enabled: HDF5IO.write builds the file (see the build records of the
+# object mappers) and then writes the builders with HDF5IO.write_builder
+instrument_external_method(HDF5IO, "write", "HDF5IO.write")
+instrument_external_method(HDF5IO, "write_builder", "HDF5IO.write_builder")
+
+
+@instrumented("read_events_only")
+def read_events_only(io):
+    """Read an NdxEventsNWBFile from an open NWBHDF5IO, constructing only its "events" group.
+
+    Only the datasets at the root of the file (e.g., the identifier and the session start time) and the "events"
+    group with its EventsTable and MeaningsTable objects are read and constructed by NdxEventsNWBFileMap. The other
+    groups, such as "acquisition", "processing", and "general", are skipped, so the returned NdxEventsNWBFile does
+    not contain them. Objects referenced from the "events" group are read on demand.
+
+    The file is constructed with its own BuildManager, so the objects cached by the manager of io are unchanged and
+    io.read() still reads the whole file.
+    """
+    # HDF5IO does not have a public method to read part of a file, so use the private method that
+    # HDF5IO.read_builder uses
+    read_group = getattr(io, "_HDF5IO__read_group", None)
+    if read_group is None or not hasattr(io, "_file"):
+        raise RuntimeError(
+            "read_events_only is not supported by this version of hdmf (%s), whose HDF5IO does not read groups the "
+            "way it expects. Use io.read() instead." % hdmf.__version__
+        )
+    f = io._file
+    if not f:  # h5py.File objects are falsy once closed
+        raise ValueError("Cannot read the events of a closed file.")
+    # skip the cached specs and all groups except "events"
+    ignore = set(f[name].name for name in f if isinstance(f[name], h5py.Group) and name != "events")
+    specloc = f.attrs.get(SPEC_LOC_ATTR)
+    if specloc is not None:
+        ignore.add(f[specloc].name)
+    builder = read_group(f, ROOT_NAME, ignore=ignore)
+    # NWBFileMap reads the constructor arguments of the metadata in "general" from its builder
+    builder.set_group(GroupBuilder("general"))
+    return BuildManager(io.manager.type_map).construct(builder)
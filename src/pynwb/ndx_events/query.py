@@ -0,0 +1,121 @@
+"""Functions to select the rows of an EventsTable without reading whole columns into memory."""
+
+import bisect
+import numpy as np
+
+from .utils import DEFAULT_CHUNK_SIZE, get_data, iter_chunks
+
+# Suffix of the name of the ragged MeaningsTable column that stores the row index of a CategoricalVectorData column
+ROW_INDEX_SUFFIX = "_rows"
+
+
+def get_row_index_name(column_name):
+    """Get the name of the MeaningsTable column that stores the row index of the given CategoricalVectorData column."""
+    return column_name + ROW_INDEX_SUFFIX
+
+
+def compute_row_index(column, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Compute the inverted index of a CategoricalVectorData column.
+
+    Returns a tuple of (rows, ends) in the layout of a ragged VectorData/VectorIndex pair: the sorted row indices of
+    the events with the i-th value of the MeaningsTable are rows[ends[i - 1]:ends[i]]. Rows with values that are not
+    listed in the MeaningsTable are not indexed.
+    """
+    values = np.asarray(column.meanings["value"].data[:])
+    sorter = np.argsort(values)
+    value_positions = list()
+    row_numbers = list()
+    offset = 0
+    for chunk in iter_chunks(get_data(column), chunk_size):
+        positions = np.clip(np.searchsorted(values, chunk, sorter=sorter), 0, max(len(values) - 1, 0))
+        found = values[sorter[positions]] == chunk if len(values) else np.zeros(len(chunk), dtype=bool)
+        value_positions.append(sorter[positions[found]])
+        row_numbers.append(np.flatnonzero(found) + offset)
+        offset += len(chunk)
+    value_positions = np.concatenate(value_positions) if value_positions else np.empty(0, dtype=np.int64)
+    row_numbers = np.concatenate(row_numbers) if row_numbers else np.empty(0, dtype=np.int64)
+    # a stable sort by value keeps the rows of each value in increasing order
+    order = np.argsort(value_positions, kind="stable")
+    rows = row_numbers[order]
+    ends = np.cumsum(np.bincount(value_positions, minlength=len(values)))
+    return rows, ends
+
+
+def scan_rows(data, values=None, exclude=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find the indices of the rows whose value is in values and not in exclude with a chunked vectorized scan.
+
+    If values is None, all rows whose value is not in exclude are selected.
+    """
+    rows = list()
+    offset = 0
+    for chunk in iter_chunks(get_data(data), chunk_size):
+        mask = np.ones(len(chunk), dtype=bool) if values is None else np.isin(chunk, values)
+        if exclude is not None and len(exclude):
+            mask &= ~np.isin(chunk, exclude)
+        rows.append(np.flatnonzero(mask) + offset)
+        offset += len(chunk)
+    return np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+
+
+class _PermutedData:
+    """A read-only view of data in the order given by a permutation of its indices, read one element at a time."""
+
+    def __init__(self, data, order):
+        self.data = data
+        self.order = order
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, i):
+        return self.data[int(self.order[i])]
+
+
+def find_time_window(timestamp, t_start=None, t_stop=None, order=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find the indices of the rows whose timestamp is in the half-open window [t_start, t_stop).
+
+    If the timestamps are flagged as sorted, the window is found with a binary search that reads O(log n) values.
+    Otherwise, if order is a permutation of the rows that sorts the timestamps, the binary search is done through
+    that permutation. Otherwise, the timestamps are scanned in chunks. Returns the sorted row indices.
+    """
+    data = get_data(timestamp)
+    if getattr(timestamp, "sorted", None) or order is not None:
+        view = data if getattr(timestamp, "sorted", None) else _PermutedData(data, order)
+        first = 0 if t_start is None else bisect.bisect_left(view, t_start)
+        last = len(view) if t_stop is None else bisect.bisect_left(view, t_stop, lo=first)
+        if view is data:
+            return np.arange(first, last, dtype=np.int64)
+        return np.sort(np.asarray(order[first:last], dtype=np.int64))
+    rows = list()
+    offset = 0
+    for chunk in iter_chunks(data, chunk_size):
+        mask = np.ones(len(chunk), dtype=bool)
+        if t_start is not None:
+            mask &= chunk >= t_start
+        if t_stop is not None:
+            mask &= chunk < t_stop
+        rows.append(np.flatnonzero(mask) + offset)
+        offset += len(chunk)
+    return np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+
+
+def read_rows(data, rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Read the values of the given sorted rows of a 1D list, array, or HDF5 dataset as a NumPy array.
+
+    A contiguous range of rows is read with a single slice. Otherwise, only the span from the first to the last
+    selected row is read, in chunks.
+    """
+    data = get_data(data)
+    rows = np.asarray(rows, dtype=np.int64)
+    if len(rows) == 0:
+        return np.asarray(data[0:0])
+    first, last = int(rows[0]), int(rows[-1]) + 1
+    if last - first == len(rows):
+        return np.asarray(data[first:last])
+    values = list()
+    for start in range(first, last, chunk_size):
+        stop = min(start + chunk_size, last)
+        chunk_rows = rows[np.searchsorted(rows, start) : np.searchsorted(rows, stop)]
+        if len(chunk_rows):
+            values.append(np.asarray(data[start:stop])[chunk_rows - start])
+    return np.concatenate(values)
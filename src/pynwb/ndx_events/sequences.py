@@ -0,0 +1,164 @@
+"""Functions to find sequences of events, e.g., a stimulus onset followed by a question and then a response within
+5 seconds, in an EventsTable whose rows are sorted by timestamp.
+
+The table is streamed in chunks. Only the events whose value matches a step of the sequence are kept in memory,
+and only until no sequence that is still open can use them, so memory use does not grow with the size of the table.
+All steps of the matching are vectorized with NumPy.
+"""
+
+import numpy as np
+from hdmf.common import VectorData
+
+from .instrumentation import instrumented
+from .query import read_rows
+from .utils import DEFAULT_CHUNK_SIZE, get_data
+
+
+def _normalize_steps(steps):
+    normalized = list()
+    for step in steps:
+        if isinstance(step, (str, bytes)) or np.ndim(step) == 0:
+            step = [step]
+        normalized.append(np.asarray(list(step)))
+    if len(normalized) < 1:
+        raise ValueError("A sequence must have at least one step.")
+    return normalized
+
+
+def _match_steps(members, starts):
+    """Follow each start through the steps of the sequence, taking at each step the first event after the event
+    matched by the previous step.
+
+    members is a list with, for each step, the sorted indices of the buffered events that match the step, and starts
+    holds indices of events that match the first step. Taking the first event at each step gives the earliest
+    possible end of a sequence, so a start has a match within a time limit if and only if this match is within it.
+    Returns an array of shape (number of starts, number of steps) of indices of buffered events, with -1 where a step
+    has no match.
+    """
+    matched = np.full((len(starts), len(members)), -1, dtype=np.int64)
+    matched[:, 0] = starts
+    current = starts
+    found = np.ones(len(starts), dtype=bool)
+    for i, member in enumerate(members[1:], start=1):
+        positions = np.searchsorted(member, current, side="right")
+        found &= positions < len(member)
+        current = member[np.minimum(positions, max(len(member) - 1, 0))] if len(member) else current
+        matched[found, i] = current[found]
+    matched[~found] = -1
+    return matched
+
+
+def _select_non_overlapping(matched, after):
+    """Select the sequences, sorted by start, that start after the end of the previously selected sequence."""
+    selected = list()
+    starts = matched[:, 0]
+    i = int(np.searchsorted(starts, after, side="right"))
+    while i < len(matched):
+        selected.append(i)
+        i = int(np.searchsorted(starts, matched[i, -1], side="right"))
+    return np.asarray(selected, dtype=np.int64)
+
+
+@instrumented("find_sequences")
+def find_sequences(table, column, steps, within, overlapping=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find the sequences of events whose values in a column match the given steps, in order, within a time limit.
+
+    Each step is a value or a collection of values, e.g., ``[1, 3, range(31, 37)]`` for a stimulus onset (1), then a
+    question (3), then a response (31 to 36). A sequence is a run of events in row order, not necessarily adjacent,
+    whose values match the steps and whose last event is at most within seconds after its first event. For each
+    event that matches the first step, the earliest sequence that starts with it is found. If overlapping is False,
+    a sequence is only kept if it starts after the last event of the previous sequence that was kept.
+
+    The rows of the table must be sorted by timestamp. Returns an array of shape (number of sequences, number of
+    steps) of the row indices of the events of each sequence.
+    """
+    steps = _normalize_steps(steps)
+    if within < 0:
+        raise ValueError("within must be non-negative.")
+    timestamp = get_data(table["timestamp"])
+    data = get_data(table[column])
+    n = len(timestamp)
+
+    # the buffered events that match any step: their row indices, timestamps, and the steps they match
+    rows = np.empty(0, dtype=np.int64)
+    times = np.empty(0, dtype=np.float64)
+    is_member = np.empty((len(steps), 0), dtype=bool)
+    last_end = -1  # the last row of the last sequence that was kept
+    last_time = -np.inf
+    sequences = list()
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        chunk_times = np.asarray(timestamp[start:stop], dtype=np.float64)
+        if np.any(chunk_times[1:] < chunk_times[:-1]) or chunk_times[0] < last_time:
+            raise ValueError("The rows of the table must be sorted by timestamp to find sequences.")
+        last_time = chunk_times[-1]
+        chunk_is_member = np.stack([np.isin(np.asarray(data[start:stop]), step) for step in steps])
+        keep = np.flatnonzero(chunk_is_member.any(axis=0))
+        rows = np.concatenate([rows, keep + start])
+        times = np.concatenate([times, chunk_times[keep]])
+        is_member = np.concatenate([is_member, chunk_is_member[:, keep]], axis=1)
+
+        # the sequences that start more than within seconds before the last timestamp read so far cannot use the
+        # events of the next chunks
+        complete = len(times) if stop == n else int(np.searchsorted(times, last_time - within, side="left"))
+        starts = np.flatnonzero(is_member[0, :complete])
+        if not overlapping:
+            starts = starts[rows[starts] > last_end]
+        members = [np.flatnonzero(member) for member in is_member]
+        matched = _match_steps(members, starts)
+        matched = matched[matched[:, -1] >= 0]
+        matched = matched[times[matched[:, -1]] - times[matched[:, 0]] <= within]
+        matched = rows[matched]
+        if not overlapping and len(matched):
+            matched = matched[_select_non_overlapping(matched, last_end)]
+            last_end = matched[-1, -1]
+        sequences.append(matched)
+
+        # drop the buffered events that precede the first start that is still open
+        first_open = np.flatnonzero(is_member[0, complete:])
+        drop = complete + first_open[0] if len(first_open) else len(times)
+        rows, times, is_member = rows[drop:], times[drop:], is_member[:, drop:]
+
+    if not sequences:
+        return np.empty((0, len(steps)), dtype=np.int64)
+    return np.concatenate(sequences)
+
+
+def sequences_to_events_table(table, sequences, name="sequences", description="Sequences of events."):
+    """Create an EventsTable with one event per sequence, e.g., from find_sequences, whose timestamp is the timestamp
+    of the first event of the sequence and whose duration is the time to its last event.
+
+    The 'event_rows' column holds the row indices of the events of each sequence in the source table.
+    """
+    # import here to avoid a circular import
+    from .events import DurationVectorData, EventsTable, TimestampVectorData
+
+    sequences = np.asarray(sequences, dtype=np.int64)
+    timestamp = table["timestamp"]
+    # the first and the last rows of the sequences are both sorted
+    first = read_rows(timestamp, sequences[:, 0]).astype(np.float64)
+    last = read_rows(timestamp, sequences[:, -1]).astype(np.float64)
+    return EventsTable(
+        name=name,
+        description=description,
+        id=np.arange(len(sequences)),
+        columns=[
+            TimestampVectorData(
+                name="timestamp",
+                description="The time of the first event of each sequence, in seconds, from the session start time.",
+                data=first,
+                resolution=timestamp.resolution,
+            ),
+            DurationVectorData(
+                name="duration",
+                description="The time from the first to the last event of each sequence, in seconds.",
+                data=last - first,
+                resolution=timestamp.resolution,
+            ),
+            VectorData(
+                name="event_rows",
+                description="The row indices of the events of each sequence in the table '%s'." % table.name,
+                data=sequences,
+            ),
+        ],
+    )
@@ -0,0 +1,334 @@
+"""Sort the EventsTable objects of an NWB file by timestamp in bounded memory and write them to a new file.
+
+The rows are sorted with an external merge sort. First, the table is split into runs of ``chunk_size`` rows, and the
+rows of each run are sorted by timestamp and written, with all columns, to a temporary HDF5 file. Then the runs are
+merged in blocks, which produces the position in the temporary file of each row of the sorted table. Finally, the
+columns are written to the new file in blocks of sorted rows, each read as one contiguous range per run. Only a few
+blocks of ``chunk_size`` rows are held in memory at a time.
+
+Example::
+
+    from ndx_events.sorting import sort_events_file
+
+    sort_events_file("unsorted.nwb", "sorted.nwb")
+"""
+
+import os
+import tempfile
+
+import h5py
+import numpy as np
+from hdmf.common import VectorIndex, DynamicTableRegion
+from hdmf.data_utils import GenericDataChunkIterator
+from hdmf.utils import StrDataset, get_docval
+from pynwb import NWBHDF5IO
+
+from .events import CategoricalVectorData, MeaningsTable, EventCounts, EventsTable, NdxEventsNWBFile
+from .summary import (
+    DURATION_QUANTILE_LEVELS,
+    compute_timestamp_summary,
+    compute_duration_quantiles,
+    compute_value_counts,
+)
+from .utils import DEFAULT_CHUNK_SIZE, get_data, iter_chunks
+
+# Names of the datasets of the temporary file that do not store a column
+_KEY = "__key__"
+_ROW = "__row__"
+_POSITION = "__position__"
+_ID = "__id__"
+
+
+def _is_string_dataset(data):
+    return isinstance(data, h5py.Dataset) and h5py.check_string_dtype(data.dtype) is not None
+
+
+def _as_readable(data):
+    """Wrap an HDF5 string dataset so that it is read as Python strings rather than bytes."""
+    if _is_string_dataset(data) and not isinstance(data, StrDataset):
+        return StrDataset(data, None)
+    return data
+
+
+def _take(data, positions):
+    """Read the values at the given positions of a list, array, or HDF5 dataset along the first axis.
+
+    The positions are sorted and grouped into contiguous ranges so that each range is read with a single slice.
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    order = np.argsort(positions, kind="stable")
+    sorted_positions = positions[order]
+    breaks = np.flatnonzero(np.diff(sorted_positions) != 1) + 1
+    starts = np.concatenate(([0], breaks))
+    stops = np.concatenate((breaks, [len(sorted_positions)]))
+    parts = [
+        np.asarray(data[sorted_positions[start] : sorted_positions[stop - 1] + 1])
+        for start, stop in zip(starts.tolist(), stops.tolist())
+        if stop > start
+    ]
+    values = np.concatenate(parts) if parts else np.asarray(data[0:0])
+    result = np.empty_like(values)
+    result[order] = values
+    return result
+
+
+def _sort_key(timestamps):
+    # NaN timestamps are sorted last
+    return np.where(np.isnan(timestamps), np.inf, timestamps)
+
+
+def _write_runs(table, colnames, runs_file, chunk_size):
+    """Sort each run of chunk_size rows by timestamp and write all columns of the sorted runs to runs_file.
+
+    Returns the list of (start, stop) rows of the runs and whether any timestamp is NaN.
+    """
+    n = len(table)
+    sources = {name: _as_readable(get_data(table[name])) for name in colnames}
+    sources[_ID] = get_data(table.id)
+    for name, data in sources.items():
+        sample = np.asarray(data[0:1])
+        dtype = h5py.string_dtype() if sample.dtype.kind in "OSU" else sample.dtype
+        runs_file.create_dataset(name, shape=(n,) + sample.shape[1:], dtype=dtype)
+    runs_file.create_dataset(_KEY, shape=(n,), dtype=np.float64)
+    runs_file.create_dataset(_ROW, shape=(n,), dtype=np.int64)
+    runs = list()
+    has_nan = False
+    for start, chunk in zip(range(0, n, chunk_size), iter_chunks(get_data(table["timestamp"]), chunk_size)):
+        stop = start + len(chunk)
+        has_nan = has_nan or bool(np.isnan(chunk).any())
+        key = _sort_key(chunk.astype(np.float64))
+        order = np.argsort(key, kind="stable")
+        runs_file[_KEY][start:stop] = key[order]
+        runs_file[_ROW][start:stop] = order + start
+        for name, data in sources.items():
+            runs_file[name][start:stop] = np.asarray(data[start:stop])[order]
+        runs.append((start, stop))
+    return runs, has_nan
+
+
+def _merge_runs(runs, runs_file, chunk_size):
+    """Merge the sorted runs and write the position in runs_file of each row of the sorted table.
+
+    Rows are ordered by (timestamp, original row), which is unique, so the sort is stable. At each step, a buffer of
+    keys is held for each run, and all buffered rows up to the smallest last buffered key are merged with a
+    vectorized sort.
+    """
+    n = runs[-1][1] if runs else 0
+    positions = runs_file.create_dataset(_POSITION, shape=(n,), dtype=np.int64)
+    buffer_size = max(chunk_size // max(len(runs), 1), 1)
+    cursors = [start for start, _ in runs]  # position of the next row to buffer in each run
+    buffers = [(np.empty(0), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)) for _ in runs]
+    offset = 0
+    while offset < n:
+        for i, (_, stop) in enumerate(runs):
+            keys, rows, run_positions = buffers[i]
+            if len(keys) < buffer_size // 2 + 1 and cursors[i] < stop:
+                end = min(cursors[i] + buffer_size, stop)
+                buffers[i] = (
+                    np.concatenate((keys, runs_file[_KEY][cursors[i] : end])),
+                    np.concatenate((rows, runs_file[_ROW][cursors[i] : end])),
+                    np.concatenate((run_positions, np.arange(cursors[i], end))),
+                )
+                cursors[i] = end
+        # the largest key that can be merged is the smallest last buffered key of the runs that are not exhausted
+        thresholds = [
+            (buffer[0][-1], buffer[1][-1])
+            for buffer, cursor, (_, stop) in zip(buffers, cursors, runs)
+            if len(buffer[0]) and cursor < stop
+        ]
+        threshold = min(thresholds) if thresholds else (np.inf, np.iinfo(np.int64).max)
+        merged = list()
+        for i, (keys, rows, run_positions) in enumerate(buffers):
+            below = np.searchsorted(keys, threshold[0], side="left")
+            equal = np.searchsorted(keys, threshold[0], side="right")
+            count = below + np.searchsorted(rows[below:equal], threshold[1], side="right")
+            merged.append((keys[:count], rows[:count], run_positions[:count]))
+            buffers[i] = (keys[count:], rows[count:], run_positions[count:])
+        keys, rows, run_positions = (np.concatenate(parts) for parts in zip(*merged))
+        order = np.lexsort((rows, keys))
+        positions[offset : offset + len(order)] = run_positions[order]
+        offset += len(order)
+
+
+class _SortedDataChunkIterator(GenericDataChunkIterator):
+    """Iterate over the rows of a column of the temporary runs file in sorted order."""
+
+    def __init__(self, data, positions, **kwargs):
+        self.__data = data.asstr() if h5py.check_string_dtype(data.dtype) is not None else data
+        self.__dtype = data.dtype
+        self.__shape = data.shape
+        self.__positions = positions
+        super().__init__(**kwargs)
+
+    def _get_data(self, selection):
+        positions = self.__positions[selection[0]]
+        return _take(self.__data, positions)[(slice(None),) + tuple(selection[1:])]
+
+    def __len__(self):
+        # the length of the table, which is needed to read its sparse durations when it is written
+        return self.__shape[0]
+
+    def _get_maxshape(self):
+        return self.__shape
+
+    def _get_dtype(self):
+        return self.__dtype
+
+
+def _sort_sparse_durations(durations, runs_file, chunk_size):
+    """Move the sparse durations of a table to the rows of the sorted table.
+
+    Returns the indices of the sorted rows that have a duration, in increasing order, and their durations. The sparse
+    durations are held in memory, and the rows of the sorted table are mapped to their original rows in blocks of
+    chunk_size rows.
+    """
+    rows = np.asarray(durations.rows[:], dtype=np.int64)
+    values = np.asarray(durations.values[:], dtype=np.float64)
+    sorted_rows = np.empty(len(rows), dtype=np.int64)
+    positions = runs_file[_POSITION]
+    for start in range(0, len(positions) if len(rows) else 0, chunk_size):
+        original = _take(runs_file[_ROW], positions[start : start + chunk_size])
+        indices = np.minimum(np.searchsorted(rows, original), len(rows) - 1)
+        found = rows[indices] == original
+        sorted_rows[indices[found]] = np.flatnonzero(found) + start
+    order = np.argsort(sorted_rows, kind="stable")
+    return sorted_rows[order], values[order]
+
+
+def _copy_meanings_table(meanings_table):
+    """Copy the 'value' and 'meaning' columns of a MeaningsTable. Row indices of columns are not copied."""
+    copy = MeaningsTable(name=meanings_table.name, description=meanings_table.description)
+    values = np.asarray(meanings_table["value"].data[:]).tolist()
+    meanings = np.asarray(meanings_table["meaning"].data[:]).tolist()
+    for value, meaning in zip(values, meanings):
+        copy.add_row(value=value.decode("utf-8") if isinstance(value, bytes) else value, meaning=meaning)
+    return copy
+
+
+def _copy_column(column, data, meanings_tables, **overrides):
+    """Create a column of the same type and with the same attributes as column, with the given data."""
+    kwargs = {
+        arg["name"]: getattr(column, arg["name"], None)
+        for arg in get_docval(type(column).__init__)
+        if arg["name"] not in ("data", "skip_post_init", "table", "target")
+    }
+    kwargs = {key: value for key, value in kwargs.items() if value is not None}
+    if isinstance(column, CategoricalVectorData):
+        kwargs["meanings"] = meanings_tables[column.meanings.object_id]
+        kwargs["value_counts"] = compute_value_counts(column)
+    kwargs.update(overrides)
+    return type(column)(data=data, **kwargs)
+
+
+def sort_events_table(table, runs_file, meanings_tables, chunk_size=DEFAULT_CHUNK_SIZE, chunk_mb=1.0):
+    """Sort an EventsTable by timestamp using runs_file, an open writable HDF5 file, as temporary storage.
+
+    Returns a new EventsTable whose columns are iterators over the sorted rows that are read from runs_file when the
+    table is written, so runs_file must stay open until then. meanings_tables maps the object ID of each MeaningsTable
+    referenced by the table to its copy in the new file. The summary attributes of the new table are computed from
+    the original table since they do not depend on the order of the rows.
+    """
+    for column in table.columns:
+        if isinstance(column, (VectorIndex, DynamicTableRegion)):
+            raise ValueError(
+                "Cannot sort EventsTable '%s' with the ragged or reference column '%s'." % (table.name, column.name)
+            )
+    colnames = list(table.colnames)
+    runs, has_nan = _write_runs(table, colnames, runs_file, chunk_size)
+    _merge_runs(runs, runs_file, chunk_size)
+    positions = runs_file[_POSITION]
+    iterator_kwargs = dict(buffer_shape=None, chunk_mb=chunk_mb, display_progress=False)
+
+    def sorted_data(name):
+        return _SortedDataChunkIterator(runs_file[name], positions, **iterator_kwargs)
+
+    num_events, min_timestamp, max_timestamp, _ = compute_timestamp_summary(table["timestamp"], chunk_size)
+    duration_quantile_levels = duration_quantiles = duration_rows = duration_values = None
+    durations = table.get_durations()
+    if durations is not None:
+        levels = table.duration_quantile_levels
+        levels = DURATION_QUANTILE_LEVELS if levels is None else np.asarray(levels).tolist()
+        duration_quantiles = compute_duration_quantiles(durations, levels, chunk_size)
+        if duration_quantiles is not None:
+            duration_quantile_levels = list(levels)
+    if "duration" not in colnames and table.duration_values is not None:
+        duration_rows, duration_values = _sort_sparse_durations(durations, runs_file, chunk_size)
+    columns = list()
+    for name in colnames:
+        # sorting puts NaN timestamps last, but timestamps that contain NaN are not flagged as sorted
+        overrides = dict(sorted=not has_nan) if name == "timestamp" else dict()
+        columns.append(_copy_column(table[name], sorted_data(name), meanings_tables, **overrides))
+    event_counts = None
+    if table.event_counts is not None:
+        event_counts = EventCounts(
+            name=table.event_counts.name,
+            data=np.asarray(table.event_counts.data[:]),
+            start_time=table.event_counts.start_time,
+            bin_width=table.event_counts.bin_width,
+            level_offsets=np.asarray(table.event_counts.level_offsets[:]),
+            category_column=table.event_counts.category_column,
+        )
+    return EventsTable(
+        name=table.name,
+        description=table.description,
+        id=sorted_data(_ID),
+        columns=columns,
+        meanings_tables=[meanings_tables[meanings.object_id] for meanings in table.meanings_tables.values()] or None,
+        num_events=num_events,
+        min_timestamp=min_timestamp,
+        max_timestamp=max_timestamp,
+        duration_quantile_levels=duration_quantile_levels,
+        duration_quantiles=duration_quantiles,
+        duration_rows=duration_rows,
+        duration_values=duration_values,
+        event_counts=event_counts,
+    )
+
+
+def sort_events_file(source_path, target_path, tables=None, chunk_size=DEFAULT_CHUNK_SIZE, chunk_mb=1.0, temp_dir=None):
+    """Sort the EventsTable objects of an NWB file by timestamp and write them to a new NdxEventsNWBFile.
+
+    Every column, including the row IDs and CategoricalVectorData columns, and the sparse durations of the tables are
+    permuted consistently. tables is a list of the names of the tables to sort; by default, all tables are sorted. At
+    most a few blocks of chunk_size rows, and the sparse durations, are held in memory at a time, and the columns of
+    the new file are written in HDF5 chunks of about chunk_mb megabytes. The sorted runs are stored in a temporary
+    file in temp_dir, which defaults to the directory of target_path. Ragged and reference columns are not
+    supported. Returns the names of the sorted tables.
+    """
+    if temp_dir is None:
+        temp_dir = os.path.dirname(os.path.abspath(target_path))
+    with NWBHDF5IO(source_path, mode="r") as source_io, tempfile.TemporaryDirectory(dir=temp_dir) as runs_dir:
+        source = source_io.read()
+        names = list(source.events) if tables is None else list(tables)
+        nwbfile = NdxEventsNWBFile(
+            identifier=source.identifier,
+            session_description=source.session_description,
+            session_start_time=source.session_start_time,
+        )
+        # copy each MeaningsTable once, so that MeaningsTable objects shared by columns stay shared
+        meanings_tables = dict()
+        for name in names:
+            for meanings in source.events[name].meanings_tables.values():
+                meanings_tables[meanings.object_id] = _copy_meanings_table(meanings)
+        runs_files = list()
+        try:
+            for i, name in enumerate(names):
+                table = source.events[name]
+                owned = set(meanings.object_id for meanings in table.meanings_tables.values())
+                for column in table.columns:
+                    if isinstance(column, CategoricalVectorData) and column.meanings.object_id not in meanings_tables:
+                        # the MeaningsTable is stored in a table that is not sorted
+                        meanings_tables[column.meanings.object_id] = _copy_meanings_table(column.meanings)
+                        owned.add(column.meanings.object_id)
+                runs_file = h5py.File(os.path.join(runs_dir, "runs_%d.h5" % i), "w")
+                runs_files.append(runs_file)
+                sorted_table = sort_events_table(table, runs_file, meanings_tables, chunk_size, chunk_mb)
+                for object_id in owned - set(meanings.object_id for meanings in table.meanings_tables.values()):
+                    sorted_table.add_meanings_tables(meanings_tables[object_id])
+                nwbfile.add_events_table(sorted_table)
+            with NWBHDF5IO(target_path, mode="w") as target_io:
+                target_io.write(nwbfile)
+        finally:
+            for runs_file in runs_files:
+                runs_file.close()
+    return names
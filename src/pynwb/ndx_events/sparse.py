@@ -0,0 +1,111 @@
+"""A sparse representation of a DurationVectorData column in which most events do not have a duration."""
+
+import bisect
+
+import numpy as np
+from hdmf.query import HDMFDataset
+
+from .utils import DEFAULT_CHUNK_SIZE, iter_chunks
+
+
+class SparseDurations(HDMFDataset):
+    """A read-only 1D array of durations that stores only the durations of the rows that have one.
+
+    The durations of the other rows are NaN. The sorted indices of the rows that have a duration and their durations
+    are stored in the 'rows' and 'values' arrays or HDF5 datasets. Indexing and slicing return the same NumPy arrays
+    as the dense array, but read only the stored durations of the selected rows.
+
+    An EventsTable stores its durations sparsely in its 'duration_rows' and 'duration_values' datasets, instead of in
+    a 'duration' column, so that every column of the table keeps one value per row. EventsTable.get_durations returns
+    these durations as a SparseDurations object.
+    """
+
+    ndim = 1
+
+    def __init__(self, rows, values, length):
+        if len(rows) != len(values):
+            raise ValueError("rows and values must have the same length.")
+        super().__init__(dataset=values)
+        self.rows = rows
+        self.values = values
+        self.length = int(length)
+        self.__rows_in_memory = None
+
+    @classmethod
+    def from_dense(cls, data, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Create a SparseDurations from a dense array of durations with NaN for the rows without a duration."""
+        rows = list()
+        values = list()
+        offset = 0
+        for chunk in iter_chunks(data, chunk_size):
+            chunk_rows = np.flatnonzero(~np.isnan(chunk))
+            rows.append(chunk_rows + offset)
+            values.append(chunk[chunk_rows].astype(np.float64))
+            offset += len(chunk)
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        values = np.concatenate(values) if values else np.empty(0, dtype=np.float64)
+        return cls(rows, values, offset)
+
+    @property
+    def dtype(self):
+        return np.dtype(np.float64)
+
+    @property
+    def shape(self):
+        return (self.length,)
+
+    def __len__(self):
+        return self.length
+
+    def _get_rows(self):
+        # the row indices are read into memory at most once, for selections that are not a range of rows
+        if self.__rows_in_memory is None:
+            self.__rows_in_memory = np.asarray(self.rows[:], dtype=np.int64)
+        return self.__rows_in_memory
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            index = key + self.length if key < 0 else key
+            if not 0 <= index < self.length:
+                raise IndexError("index %d is out of bounds for SparseDurations of length %d" % (key, self.length))
+            position = bisect.bisect_left(self.rows, index)
+            if position < len(self.rows) and self.rows[position] == index:
+                return float(self.values[position])
+            return np.nan
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.length)
+            if step != 1:
+                return self[np.arange(start, stop, step)]
+            result = np.full(max(stop - start, 0), np.nan)
+            first = bisect.bisect_left(self.rows, start)
+            last = bisect.bisect_left(self.rows, stop, lo=first)
+            if last > first:
+                result[np.asarray(self.rows[first:last]) - start] = self.values[first:last]
+            return result
+        key = np.asarray(key)
+        if key.dtype == bool:
+            key = np.flatnonzero(key)
+        key = np.where(key < 0, key + self.length, key).astype(np.int64)
+        if len(key) and (key.min() < 0 or key.max() >= self.length):
+            raise IndexError("index out of bounds for SparseDurations of length %d" % self.length)
+        rows = self._get_rows()
+        positions = np.clip(np.searchsorted(rows, key), 0, max(len(rows) - 1, 0))
+        found = rows[positions] == key if len(rows) else np.zeros(len(key), dtype=bool)
+        result = np.full(len(key), np.nan)
+        if found.any():
+            # read the stored durations of the selected rows with a single slice
+            needed = positions[found]
+            first, last = int(needed.min()), int(needed.max()) + 1
+            result[found] = np.asarray(self.values[first:last])[needed - first]
+        return result
+
+    def __array__(self, dtype=None, copy=None):
+        result = self[:]
+        return result if dtype is None else result.astype(dtype)
+
+    def __iter__(self):
+        for chunk in iter_chunks(self):
+            yield from chunk.tolist()
+
+    def __repr__(self):
+        return "SparseDurations(length=%d, stored=%d)" % (self.length, len(self.rows))
@@ -0,0 +1,204 @@
+"""Functions to compute the precomputed summary statistics stored alongside an EventsTable."""
+
+import numpy as np
+
+from .sparse import SparseDurations
+from .utils import DEFAULT_CHUNK_SIZE, get_data, iter_chunks
+
+# Quantile levels of the 'duration' column that are stored in the summary by default
+DURATION_QUANTILE_LEVELS = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+# Maximum number of durations held in memory to compute the quantiles of the 'duration' column (8 MiB)
+MAX_QUANTILE_VALUES = 2**20
+
+# Number of bins of the histograms used to find the quantiles of more than MAX_QUANTILE_VALUES durations
+_QUANTILE_BINS = 1024
+
+
+def is_readable(data):
+    """Return True if the data supports len() and slicing, i.e., it can be streamed over without consuming it."""
+    try:
+        len(data)
+        data[0:0]
+    except Exception:
+        return False
+    return True
+
+
+def compute_timestamp_summary(timestamp, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Compute the number of events, the min/max timestamp, and whether the timestamps are sorted in a single
+    streaming pass.
+
+    Returns a tuple of (num_events, min_timestamp, max_timestamp, is_sorted), or None if the data cannot be read
+    without consuming it. The min and max are None if there are no events. Timestamps that contain NaN are not
+    sorted.
+    """
+    data = get_data(timestamp)
+    if not is_readable(data):
+        return None
+    num_events = 0
+    min_timestamp = max_timestamp = last = None
+    is_sorted = True
+    for chunk in iter_chunks(data, chunk_size):
+        if len(chunk) == 0:
+            continue
+        num_events += len(chunk)
+        chunk_min, chunk_max = float(np.nanmin(chunk)), float(np.nanmax(chunk))
+        min_timestamp = chunk_min if min_timestamp is None else min(min_timestamp, chunk_min)
+        max_timestamp = chunk_max if max_timestamp is None else max(max_timestamp, chunk_max)
+        if is_sorted:
+            is_sorted = bool(np.all(chunk[1:] >= chunk[:-1])) and not np.isnan(chunk[0])
+            is_sorted = is_sorted and (last is None or chunk[0] >= last)
+            last = chunk[-1]
+    return num_events, min_timestamp, max_timestamp, is_sorted
+
+
+def _find_ranked_values(data, ranks, min_value, max_value, max_values, chunk_size):
+    """Find the values at the given ranks, i.e., positions in sorted order, of the non-NaN values of the data.
+
+    Each rank is first searched for in the range of all values. In each streaming pass, the range of each rank is
+    split into bins, and the rank is either narrowed down to the range of the values of its bin or, if its bin has at
+    most max_values values, the values of its bin are kept in memory in the next pass and sorted. Each range holds
+    fewer values than the range that it was narrowed down from, so the search ends. Returns a dictionary mapping each
+    rank to its value.
+    """
+    max_values = max(max_values // len(ranks), 1)
+    result = dict()
+    # (low, high, number of values below low) -> ranks of the values in the closed range [low, high]
+    searches = {(min_value, max_value, 0): list(ranks)}
+    collects = dict()
+    while searches or collects:
+        edges = {key: np.linspace(key[0], key[1], _QUANTILE_BINS + 1) for key in searches}
+        counts = {key: np.zeros(_QUANTILE_BINS, dtype=np.int64) for key in searches}
+        lows = {key: np.full(_QUANTILE_BINS, np.inf) for key in searches}
+        highs = {key: np.full(_QUANTILE_BINS, -np.inf) for key in searches}
+        collected = {key: list() for key in collects}
+        for chunk in iter_chunks(data, chunk_size):
+            chunk = np.sort(chunk[~np.isnan(chunk)])
+            for key in searches:
+                values = chunk[np.searchsorted(chunk, key[0], "left") : np.searchsorted(chunk, key[1], "right")]
+                # the bins are [edges[i], edges[i + 1]), except the last one, which includes the high end
+                starts = np.concatenate([[0], np.searchsorted(values, edges[key][1:-1], "left"), [len(values)]])
+                sizes = np.diff(starts)
+                counts[key] += sizes
+                filled = sizes > 0
+                lows[key][filled] = np.minimum(lows[key][filled], values[starts[:-1][filled]])
+                highs[key][filled] = np.maximum(highs[key][filled], values[starts[1:][filled] - 1])
+            for key in collects:
+                collected[key].append(
+                    chunk[np.searchsorted(chunk, key[0], "left") : np.searchsorted(chunk, key[1], "right")]
+                )
+        for key, key_ranks in collects.items():
+            values = np.sort(np.concatenate(collected[key]))
+            for rank in key_ranks:
+                result[rank] = float(values[rank - key[2]])
+        collects = dict()
+        next_searches = dict()
+        for key, key_ranks in searches.items():
+            below = key[2] + np.concatenate([[0], np.cumsum(counts[key])])
+            for rank in key_ranks:
+                i = int(np.searchsorted(below, rank, "right")) - 1
+                if lows[key][i] == highs[key][i]:
+                    result[rank] = float(lows[key][i])
+                else:
+                    new_key = (lows[key][i], highs[key][i], int(below[i]))
+                    target = collects if counts[key][i] <= max_values else next_searches
+                    target.setdefault(new_key, list()).append(rank)
+        searches = next_searches
+    return result
+
+
+def compute_duration_quantiles(
+    duration, levels=DURATION_QUANTILE_LEVELS, chunk_size=DEFAULT_CHUNK_SIZE, max_values=MAX_QUANTILE_VALUES
+):
+    """Compute the quantiles of the non-NaN durations at the given levels, interpolated linearly as by np.quantile.
+
+    The durations are streamed in chunks. If there are at most max_values non-NaN durations, they are kept in memory
+    and read once. Otherwise, the values needed for the quantiles are found in a few more passes over the data with
+    histograms of the ranges that contain them, holding at most max_values durations and a fixed number of bins in
+    memory. Returns None if the data cannot be read without consuming it or if all durations are NaN.
+    """
+    data = get_data(duration)
+    if isinstance(data, SparseDurations):
+        # only the durations of the rows that have one are stored
+        data = data.values
+    if not is_readable(data):
+        return None
+    values = list()
+    count = 0
+    min_value, max_value = np.inf, -np.inf
+    for chunk in iter_chunks(data, chunk_size):
+        chunk = chunk[~np.isnan(chunk)]
+        if len(chunk) == 0:
+            continue
+        count += len(chunk)
+        min_value, max_value = min(min_value, float(chunk.min())), max(max_value, float(chunk.max()))
+        if values is not None:
+            values.append(chunk)
+            if count > max_values:
+                values = None
+    if count == 0:
+        return None
+    if values is not None:
+        return np.quantile(np.concatenate(values), levels)
+    positions = (count - 1) * np.asarray(levels, dtype=np.float64)
+    lower, upper = np.floor(positions).astype(np.int64), np.ceil(positions).astype(np.int64)
+    ranked = _find_ranked_values(data, np.union1d(lower, upper).tolist(), min_value, max_value, max_values, chunk_size)
+    lower_values = np.array([ranked[rank] for rank in lower.tolist()])
+    upper_values = np.array([ranked[rank] for rank in upper.tolist()])
+    return lower_values + (upper_values - lower_values) * (positions - lower)
+
+
+def compute_value_counts(column, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Count the occurrences of each value of the MeaningsTable referenced by a CategoricalVectorData column.
+
+    Returns a NumPy integer array aligned with the 'value' column of the MeaningsTable, or None if the column or
+    its meanings cannot be read without consuming them.
+    """
+    data = get_data(column)
+    if column.meanings is None or not is_readable(data):
+        return None
+    counts = dict()
+    for chunk in iter_chunks(data, chunk_size):
+        chunk_values, chunk_counts = np.unique(chunk, return_counts=True)
+        for value, count in zip(chunk_values.tolist(), chunk_counts.tolist()):
+            counts[value] = counts.get(value, 0) + count
+    meaning_values = np.asarray(column.meanings["value"].data[:]).tolist()
+    return np.array([counts.get(value, 0) for value in meaning_values], dtype=np.int64)
+
+
+def compute_events_table_summary(table, levels=DURATION_QUANTILE_LEVELS, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Compute the summary statistics of an EventsTable by streaming over its columns.
+
+    Returns a dictionary with the keys "num_events", "min_timestamp", "max_timestamp",
+    "duration_quantile_levels", "duration_quantiles", and "value_counts". "value_counts" maps the name of each
+    CategoricalVectorData column to a dictionary mapping each value of its MeaningsTable to its count. Statistics
+    that cannot be computed are None.
+    """
+    # import here to avoid a circular import
+    from .events import CategoricalVectorData
+
+    summary = dict(
+        num_events=None,
+        min_timestamp=None,
+        max_timestamp=None,
+        duration_quantile_levels=None,
+        duration_quantiles=None,
+        value_counts=dict(),
+    )
+    timestamp_summary = compute_timestamp_summary(table["timestamp"], chunk_size)
+    if timestamp_summary is not None:
+        summary["num_events"], summary["min_timestamp"], summary["max_timestamp"], _ = timestamp_summary
+    durations = table.get_durations()
+    if durations is not None:
+        quantiles = compute_duration_quantiles(durations, levels, chunk_size)
+        if quantiles is not None:
+            summary["duration_quantile_levels"] = list(levels)
+            summary["duration_quantiles"] = quantiles.tolist()
+    for column in table.columns:
+        if isinstance(column, CategoricalVectorData):
+            counts = compute_value_counts(column, chunk_size)
+            if counts is not None:
+                values = np.asarray(column.meanings["value"].data[:]).tolist()
+                summary["value_counts"][column.name] = dict(zip(values, counts.tolist()))
+    return summary
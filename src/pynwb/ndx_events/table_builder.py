@@ -0,0 +1,185 @@
+"""A compact in-memory builder for large EventsTable objects."""
+
+import numpy as np
+from hdmf.common import VectorData
+
+from .events import TimestampVectorData, DurationVectorData, CategoricalVectorData, EventsTable
+from .sparse import SparseDurations
+
+
+class ColumnBuffer:
+    """A growable 1D NumPy buffer that doubles its capacity when full.
+
+    Values are stored unboxed in a preallocated array, so appending N values costs O(N) amortized time and at most
+    twice the memory of the values themselves.
+    """
+
+    __slots__ = ("_array", "_size")
+
+    def __init__(self, dtype, capacity=1024):
+        self._array = np.empty(max(int(capacity), 1), dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def dtype(self):
+        return self._array.dtype
+
+    @property
+    def data(self):
+        """A view of the values in the buffer, without copying."""
+        return self._array[: self._size]
+
+    def _reserve(self, size):
+        capacity = len(self._array)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        array = np.empty(capacity, dtype=self._array.dtype)
+        array[: self._size] = self._array[: self._size]
+        self._array = array
+
+    def append(self, value):
+        self._reserve(self._size + 1)
+        self._array[self._size] = value
+        self._size += 1
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._array.dtype)
+        self._reserve(self._size + len(values))
+        self._array[self._size : self._size + len(values)] = values
+        self._size += len(values)
+
+    def trim(self):
+        """Shrink the capacity of the buffer to its size to release the unused memory."""
+        if len(self._array) != self._size:
+            self._array = self._array[: self._size].copy()
+
+
+class EventsTableBuilder:
+    """Collect the rows of an EventsTable in NumPy buffers and build the EventsTable when done.
+
+    An EventsTable built with EventsTable.add_row stores each column as a Python list of boxed values, which for
+    tens of millions of events costs gigabytes of memory. This builder stores each column in a ColumnBuffer instead
+    and hands the NumPy arrays directly to the EventsTable, so they can be written by NWBHDF5IO without conversion.
+
+    Example::
+
+        builder = EventsTableBuilder(name="ttl_events", description="TTL events", duration=False)
+        builder.add_column(name="pulse_value", description="Pulse value", dtype=np.uint8, meanings=meanings_table)
+        builder.add_rows(timestamp=timestamps, pulse_value=values)
+        events_table = builder.to_events_table()
+    """
+
+    __slots__ = ("name", "description", "_buffers", "_columns", "_size")
+
+    def __init__(self, name, description, duration=False, resolution=None, capacity=1024):
+        self.name = name
+        self.description = description
+        self._buffers = dict()
+        self._columns = dict()  # column name -> (column class, constructor kwargs)
+        self._size = 0
+        self._add_column(
+            "timestamp",
+            TimestampVectorData,
+            np.float64,
+            capacity,
+            resolution=resolution,
+            description="The time that each event occurred, in seconds, from the session start time.",
+        )
+        if duration:
+            self._add_column(
+                "duration",
+                DurationVectorData,
+                np.float64,
+                capacity,
+                resolution=resolution,
+                description="The duration of each event, in seconds.",
+            )
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def colnames(self):
+        return tuple(self._columns)
+
+    def _add_column(self, name, col_cls, dtype, capacity, **kwargs):
+        if name in self._columns:
+            raise ValueError("Column '%s' already exists in EventsTableBuilder '%s'." % (name, self.name))
+        if self._size > 0:
+            raise ValueError("Cannot add column '%s' after rows have been added." % name)
+        self._buffers[name] = ColumnBuffer(dtype, capacity)
+        self._columns[name] = (col_cls, {k: v for k, v in kwargs.items() if v is not None})
+
+    def add_column(self, name, description, dtype=np.float64, meanings=None, capacity=1024):
+        """Add a column with the given NumPy dtype. If meanings is given, the column is a CategoricalVectorData."""
+        col_cls = VectorData if meanings is None else CategoricalVectorData
+        self._add_column(name, col_cls, dtype, capacity, description=description, meanings=meanings)
+
+    def add_row(self, **kwargs):
+        """Append one event. A value must be given for every column."""
+        if set(kwargs) != set(self._columns):
+            raise ValueError("add_row requires values for exactly the columns %s." % list(self._columns))
+        # convert all values before appending any, so that an invalid value leaves every buffer unchanged
+        values = dict()
+        for name, value in kwargs.items():
+            dtype = self._buffers[name].dtype
+            if dtype.kind != "O":
+                value = np.asarray(value, dtype=dtype)
+                if value.ndim != 0:
+                    raise ValueError(
+                        "add_row requires a single value for column '%s', got shape %s." % (name, value.shape)
+                    )
+            values[name] = value
+        for name, value in values.items():
+            self._buffers[name].append(value)
+        self._size += 1
+
+    def add_rows(self, **kwargs):
+        """Append many events at once from arrays of equal length, one for every column."""
+        if set(kwargs) != set(self._columns):
+            raise ValueError("add_rows requires values for exactly the columns %s." % list(self._columns))
+        # convert all arrays before appending any, so that an invalid value leaves every buffer unchanged
+        arrays = {name: np.asarray(values, dtype=self._buffers[name].dtype) for name, values in kwargs.items()}
+        lengths = {len(values) for values in arrays.values()}
+        if len(lengths) != 1:
+            raise ValueError("add_rows requires arrays of the same length, got lengths %s." % sorted(lengths))
+        for name, values in arrays.items():
+            self._buffers[name].extend(values)
+        self._size += lengths.pop()
+
+    def to_events_table(self, trim=True, sparse_duration=False):
+        """Build the EventsTable with the NumPy arrays of the buffers as the data of its columns.
+
+        If trim is True, the unused capacity of the buffers is released first. If sparse_duration is True, the table
+        has no 'duration' column; only the durations that are not NaN are stored, in its 'duration_values' dataset,
+        with their row indices in its 'duration_rows' dataset (see EventsTable.get_durations). The MeaningsTable
+        objects of the categorical columns that do not yet have a parent are added to the EventsTable.
+        """
+        columns = list()
+        meanings_tables = list()
+        sparse = None
+        for name, (col_cls, kwargs) in self._columns.items():
+            if trim:
+                self._buffers[name].trim()
+            data = self._buffers[name].data
+            if sparse_duration and col_cls is DurationVectorData:
+                sparse = SparseDurations.from_dense(data)
+                continue
+            columns.append(col_cls(name=name, data=data, **kwargs))
+            meanings = kwargs.get("meanings")
+            if meanings is not None and meanings.parent is None and all(m is not meanings for m in meanings_tables):
+                meanings_tables.append(meanings)
+        return EventsTable(
+            name=self.name,
+            description=self.description,
+            id=np.arange(self._size),
+            columns=columns,
+            meanings_tables=meanings_tables or None,
+            duration_rows=None if sparse is None else sparse.rows,
+            duration_values=None if sparse is None else sparse.values,
+        )
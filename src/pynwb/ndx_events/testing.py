@@ -0,0 +1,282 @@
+"""Generate large synthetic NdxEventsNWBFile files, to test and benchmark the ndx-events API at scale.
+
+The columns are generated block by block while they are written, so the size of a synthetic file is not limited by
+memory. Each block is generated by its own random number generator, seeded by the seed of the file, the index of the
+table, the column, and the index of the block, so the same parameters always produce the same file.
+
+Example::
+
+    from ndx_events.testing import SyntheticTable, write_synthetic_file
+
+    write_synthetic_file(
+        "synthetic.nwb",
+        [
+            SyntheticTable("ttl_events", num_events=10_000_000, rate=1000.0, categories=[1, 3, 31, 66]),
+            SyntheticTable("licks", num_events=100_000, rate=5.0, duration_fraction=0.01, sparse_duration=True),
+        ],
+    )
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+from hdmf.data_utils import GenericDataChunkIterator
+from pynwb import NWBHDF5IO
+
+from .events import (
+    CategoricalVectorData,
+    DurationVectorData,
+    EventsTable,
+    MeaningsTable,
+    NdxEventsNWBFile,
+    TimestampVectorData,
+)
+from .summary import DURATION_QUANTILE_LEVELS, compute_duration_quantiles
+
+# Number of rows generated at a time, which is also the HDF5 chunk length of the columns
+DEFAULT_BLOCK_SIZE = 2**16
+
+# Indices of the columns in the seeds of the random number generators of the blocks
+_TIMESTAMP, _DURATION, _CATEGORY = range(3)
+
+
+class SyntheticTable:
+    """The parameters of a synthetic EventsTable.
+
+    The timestamps are a Poisson process with the given rate, in events per second, starting at 0. If categories is
+    given, the table has a "category" CategoricalVectorData column whose values are drawn from categories with the
+    given weights (uniform by default), with a MeaningsTable that maps each value to "category <value>". If
+    duration_fraction is greater than 0, the table has a "duration" column in which that fraction of the events have
+    an exponentially distributed duration with the given mean, and the other events have NaN. If sparse_duration is
+    True, the table has no "duration" column; the durations that are not NaN and their rows are instead stored in
+    the "duration_values" and "duration_rows" datasets of the table, and are held in memory.
+    """
+
+    __slots__ = (
+        "name",
+        "num_events",
+        "rate",
+        "categories",
+        "category_weights",
+        "duration_fraction",
+        "mean_duration",
+        "sparse_duration",
+        "description",
+    )
+
+    def __init__(
+        self,
+        name,
+        num_events,
+        rate=100.0,
+        categories=None,
+        category_weights=None,
+        duration_fraction=0.0,
+        mean_duration=0.1,
+        sparse_duration=False,
+        description=None,
+    ):
+        if num_events < 1:
+            raise ValueError("A synthetic table must have at least one event.")
+        if not 0.0 <= duration_fraction <= 1.0:
+            raise ValueError("duration_fraction must be between 0 and 1.")
+        if categories is not None:
+            categories = np.asarray(categories)
+            if category_weights is not None:
+                category_weights = np.asarray(category_weights, dtype=np.float64)
+                category_weights = category_weights / category_weights.sum()
+        self.name = name
+        self.num_events = int(num_events)
+        self.rate = float(rate)
+        self.categories = categories
+        self.category_weights = category_weights
+        self.duration_fraction = float(duration_fraction)
+        self.mean_duration = float(mean_duration)
+        self.sparse_duration = sparse_duration
+        self.description = "Synthetic events." if description is None else description
+
+
+class _SyntheticColumn:
+    """Generate the blocks of one column of a synthetic table.
+
+    The column supports len() and slicing, so it can be streamed over like a column that was read from a file.
+    """
+
+    def __init__(self, table, seed, table_index, column, dtype, block_size):
+        self.table = table
+        self.seed = seed
+        self.table_index = table_index
+        self.column = column
+        self.dtype = np.dtype(dtype)
+        self.block_size = block_size
+        self.__cache = (None, None)
+        # the time of the last event before each block of the timestamp column, from the durations of the blocks
+        self.block_offsets = None
+        if column == _TIMESTAMP:
+            block_durations = [self.generate_block(block)[-1] for block in range(self.num_blocks())]
+            self.block_offsets = np.concatenate([[0.0], np.cumsum(block_durations)[:-1]])
+            self.__cache = (None, None)
+
+    def num_blocks(self):
+        return (self.table.num_events - 1) // self.block_size + 1
+
+    def generate_block(self, block):
+        if self.__cache[0] == block:
+            return self.__cache[1]
+        size = min(self.block_size, self.table.num_events - block * self.block_size)
+        rng = np.random.default_rng([self.seed, self.table_index, self.column, block])
+        if self.column == _TIMESTAMP:
+            values = rng.exponential(1.0 / self.table.rate, size)
+            np.cumsum(values, out=values)
+            if self.block_offsets is not None:
+                values += self.block_offsets[block]
+        elif self.column == _DURATION:
+            values = np.full(size, np.nan)
+            has_duration = rng.random(size) < self.table.duration_fraction
+            values[has_duration] = rng.exponential(self.table.mean_duration, int(has_duration.sum()))
+        else:
+            values = rng.choice(self.table.categories, size, p=self.table.category_weights)
+        values = values.astype(self.dtype, copy=False)
+        self.__cache = (block, values)
+        return values
+
+    def read(self, start, stop):
+        first, last = start // self.block_size, (stop - 1) // self.block_size
+        blocks = [self.generate_block(block) for block in range(first, last + 1)]
+        offset = first * self.block_size
+        values = blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+        return values[start - offset : stop - offset]
+
+    def __len__(self):
+        return self.table.num_events
+
+    def __getitem__(self, selection):
+        start, stop, step = selection.indices(len(self))
+        if step != 1:
+            raise ValueError("A synthetic column can only be read in contiguous slices.")
+        return self.read(start, stop) if start < stop else np.empty(0, dtype=self.dtype)
+
+
+class _SyntheticDataChunkIterator(GenericDataChunkIterator):
+    """Iterate over the blocks of a synthetic column, or over the row IDs of a synthetic table if column is None."""
+
+    def __init__(self, column, num_rows, block_size):
+        self.__column = column
+        self.__num_rows = num_rows
+        shape = (min(block_size, num_rows),)
+        super().__init__(buffer_shape=shape, chunk_shape=shape, display_progress=False)
+
+    def _get_data(self, selection):
+        rows = selection[0]
+        if self.__column is None:
+            return np.arange(rows.start, rows.stop, dtype=np.int64)
+        return self.__column.read(rows.start, rows.stop)
+
+    def __len__(self):
+        # DynamicTable compares the number of row IDs with the length of the columns that are not iterators
+        return self.__num_rows
+
+    def _get_maxshape(self):
+        return (self.__num_rows,)
+
+    def _get_dtype(self):
+        return np.dtype(np.int64) if self.__column is None else self.__column.dtype
+
+
+def make_synthetic_events_table(table, seed=0, table_index=0, block_size=DEFAULT_BLOCK_SIZE):
+    """Create an EventsTable from a SyntheticTable whose columns are generated while the table is written.
+
+    The columns are generated once before the table is written, one block at a time, to compute the summary
+    attributes of the table, which cannot be computed from the iterators when the table is written. The returned
+    table can only be written once.
+    """
+    n = table.num_events
+    timestamp = _SyntheticColumn(table, seed, table_index, _TIMESTAMP, np.float64, block_size)
+    columns = [
+        TimestampVectorData(
+            name="timestamp",
+            description="The time of each event, in seconds, from the session start time.",
+            data=_SyntheticDataChunkIterator(timestamp, n, block_size),
+            sorted=True,
+        )
+    ]
+    meanings_tables = list()
+    duration_quantile_levels = duration_quantiles = duration_rows = duration_values = None
+    if table.duration_fraction > 0:
+        duration = _SyntheticColumn(table, seed, table_index, _DURATION, np.float64, block_size)
+        if table.sparse_duration:
+            rows, values = list(), list()
+            for block in range(duration.num_blocks()):
+                block_values = duration.generate_block(block)
+                block_rows = np.flatnonzero(~np.isnan(block_values))
+                rows.append(block_rows + block * block_size)
+                values.append(block_values[block_rows])
+            duration_rows, duration_values = np.concatenate(rows), np.concatenate(values)
+            duration_quantiles = compute_duration_quantiles(duration_values)
+        else:
+            # stream over the blocks of the column, which holds a bounded number of durations in memory
+            duration_quantiles = compute_duration_quantiles(duration, chunk_size=block_size)
+            columns.append(
+                DurationVectorData(
+                    name="duration",
+                    description="The duration of each event, in seconds.",
+                    data=_SyntheticDataChunkIterator(duration, n, block_size),
+                )
+            )
+        if duration_quantiles is not None:
+            duration_quantile_levels = list(DURATION_QUANTILE_LEVELS)
+    if table.categories is not None:
+        meanings = MeaningsTable(name="category_meanings", description="The meanings of the categories.")
+        for value in table.categories.tolist():
+            meanings.add_row(value=value, meaning="category %s" % value)
+        meanings_tables.append(meanings)
+        dtype = table.categories.dtype
+        if dtype.kind in "iu":
+            dtype = np.min_scalar_type(table.categories.max()) if table.categories.min() >= 0 else dtype
+        category = _SyntheticColumn(table, seed, table_index, _CATEGORY, dtype, block_size)
+        counts = dict.fromkeys(table.categories.tolist(), 0)
+        for block in range(category.num_blocks()):
+            block_values, block_counts = np.unique(category.generate_block(block), return_counts=True)
+            for value, count in zip(block_values.tolist(), block_counts.tolist()):
+                counts[value] += count
+        columns.append(
+            CategoricalVectorData(
+                name="category",
+                description="The category of each event.",
+                data=_SyntheticDataChunkIterator(category, n, block_size),
+                meanings=meanings,
+                value_counts=np.array(list(counts.values()), dtype=np.int64),
+            )
+        )
+    return EventsTable(
+        name=table.name,
+        description=table.description,
+        id=_SyntheticDataChunkIterator(None, n, block_size),
+        columns=columns,
+        meanings_tables=meanings_tables or None,
+        num_events=n,
+        min_timestamp=float(timestamp.generate_block(0)[0]),
+        max_timestamp=float(timestamp.generate_block(timestamp.num_blocks() - 1)[-1]),
+        duration_quantile_levels=duration_quantile_levels,
+        duration_quantiles=duration_quantiles,
+        duration_rows=duration_rows,
+        duration_values=duration_values,
+    )
+
+
+def write_synthetic_file(path, tables, seed=0, block_size=DEFAULT_BLOCK_SIZE):
+    """Write an NdxEventsNWBFile with an EventsTable for each SyntheticTable to path, streaming the columns to disk
+    block by block.
+
+    At most a few blocks of block_size rows of each column are held in memory at a time, except for the durations
+    of the tables with sparse durations. The same arguments always produce the same events.
+    """
+    nwbfile = NdxEventsNWBFile(
+        identifier="synthetic-%d" % seed,
+        session_description="Synthetic events.",
+        session_start_time=datetime(2000, 1, 1, tzinfo=timezone.utc),
+    )
+    for table_index, table in enumerate(tables):
+        nwbfile.add_events_table(make_synthetic_events_table(table, seed, table_index, block_size))
+    with NWBHDF5IO(path, mode="w") as io:
+        io.write(nwbfile)
@@ -0,0 +1,147 @@
+"""Functions to map the timestamps of events to the samples of a TimeSeries and to read peri-event snippets."""
+
+import numpy as np
+
+from .instrumentation import timer
+from .utils import DEFAULT_CHUNK_SIZE, get_data
+
+SAMPLE_INDEX_METHODS = ("nearest", "previous")
+
+
+def _sample_indices_from_rate(times, starting_time, rate, num_samples, method):
+    positions = (times - starting_time) * rate
+    if method == "nearest":
+        indices = np.round(positions)
+    else:
+        # tolerate floating point error for events at the exact time of a sample
+        indices = np.floor(positions + 1e-9)
+    indices = np.where(np.isnan(indices), -1, indices).astype(np.int64)
+    indices[(positions < 0) | (indices >= num_samples)] = -1
+    return indices
+
+
+def _sample_indices_from_timestamps(times, timestamps, method, chunk_size):
+    """Search the sorted timestamps of a TimeSeries for the given times, reading only the chunks that contain
+    events.
+
+    The first timestamp of every chunk is read with one strided read, to find the chunk of each event. As with a
+    sampling rate, times that map past the last sample are mapped to -1, with the interval between the last two
+    timestamps as the sampling interval.
+    """
+    n = len(timestamps)
+    indices = np.full(len(times), -1, dtype=np.int64)
+    if n == 0 or len(times) == 0:
+        return indices
+    with timer("read_chunk", rows=(n - 1) // chunk_size + 1):
+        chunk_starts = np.asarray(timestamps[0:n:chunk_size])
+    with timer("read_chunk", rows=min(n, 2)):
+        last_timestamps = np.asarray(timestamps[max(n - 2, 0) : n], dtype=np.float64)
+    order = np.argsort(times, kind="stable")
+    sorted_times = times[order]
+    # the chunk of the last timestamp at or before each event
+    event_chunks = np.searchsorted(chunk_starts, sorted_times, side="right") - 1
+    interval = last_timestamps[-1] - last_timestamps[0]
+    if interval > 0:
+        past_end = _sample_indices_from_rate(sorted_times, last_timestamps[-1], 1.0 / interval, 1, method) < 0
+        past_end &= sorted_times > last_timestamps[-1]
+    else:
+        past_end = sorted_times > last_timestamps[-1]
+    valid = (event_chunks >= 0) & ~np.isnan(sorted_times) & ~past_end
+    for chunk in np.unique(event_chunks[valid]).tolist():
+        start = chunk * chunk_size
+        # read one more sample so that the nearest sample can be in the next chunk
+        stop = min(start + chunk_size + 1, n)
+        with timer("read_chunk", rows=stop - start):
+            chunk_timestamps = np.asarray(timestamps[start:stop])
+        selected = np.flatnonzero(valid & (event_chunks == chunk))
+        previous = np.searchsorted(chunk_timestamps, sorted_times[selected], side="right") - 1
+        if method == "nearest":
+            following = np.minimum(previous + 1, len(chunk_timestamps) - 1)
+            closer = (chunk_timestamps[following] - sorted_times[selected]) < (
+                sorted_times[selected] - chunk_timestamps[previous]
+            )
+            previous = np.where(closer, following, previous)
+        indices[order[selected]] = previous + start
+    return indices
+
+
+def get_sample_indices(times, timeseries, method="nearest", chunk_size=DEFAULT_CHUNK_SIZE):
+    """Map times, e.g., the 'timestamp' column of an EventsTable, to the indices of the samples of a TimeSeries.
+
+    With method "nearest", each time is mapped to the closest sample; with method "previous", to the last sample at
+    or before it. If the TimeSeries has a sampling rate, the indices are computed arithmetically from its rate and
+    starting time. Otherwise, its timestamps, which must be sorted, are searched in chunks of chunk_size samples,
+    reading only the chunks that contain events. Times before the first sample, times that map past the last sample,
+    and NaN are mapped to -1. Without a sampling rate, the interval between the last two timestamps is used as the
+    sampling interval after the last sample.
+    """
+    if method not in SAMPLE_INDEX_METHODS:
+        raise ValueError("method must be one of %s, not '%s'." % (SAMPLE_INDEX_METHODS, method))
+    times = np.asarray(get_data(times)[:], dtype=np.float64)
+    if timeseries.rate is not None:
+        num_samples = len(timeseries.data)
+        return _sample_indices_from_rate(times, timeseries.starting_time or 0.0, timeseries.rate, num_samples, method)
+    return _sample_indices_from_timestamps(times, get_data(timeseries.timestamps), method, chunk_size)
+
+
+def _plan_reads(first, length, max_gap, chunk_size):
+    """Group sorted snippet windows into ranges of samples that are each read at once.
+
+    Windows that overlap or are separated by at most max_gap samples are read together, as long as the range spans
+    at most chunk_size samples (or one window, if longer). Returns a list of (first window, stop window) pairs.
+    """
+    last = first + length
+    breaks = np.flatnonzero(first[1:] - last[:-1] > max_gap) + 1
+    reads = list()
+    i = 0
+    while i < len(first):
+        limit = max(first[i] + chunk_size, last[i])
+        stop = max(int(np.searchsorted(last, limit, side="right")), i + 1)
+        next_break = np.searchsorted(breaks, i, side="right")
+        if next_break < len(breaks):
+            stop = min(stop, int(breaks[next_break]))
+        reads.append((i, stop))
+        i = stop
+    return reads
+
+
+def get_snippets(
+    timeseries, sample_indices, start_offset, stop_offset, fill_value=np.nan, max_gap=0, chunk_size=DEFAULT_CHUNK_SIZE
+):
+    """Read the samples of a TimeSeries around the given sample indices, e.g., from get_sample_indices.
+
+    Returns an array of shape (number of indices, stop_offset - start_offset, ...) whose i-th snippet holds the
+    samples sample_indices[i] + start_offset up to but excluding sample_indices[i] + stop_offset. Samples outside
+    the TimeSeries and the snippets of indices -1 are set to fill_value.
+
+    Instead of one read per snippet, the windows are sorted and coalesced: windows that overlap or are separated by
+    at most max_gap samples are read with a single read of at most chunk_size samples.
+    """
+    if stop_offset <= start_offset:
+        raise ValueError("stop_offset must be greater than start_offset.")
+    data = get_data(timeseries)
+    num_samples = len(data)
+    sample_shape = np.asarray(data[0:0]).shape[1:]
+    length = stop_offset - start_offset
+    sample_indices = np.asarray(sample_indices, dtype=np.int64)
+    dtype = np.result_type(np.asarray(data[0:0]).dtype, np.min_scalar_type(fill_value))
+    snippets = np.full((len(sample_indices), length) + sample_shape, fill_value, dtype=dtype)
+    valid = np.flatnonzero(sample_indices >= 0)
+    order = valid[np.argsort(sample_indices[valid], kind="stable")]
+    first = sample_indices[order] + start_offset
+    for i, stop in _plan_reads(first, length, max_gap, chunk_size):
+        read_start = max(int(first[i]), 0)
+        read_stop = min(int(first[stop - 1]) + length, num_samples)
+        if read_stop <= read_start:
+            continue
+        with timer("read_chunk", rows=read_stop - read_start):
+            values = np.asarray(data[read_start:read_stop])
+        offsets = first[i:stop] - read_start
+        inside = (offsets >= 0) & (offsets + length <= len(values))
+        snippets[order[i:stop][inside]] = values[offsets[inside][:, np.newaxis] + np.arange(length)]
+        # snippets that extend past the start or the end of the TimeSeries
+        for snippet, offset in zip(order[i:stop][~inside].tolist(), offsets[~inside].tolist()):
+            start, end = max(offset, 0), min(offset + length, len(values))
+            if end > start:
+                snippets[snippet, start - offset : end - offset] = values[start:end]
+    return snippets
@@ -0,0 +1,27 @@
+"""Helper functions shared by the ndx-events API."""
+
+import numpy as np
+
+from .instrumentation import timer
+
+# Number of rows read at a time when streaming over a column
+DEFAULT_CHUNK_SIZE = 2**20
+
+
+def get_data(column):
+    """Return the underlying data of a VectorData column, or the data itself if it is not a column."""
+    return getattr(column, "data", column)
+
+
+def iter_chunks(data, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield consecutive slices of a 1D list, array, or HDF5 dataset as NumPy arrays.
+
+    Only ``chunk_size`` rows are read into memory at a time, so this can be used to stream over very large
+    on-disk columns.
+    """
+    n = len(data)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        with timer("read_chunk", rows=stop - start):
+            chunk = np.asarray(data[start:stop])
+        yield chunk
@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime
+import numpy as np
+from pynwb import NWBHDF5IO
+from pynwb.testing import TestCase, remove_test_file
+
+from ndx_events import (
+    EventsTable,
+    get_default_pool,
+    NdxEventsNWBFile,
+    enable_instrumentation,
+    disable_instrumentation,
+    get_instrumentation_stats,
+    reset_instrumentation_stats,
+)
+from ndx_events import aio
+from ndx_events.file_pool import DEFAULT_MAX_OPEN_FILES
+
+
+class TestReadEvents(TestCase):
+    def setUp(self):
+        self.paths = ["test_aio_%d.nwb" % i for i in range(3)]
+        for i, path in enumerate(self.paths):
+            events_table = EventsTable(name="events", description="Events")
+            for j in range(10):
+                events_table.add_row(timestamp=float(i * 100 + j))
+            nwbfile = NdxEventsNWBFile(
+                identifier="test", session_description="test", session_start_time=datetime.now().astimezone()
+            )
+            nwbfile.add_events_table(events_table)
+            with NWBHDF5IO(path, mode="w") as io:
+                io.write(nwbfile)
+        reset_instrumentation_stats()
+        enable_instrumentation()
+
+    def tearDown(self):
+        disable_instrumentation()
+        reset_instrumentation_stats()
+        aio.configure(max_open_files=DEFAULT_MAX_OPEN_FILES)
+        get_default_pool().clear()
+        for path in self.paths:
+            remove_test_file(path)
+
+    def test_read_events_many_files(self):
+        async def read_all():
+            return await asyncio.gather(*(aio.read_events(path, "events", t_start=5.0) for path in self.paths))
+
+        results = asyncio.run(read_all())
+        np.testing.assert_array_equal(results[0]["timestamp"], [5.0, 6.0, 7.0, 8.0, 9.0])
+        np.testing.assert_array_equal(results[2]["timestamp"], np.arange(200.0, 210.0))
+
+    def test_coalesce_requests(self):
+        async def read_same():
+            return await asyncio.gather(*(aio.read_events(self.paths[0], "events", t_stop=3.0) for _ in range(5)))
+
+        results = asyncio.run(read_same())
+        assert all(result is results[0] for result in results)
+        assert get_instrumentation_stats()["EventsTable.read_events"]["count"] == 1
+
+    def test_file_cache(self):
+        aio.configure(max_open_files=2)
+
+        async def read_twice():
+            for _ in range(2):
+                for path in self.paths:
+                    await aio.read_events(path, "events")
+
+        asyncio.run(read_twice())
+        # every read opened a file since the least recently used file was closed
+        assert get_instrumentation_stats()["NWBFilePool.open_file"]["count"] == 6
+        assert len(get_default_pool()) == 2
+
+        asyncio.run(aio.read_events(self.paths[2], "events", columns=["timestamp"]))
+        assert get_instrumentation_stats()["NWBFilePool.open_file"]["count"] == 6
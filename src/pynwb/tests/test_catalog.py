@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime
+
+import numpy as np
+from pynwb import NWBHDF5IO
+from pynwb.testing import TestCase
+
+from ndx_events import EventsTableBuilder, MeaningsTable, NdxEventsNWBFile
+from ndx_events.catalog import EventsCatalog, main
+
+
+def _write_file(path, identifier, timestamps, pulse_values):
+    meanings_table = MeaningsTable(name="pulse_value_meanings", description="Meanings of the pulse values.")
+    meanings_table.add_row(value=1, meaning="Stimulus onset")
+    meanings_table.add_row(value=66, meaning="Reward")
+    meanings_table.add_row(value=99, meaning="Unused")
+    builder = EventsTableBuilder(name="ttl_events", description="TTL events")
+    builder.add_column(name="pulse_value", description="Pulse value.", dtype=np.uint8, meanings=meanings_table)
+    builder.add_rows(timestamp=timestamps, pulse_value=pulse_values)
+    nwbfile = NdxEventsNWBFile(
+        identifier=identifier, session_description="test", session_start_time=datetime.now().astimezone()
+    )
+    nwbfile.add_events_table(builder.to_events_table())
+    with NWBHDF5IO(path, mode="w") as io:
+        io.write(nwbfile)
+
+
+class TestEventsCatalog(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.paths = [os.path.join(self.tmpdir, "session%d.nwb" % i) for i in range(2)]
+        _write_file(self.paths[0], "session0", [10.0, 20.0, 4000.0, 5000.0], [1, 66, 1, 1])
+        _write_file(self.paths[1], "session1", [10.0, 3700.0, 3800.0], [1, 66, 66])
+        self.catalog = EventsCatalog(os.path.join(self.tmpdir, "catalog.sqlite"))
+
+    def tearDown(self):
+        self.catalog.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_update(self):
+        assert sorted(self.catalog.update(self.paths, max_workers=2)) == self.paths
+        files = self.catalog.files()
+        assert files["identifier"].tolist() == ["session0", "session1"]
+        tables = self.catalog.find()
+        assert tables["num_events"].tolist() == [4, 3]
+        assert tables["min_timestamp"].tolist() == [10.0, 10.0]
+        assert tables["max_timestamp"].tolist() == [5000.0, 3800.0]
+
+    def test_incremental_update(self):
+        self.catalog.update(self.paths, max_workers=1)
+        assert self.catalog.update(self.paths, max_workers=1) == []
+        stat = os.stat(self.paths[1])
+        os.utime(self.paths[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert self.catalog.update(self.paths, max_workers=1) == [self.paths[1]]
+        assert len(self.catalog) == 2
+        assert len(self.catalog.find()) == 2
+
+    def test_find_category(self):
+        self.catalog.update(self.paths, max_workers=1)
+        matches = self.catalog.find(column="pulse_value", value=66)
+        assert matches["identifier"].tolist() == ["session0", "session1"]
+        assert matches["count"].tolist() == [1, 2]
+        assert matches["meaning"].tolist() == ["Reward", "Reward"]
+        matches = self.catalog.find(column="pulse_value", value=66, t_start=3600.0)
+        assert matches["identifier"].tolist() == ["session1"]
+        assert matches["min_timestamp"].tolist() == [3700.0]
+        matches = self.catalog.find(meaning="Stimulus onset", t_stop=10.0)
+        assert len(matches) == 0
+        assert len(self.catalog.find(value=99)) == 0
+        counts = self.catalog.connection.execute("SELECT count FROM categories WHERE value = 99").fetchall()
+        assert counts == [(0,), (0,)]
+
+    def test_find_time_window(self):
+        self.catalog.update(self.paths, max_workers=1)
+        assert self.catalog.find(t_start=4500.0)["identifier"].tolist() == ["session0"]
+        assert self.catalog.find(table="ttl_events", t_stop=10.5)["identifier"].tolist() == ["session0", "session1"]
+        assert len(self.catalog.find(table="other")) == 0
+
+    def test_prune(self):
+        self.catalog.update(self.paths, max_workers=1)
+        os.remove(self.paths[0])
+        assert self.catalog.prune() == [self.paths[0]]
+        assert self.catalog.files()["identifier"].tolist() == ["session1"]
+        assert self.catalog.connection.execute("SELECT COUNT(*) FROM categories").fetchone()[0] == 3
+
+    def test_main(self):
+        catalog_path = os.path.join(self.tmpdir, "cli.sqlite")
+        main([catalog_path] + self.paths + ["--jobs", "1"])
+        with EventsCatalog(catalog_path) as catalog:
+            assert len(catalog) == 2
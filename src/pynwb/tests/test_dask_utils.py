@@ -0,0 +1,63 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from hdmf.backends.hdf5 import H5DataIO
+from pynwb import NWBHDF5IO
+from pynwb.testing import TestCase, remove_test_file
+
+from ndx_events import EventsTable, TimestampVectorData, MeaningsTable, NdxEventsNWBFile
+
+dd = pytest.importorskip("dask.dataframe")
+
+
+class TestToDask(TestCase):
+    def setUp(self):
+        self.path = "test_to_dask.nwb"
+        meanings_table = MeaningsTable(name="cue_meanings", description="Meanings of the cues.")
+        meanings_table.add_row(value="left", meaning="Left cue")
+        meanings_table.add_row(value="right", meaning="Right cue")
+        timestamp = TimestampVectorData(
+            name="timestamp",
+            description="The timestamps.",
+            data=H5DataIO(np.arange(100, dtype=np.float64) / 10, chunks=(10,)),
+        )
+        events_table = EventsTable(
+            name="cue_events", description="Cue events", columns=[timestamp], id=list(range(100))
+        )
+        events_table.add_categorical_column(
+            name="cue",
+            description="The cue.",
+            meanings=meanings_table,
+            data=["left", "right", "up", "left"] * 25,
+        )
+        nwbfile = NdxEventsNWBFile(
+            identifier="test",
+            session_description="test",
+            session_start_time=datetime.now().astimezone(),
+            events=[events_table],
+        )
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(nwbfile)
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_to_dask(self):
+        with NWBHDF5IO(self.path, mode="r") as io:
+            events_table = io.read().events["cue_events"]
+            df = events_table.to_dask(partition_size=25)
+            # partitions are aligned with the HDF5 chunks of 10 rows
+            assert df.npartitions == 5
+            assert df.divisions == (0, 20, 40, 60, 80, 99)
+            assert list(df["cue"].cat.categories) == ["left", "right"]
+            result = df.compute()
+            np.testing.assert_array_equal(result["timestamp"], np.arange(100) / 10)
+            # "up" is not in the MeaningsTable
+            assert result["cue"][:4].isna().tolist() == [False, False, True, False]
+            assert df[df["cue"] == "right"]["timestamp"].count().compute() == 25
+
+    def test_to_dask_columns(self):
+        with NWBHDF5IO(self.path, mode="r") as io:
+            df = io.read().events["cue_events"].to_dask(columns=["timestamp"])
+            assert list(df.columns) == ["timestamp"]
+            assert df["timestamp"].max().compute() == 9.9
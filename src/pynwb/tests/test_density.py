@@ -0,0 +1,118 @@
+from datetime import datetime
+import numpy as np
+from hdmf.backends.hdf5 import H5DataIO
+from pynwb import NWBHDF5IO
+from pynwb.testing import TestCase, remove_test_file
+
+from ndx_events import EventsTable, EventCounts, CategoricalVectorData, MeaningsTable, NdxEventsNWBFile
+
+
+class TestEventCounts(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(seed=0)
+        self.timestamps = np.sort(rng.uniform(10.0, 110.0, 1000))
+        self.values = rng.choice([1, 2, 3], 1000)  # 3 is not listed in the MeaningsTable
+
+        meanings_table = MeaningsTable(name="pulse_value_meanings", description="Meanings of the pulse values.")
+        meanings_table.add_row(value=1, meaning="Stimulus onset")
+        meanings_table.add_row(value=2, meaning="Stimulus offset")
+        column = CategoricalVectorData(name="pulse_value", description="Pulse value.", meanings=meanings_table)
+        self.events_table = EventsTable(
+            name="ttl_events", description="TTL events", columns=[column], meanings_tables=[meanings_table]
+        )
+        for timestamp, value in zip(self.timestamps, self.values):
+            self.events_table.add_row(timestamp=timestamp, pulse_value=int(value))
+
+    def test_build_event_counts(self):
+        event_counts = self.events_table.build_event_counts(bin_width=0.5, category_column="pulse_value")
+        assert isinstance(event_counts, EventCounts)
+        assert self.events_table.event_counts is event_counts
+        assert event_counts.start_time == 10.0
+        np.testing.assert_array_equal(event_counts.level_offsets, [0, 200, 300, 350, 375, 388, 395, 399, 401, 402])
+        assert event_counts.data.shape == (402, 3)
+
+        # every level counts all events, and events with values not in the MeaningsTable are counted only in the total
+        expected = [1000, np.sum(self.values == 1), np.sum(self.values == 2)]
+        for start, stop in zip(event_counts.level_offsets[:-1], event_counts.level_offsets[1:]):
+            np.testing.assert_array_equal(event_counts.data[start:stop].sum(axis=0), expected)
+
+    def test_get_event_counts(self):
+        self.events_table.build_event_counts(bin_width=0.5, category_column="pulse_value")
+        bin_edges, counts = self.events_table.get_event_counts(t_start=20.0, t_stop=30.0, num_bins=20)
+        np.testing.assert_array_equal(bin_edges, np.arange(20.0, 30.5, 0.5))
+        expected, _ = np.histogram(self.timestamps, bins=bin_edges)
+        np.testing.assert_array_equal(counts, expected)
+
+        bin_edges, counts = self.events_table.get_event_counts(t_start=20, t_stop=30, num_bins=5, category=2)
+        np.testing.assert_array_equal(bin_edges, np.arange(20.0, 32.0, 2.0))
+        expected, _ = np.histogram(self.timestamps[self.values == 2], bins=bin_edges)
+        np.testing.assert_array_equal(counts, expected)
+
+    def test_get_event_counts_no_pyramid(self):
+        with self.assertRaisesWith(
+            ValueError, "EventsTable 'ttl_events' has no event counts. Call build_event_counts first."
+        ):
+            self.events_table.get_event_counts(t_start=20.0, t_stop=30.0, num_bins=20)
+
+    def test_roundtrip(self):
+        self.events_table.build_event_counts(bin_width=0.5, category_column="pulse_value")
+        nwbfile = NdxEventsNWBFile(
+            identifier="test", session_description="test", session_start_time=datetime.now().astimezone()
+        )
+        nwbfile.add_events_table(self.events_table)
+        path = "test_density.nwb"
+        try:
+            with NWBHDF5IO(path, mode="w") as io:
+                io.write(nwbfile)
+
+            with NWBHDF5IO(path, mode="r") as io:
+                read_events_table = io.read().events["ttl_events"]
+                assert isinstance(read_events_table.event_counts, EventCounts)
+                assert read_events_table.event_counts.category_column == "pulse_value"
+                assert read_events_table.colnames == ("pulse_value", "timestamp")
+                _, counts = read_events_table.get_event_counts(t_start=0.0, t_stop=200.0, level=8)
+                np.testing.assert_array_equal(counts, [1000])
+        finally:
+            remove_test_file(path)
+
+    def test_add_row_drops_event_counts(self):
+        self.events_table.build_event_counts(bin_width=0.5)
+        self.events_table.add_row(timestamp=50.0, pulse_value=1)
+        assert self.events_table.event_counts is None
+        self.events_table.build_event_counts(bin_width=0.5)
+        _, counts = self.events_table.get_event_counts(t_start=0.0, t_stop=200.0, level=8)
+        np.testing.assert_array_equal(counts, [1001])
+
+    def test_append(self):
+        for column in (self.events_table.id, self.events_table.timestamp, self.events_table.pulse_value):
+            column.set_data_io(H5DataIO, dict(maxshape=(None,)))
+        self.events_table.build_event_counts(bin_width=0.5)
+        nwbfile = NdxEventsNWBFile(
+            identifier="test", session_description="test", session_start_time=datetime.now().astimezone()
+        )
+        nwbfile.add_events_table(self.events_table)
+        path = "test_density.nwb"
+        try:
+            with NWBHDF5IO(path, mode="w") as io:
+                io.write(nwbfile)
+
+            with NWBHDF5IO(path, mode="a") as io:
+                read_nwbfile = io.read()
+                read_events_table = read_nwbfile.events["ttl_events"]
+                read_events_table.add_row(timestamp=50.0, pulse_value=1)
+                read_events_table.add_row(timestamp=60.0, pulse_value=2)
+                assert read_events_table.event_counts is None
+                io.write(read_nwbfile)
+
+            with NWBHDF5IO(path, mode="a") as io:
+                read_nwbfile = io.read()
+                # the pyramid in the file does not count the appended rows
+                assert read_nwbfile.events["ttl_events"].event_counts is None
+                read_nwbfile.events["ttl_events"].build_event_counts(bin_width=0.5)
+                io.write(read_nwbfile)
+
+            with NWBHDF5IO(path, mode="r") as io:
+                _, counts = io.read().events["ttl_events"].get_event_counts(t_start=0.0, t_stop=200.0, level=8)
+                np.testing.assert_array_equal(counts, [1002])
+        finally:
+            remove_test_file(path)
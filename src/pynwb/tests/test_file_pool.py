@@ -0,0 +1,145 @@
+import os
+import threading
+from datetime import datetime
+from unittest import mock
+
+from pynwb import NWBHDF5IO
+from pynwb.testing import TestCase, remove_test_file
+
+from ndx_events import EventsTable, NdxEventsNWBFile, NWBFilePool
+from ndx_events import file_pool
+
+
+def _write_file(path, num_events):
+    events_table = EventsTable(name="events", description="Events")
+    for i in range(num_events):
+        events_table.add_row(timestamp=float(i))
+    nwbfile = NdxEventsNWBFile(
+        identifier="test", session_description="test", session_start_time=datetime.now().astimezone()
+    )
+    nwbfile.add_events_table(events_table)
+    with NWBHDF5IO(path, mode="w") as io:
+        io.write(nwbfile)
+
+
+class _BlockingNWBHDF5IO(NWBHDF5IO):
+    """An NWBHDF5IO that counts the files it opens and calls on_read before reading a file."""
+
+    opened = list()
+    on_read = None
+
+    def __init__(self, path, **kwargs):
+        type(self).opened.append(path)
+        super().__init__(path, **kwargs)
+
+    def read(self, **kwargs):
+        type(self).on_read()
+        return super().read(**kwargs)
+
+
+class TestNWBFilePool(TestCase):
+    def setUp(self):
+        self.paths = ["test_file_pool_%d.nwb" % i for i in range(3)]
+        for path in self.paths:
+            _write_file(path, 3)
+        self.pool = NWBFilePool(max_open=2)
+
+    def tearDown(self):
+        self.pool.clear()
+        for path in self.paths:
+            remove_test_file(path)
+
+    def test_reuse(self):
+        with self.pool.open(self.paths[0]) as nwbfile:
+            events_table = nwbfile.events["events"]
+        with self.pool.open(os.path.abspath(self.paths[0])) as nwbfile:
+            assert nwbfile.events["events"] is events_table
+            assert len(nwbfile.events["events"]) == 3
+
+    def test_lru_eviction(self):
+        nwbfiles = list()
+        for path in self.paths:
+            with self.pool.open(path) as nwbfile:
+                nwbfiles.append(nwbfile)
+        assert len(self.pool) == 2
+        # the least recently used file was closed
+        with self.pool.open(self.paths[0]) as nwbfile:
+            assert nwbfile is not nwbfiles[0]
+        with self.pool.open(self.paths[2]) as nwbfile:
+            assert nwbfile is nwbfiles[2]
+        assert len(self.pool) == 2
+
+    def test_files_in_use_are_not_closed(self):
+        with self.pool.open(self.paths[0]) as nwbfile0, self.pool.open(self.paths[1]), self.pool.open(self.paths[2]):
+            assert len(self.pool) == 3
+            assert len(nwbfile0.events["events"].timestamp[:]) == 3
+        assert len(self.pool) == 2
+
+    def test_modified_file(self):
+        with self.pool.open(self.paths[0]) as nwbfile:
+            old_nwbfile = nwbfile
+        stat = os.stat(self.paths[0])
+        os.utime(self.paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with self.pool.open(self.paths[0]) as nwbfile:
+            assert nwbfile is not old_nwbfile
+        # the file opened before the modification was closed
+        assert len(self.pool) == 1
+
+    def _open_in_threads(self, paths, on_read):
+        _BlockingNWBHDF5IO.opened = list()
+        _BlockingNWBHDF5IO.on_read = on_read
+        nwbfiles, errors = [None] * len(paths), list()
+
+        def open_file(i):
+            try:
+                with self.pool.open(paths[i]) as nwbfile:
+                    nwbfiles[i] = nwbfile
+            except Exception as error:
+                errors.append(error)
+
+        with mock.patch.object(file_pool, "NWBHDF5IO", _BlockingNWBHDF5IO):
+            threads = [threading.Thread(target=open_file, args=(i,)) for i in range(len(paths))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert not errors
+        return nwbfiles
+
+    def test_open_different_files_in_parallel(self):
+        # each read waits for the other file to start being read, which times out if the files are opened one at a
+        # time
+        barrier = threading.Barrier(2, timeout=10)
+        nwbfiles = self._open_in_threads(self.paths[:2], barrier.wait)
+        assert nwbfiles[0] is not nwbfiles[1]
+        assert len(_BlockingNWBHDF5IO.opened) == 2
+
+    def test_open_same_file_once(self):
+        started, release = threading.Event(), threading.Event()
+
+        def on_read():
+            started.set()
+            assert release.wait(10)
+
+        thread = threading.Thread(target=lambda: self._open_in_threads([self.paths[0]] * 3, on_read))
+        thread.start()
+        assert started.wait(10)
+        release.set()
+        thread.join()
+        assert _BlockingNWBHDF5IO.opened == [os.path.abspath(self.paths[0])]
+        with self.pool.open(self.paths[0]) as nwbfile:
+            assert len(nwbfile.events["events"]) == 3
+
+    def test_open_error(self):
+        def on_read():
+            raise OSError("Cannot read the file.")
+
+        _BlockingNWBHDF5IO.on_read = on_read
+        with mock.patch.object(file_pool, "NWBHDF5IO", _BlockingNWBHDF5IO):
+            with self.assertRaisesWith(OSError, "Cannot read the file."):
+                with self.pool.open(self.paths[0]):
+                    pass
+        assert len(self.pool) == 0
+        # the file is opened again by the next request
+        with self.pool.open(self.paths[0]) as nwbfile:
+            assert len(nwbfile.events["events"]) == 3
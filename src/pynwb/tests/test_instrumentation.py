@@ -0,0 +1,127 @@
+from datetime import datetime
+from hdmf.backends.hdf5 import HDF5IO
+from hdmf.utils import get_docval
+from pynwb import NWBHDF5IO
+from pynwb.testing import TestCase, remove_test_file
+
+from ndx_events import (
+    EventsTable,
+    NdxEventsNWBFile,
+    enable_instrumentation,
+    disable_instrumentation,
+    is_instrumentation_enabled,
+    get_instrumentation_stats,
+    reset_instrumentation_stats,
+)
+
+
+class TestInstrumentation(TestCase):
+    def setUp(self):
+        reset_instrumentation_stats()
+        self.records = list()
+
+    def tearDown(self):
+        disable_instrumentation()
+        reset_instrumentation_stats()
+
+    def test_disabled_by_default(self):
+        assert not is_instrumentation_enabled()
+        events_table = EventsTable(name="events", description="Events")
+        events_table.add_row(timestamp=0.1)
+        assert get_instrumentation_stats() == {}
+
+    def test_callback(self):
+        enable_instrumentation(callback=self.records.append)
+        assert is_instrumentation_enabled()
+        events_table = EventsTable(name="events", description="Events")
+        events_table.add_row(timestamp=0.1)
+        events_table.add_row(timestamp=0.2)
+        add_row_names = ["EventsTable.add_row.docval", "DynamicTable.add_row", "EventsTable.add_row"]
+        assert [record["name"] for record in self.records] == add_row_names * 2
+        assert all(record["duration"] >= 0 for record in self.records)
+        assert get_instrumentation_stats()["EventsTable.add_row"]["count"] == 2
+
+    def test_disable(self):
+        enable_instrumentation(callback=self.records.append)
+        disable_instrumentation()
+        EventsTable(name="events", description="Events").add_row(timestamp=0.1)
+        assert self.records == []
+
+    def test_docval_preserved(self):
+        assert [arg["name"] for arg in get_docval(EventsTable.add_row)][:3] == ["data", "id", "enforce_unique_id"]
+
+    def test_io_paths(self):
+        events_table = EventsTable(name="events", description="Events")
+        events_table.add_row(timestamp=0.1)
+        nwbfile = NdxEventsNWBFile(
+            identifier="test", session_description="test", session_start_time=datetime.now().astimezone()
+        )
+        nwbfile.add_events_table(events_table)
+        path = "test_instrumentation.nwb"
+        enable_instrumentation(callback=self.records.append, log=True)
+        try:
+            with NWBHDF5IO(path, mode="w") as io:
+                io.write(nwbfile)
+            with NWBHDF5IO(path, mode="r") as io:
+                io.read().get_all_events()
+        finally:
+            remove_test_file(path)
+
+        names = {record["name"] for record in self.records}
+        expected = {
+            "NdxEventsNWBFileMap.build",
+            "EventsTableMap.build",
+            "read_chunk",
+            "NdxEventsNWBFileMap.construct",
+            "EventsTableMap.construct",
+            "EventsTable.to_dataframe",
+            "NdxEventsNWBFile.merge_events_tables",
+            "NdxEventsNWBFile.get_all_events",
+        }
+        assert expected <= names
+        read_chunk = next(record for record in self.records if record["name"] == "read_chunk")
+        assert read_chunk["rows"] == 1
+
+    def test_write_phases(self):
+        """Test that each phase of adding rows, writing, and reading a table emits a record."""
+        path = "test_instrumentation.nwb"
+        enable_instrumentation(callback=self.records.append)
+        try:
+            events_table = EventsTable(name="events", description="Events")
+            events_table.add_row(timestamp=0.1)
+            nwbfile = NdxEventsNWBFile(
+                identifier="test", session_description="test", session_start_time=datetime.now().astimezone()
+            )
+            nwbfile.add_events_table(events_table)
+            with NWBHDF5IO(path, mode="w") as io:
+                io.write(nwbfile)
+            with NWBHDF5IO(path, mode="r") as io:
+                io.read().events["events"].to_dataframe()
+        finally:
+            remove_test_file(path)
+
+        names = [record["name"] for record in self.records]
+        phases = {
+            "docval validation": "EventsTable.add_row.docval",
+            "object mapping": "EventsTableMap.build",
+            "HDF5 writes": "HDF5IO.write_builder",
+            "to_dataframe": "EventsTable.to_dataframe",
+        }
+        for phase, name in phases.items():
+            assert name in names, phase
+        # the builders are written after the object mapping
+        assert names.index("HDF5IO.write_builder") > names.index("EventsTableMap.build")
+        assert names.index("HDF5IO.write") > names.index("HDF5IO.write_builder")
+
+    def test_external_methods_restored(self):
+        """Test that HDF5IO is only modified while instrumentation is enabled."""
+        write, write_builder = HDF5IO.__dict__["write"], HDF5IO.__dict__["write_builder"]
+        assert not hasattr(write, "__wrapped__")
+        enable_instrumentation()
+        assert HDF5IO.__dict__["write"].__wrapped__ is write
+        assert get_docval(HDF5IO.write) == get_docval(write)
+        enable_instrumentation()
+        assert HDF5IO.__dict__["write"].__wrapped__ is write
+        disable_instrumentation()
+        assert HDF5IO.__dict__["write"] is write
+        assert HDF5IO.__dict__["write_builder"] is write_builder
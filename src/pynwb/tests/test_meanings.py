@@ -0,0 +1,113 @@
+from datetime import datetime
+from unittest import mock
+import h5py
+from pynwb import NWBHDF5IO
+from pynwb.testing import TestCase, remove_test_file
+
+from ndx_events import (
+    EventsTable,
+    CategoricalVectorData,
+    MeaningsTable,
+    NdxEventsNWBFile,
+    InternedMeanings,
+    intern_meanings,
+    clear_meanings_cache,
+)
+from ndx_events import meanings
+
+
+def _create_meanings_table():
+    meanings_table = MeaningsTable(name="pulse_value_meanings", description="Meanings of the pulse values.")
+    meanings_table.add_row(value=1, meaning="Stimulus onset")
+    meanings_table.add_row(value=2, meaning="Stimulus offset")
+    return meanings_table
+
+
+def _create_nwbfile():
+    """Create a file with two EventsTables whose three categorical columns share one MeaningsTable."""
+    meanings_table = _create_meanings_table()
+    ttl_events = EventsTable(name="ttl_events", description="TTL events")
+    ttl_events.add_categorical_column(name="pulse_value", description="Pulse value.", meanings=meanings_table)
+    ttl_events.add_row(timestamp=0.1, pulse_value=1)
+    other_events = EventsTable(name="other_events", description="Other events")
+    other_events.add_categorical_column(name="pulse_value", description="Pulse value.", meanings=meanings_table)
+    other_events.add_categorical_column(name="next_pulse_value", description="Next value.", meanings=meanings_table)
+    other_events.add_row(timestamp=0.2, pulse_value=2, next_pulse_value=1)
+
+    nwbfile = NdxEventsNWBFile(
+        identifier="test", session_description="test", session_start_time=datetime.now().astimezone()
+    )
+    nwbfile.add_events_table(ttl_events)
+    nwbfile.add_events_table(other_events)
+    return nwbfile
+
+
+class TestSharedMeaningsTable(TestCase):
+    def setUp(self):
+        self.path = "test_meanings.nwb"
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_add_categorical_column(self):
+        nwbfile = _create_nwbfile()
+        ttl_events, other_events = nwbfile.events["ttl_events"], nwbfile.events["other_events"]
+        assert isinstance(other_events.pulse_value, CategoricalVectorData)
+        assert ttl_events.meanings_tables["pulse_value_meanings"] is other_events.pulse_value.meanings
+        assert other_events.meanings_tables == {}
+
+    def test_roundtrip(self):
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(_create_nwbfile())
+
+        with h5py.File(self.path, "r") as f:
+            assert "pulse_value_meanings" not in f["events/other_events"]
+            assert "content_hash" in f["events/ttl_events/pulse_value_meanings"].attrs
+
+        with NWBHDF5IO(self.path, mode="r") as io:
+            read_nwbfile = io.read()
+            meanings_table = read_nwbfile.events["ttl_events"].pulse_value.meanings
+            assert read_nwbfile.events["other_events"].pulse_value.meanings is meanings_table
+            assert read_nwbfile.events["other_events"].next_pulse_value.meanings is meanings_table
+            assert meanings_table.content_hash == intern_meanings(_create_meanings_table()).content_hash
+
+
+class TestInternMeanings(TestCase):
+    def setUp(self):
+        clear_meanings_cache()
+        self.paths = ["test_meanings_1.nwb", "test_meanings_2.nwb"]
+
+    def tearDown(self):
+        for path in self.paths:
+            remove_test_file(path)
+        clear_meanings_cache()
+
+    def test_intern_in_memory(self):
+        interned = intern_meanings(_create_meanings_table())
+        assert isinstance(interned, InternedMeanings)
+        assert interned.values == (1, 2)
+        assert interned[2] == "Stimulus offset"
+        assert list(interned.decode([2, 1, 3], default="unknown")) == ["Stimulus offset", "Stimulus onset", "unknown"]
+        assert intern_meanings(_create_meanings_table()) is interned
+
+    def test_intern_across_files(self):
+        for path in self.paths:
+            with NWBHDF5IO(path, mode="w") as io:
+                io.write(_create_nwbfile())
+
+        with NWBHDF5IO(self.paths[0], mode="r") as io1, NWBHDF5IO(self.paths[1], mode="r") as io2:
+            meanings_table_1 = io1.read().events["ttl_events"].pulse_value.meanings
+            meanings_table_2 = io2.read().events["ttl_events"].pulse_value.meanings
+            assert meanings_table_1 is not meanings_table_2
+            assert intern_meanings(meanings_table_1) is intern_meanings(meanings_table_2)
+
+    def test_cache_is_bounded(self):
+        with mock.patch.object(meanings, "MAX_CACHED_MEANINGS", 2):
+            first = intern_meanings(_create_meanings_table())
+            for value in range(3):
+                meanings_table = MeaningsTable(name="other_meanings", description="Other meanings.")
+                meanings_table.add_row(value=value, meaning="Other")
+                intern_meanings(meanings_table)
+            assert len(meanings._interned_by_hash) == 2
+            # the least recently used meanings were evicted, so they are interned again
+            assert intern_meanings(_create_meanings_table()) is not first
@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import warnings
+import h5py
+import numpy as np
+from pynwb import NWBHDF5IO
+from pynwb.testing import TestCase
+
+from ndx_events import CategoricalVectorData
+from ndx_events.migrate import find_legacy_events, migrate_file, migrate_files, main
+
+
+def _create_legacy_file(path):
+    """Create a minimal NWB HDF5 file with ndx-events 0.2 TTLs and Events objects and a trials table."""
+    str_dtype = h5py.string_dtype()
+    with h5py.File(path, "w") as f:
+        f.create_dataset("identifier", data="legacy", dtype=str_dtype)
+        f.create_dataset("session_description", data="legacy session", dtype=str_dtype)
+        f.create_dataset("session_start_time", data="2020-01-01T12:00:00-08:00", dtype=str_dtype)
+
+        ttls = f.create_group("acquisition/ttls")
+        ttls.attrs.update(namespace="ndx-events", neurodata_type="TTLs", description="TTL pulses")
+        ttls.attrs["labels"] = ["", "Stimulus onset", "Stimulus offset"]
+        ttls.create_dataset("timestamps", data=[0.1, 0.2, 0.5, 0.7]).attrs["resolution"] = 1e-5
+        ttls.create_dataset("data", data=np.array([1, 2, 1, 2], dtype=np.uint8))
+
+        events = f.create_group("processing/behavior/licks")
+        events.attrs.update(namespace="ndx-events", neurodata_type="Events", description="Licks")
+        events.create_dataset("timestamps", data=[0.3, 0.4])
+
+        trials = f.create_group("intervals/trials")
+        trials.attrs.update(namespace="core", neurodata_type="TimeIntervals", description="Trials")
+        trials.attrs["colnames"] = ["start_time", "stop_time", "cue", "reward", "tags"]
+        trials.create_dataset("id", data=[0, 1, 2])
+        trials.create_dataset("start_time", data=[0.0, 1.0, 2.0])
+        trials.create_dataset("stop_time", data=[0.5, 1.75, 2.25])
+        trials.create_dataset("cue", data=["left", "right", "left"], dtype=str_dtype)
+        trials.create_dataset("reward", data=[1.0, 0.0, 1.0])
+        trials.create_dataset("tags", data=["a", "b"], dtype=str_dtype)
+        trials.create_dataset("tags_index", data=[1, 1, 2])
+
+
+class TestMigrate(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.source_paths = [os.path.join(self.dir, "legacy_%d.nwb" % i) for i in range(2)]
+        for path in self.source_paths:
+            _create_legacy_file(path)
+        self.output_dir = os.path.join(self.dir, "migrated")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_find_legacy_events(self):
+        with h5py.File(self.source_paths[0], "r") as f:
+            assert find_legacy_events(f) == [
+                ("/acquisition/ttls", "TTLs"),
+                ("/intervals/trials", "TimeIntervals"),
+                ("/processing/behavior/licks", "Events"),
+            ]
+
+    def test_migrate_file(self):
+        target_path = os.path.join(self.dir, "migrated.nwb")
+        msg = "Skipped the ragged or reference columns ['tags'] of /intervals/trials."
+        with self.assertWarnsWith(UserWarning, msg):
+            names = migrate_file(self.source_paths[0], target_path, categorical_columns=["cue"], chunk_size=2)
+        assert names == ["ttls", "trials", "licks"]
+
+        with NWBHDF5IO(target_path, mode="r") as io:
+            nwbfile = io.read()
+            assert nwbfile.identifier == "legacy"
+            assert nwbfile.session_start_time.utcoffset().total_seconds() == -8 * 3600
+
+            ttls = nwbfile.events["ttls"]
+            np.testing.assert_array_equal(ttls.timestamp[:], [0.1, 0.2, 0.5, 0.7])
+            assert ttls.timestamp.resolution == 1e-5
+            assert isinstance(ttls.pulse_value, CategoricalVectorData)
+            np.testing.assert_array_equal(ttls.pulse_value.meanings["value"][:], [1, 2])
+            assert list(ttls.pulse_value.meanings["meaning"][:]) == ["Stimulus onset", "Stimulus offset"]
+            np.testing.assert_array_equal(ttls.pulse_value.value_counts[:], [2, 2])
+
+            trials = nwbfile.events["trials"]
+            assert trials.colnames == ("timestamp", "duration", "cue", "reward")
+            np.testing.assert_array_equal(trials.duration[:], [0.5, 0.75, 0.25])
+            assert list(trials.cue.meanings["value"][:]) == ["left", "right"]
+            np.testing.assert_array_equal(trials.reward[:], [1.0, 0.0, 1.0])
+            assert trials.summary()["value_counts"]["cue"] == {"left": 2, "right": 1}
+
+            np.testing.assert_array_equal(nwbfile.events["licks"].timestamp[:], [0.3, 0.4])
+
+    def test_migrate_files_parallel(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            results = migrate_files(self.source_paths, self.output_dir, max_workers=2)
+        assert results == {path: ["ttls", "trials", "licks"] for path in self.source_paths}
+        for path in self.source_paths:
+            with NWBHDF5IO(os.path.join(self.output_dir, os.path.basename(path)), mode="r") as io:
+                assert io.read().events["ttls"].num_events == 4
+
+    def test_main(self):
+        with self.assertWarns(UserWarning):
+            main([*self.source_paths, "--output-dir", self.output_dir, "--jobs", "1", "--categorical", "cue"])
+        with NWBHDF5IO(os.path.join(self.output_dir, "legacy_1.nwb"), mode="r") as io:
+            assert isinstance(io.read().events["trials"].cue, CategoricalVectorData)
@@ -0,0 +1,59 @@
+from datetime import datetime
+import numpy as np
+from pynwb import NWBHDF5IO, TimeSeries
+from pynwb.file import Subject
+from pynwb.testing import TestCase, remove_test_file
+
+from ndx_events import EventsTable, MeaningsTable, NdxEventsNWBFile, read_events_only
+
+
+class TestReadEventsOnly(TestCase):
+    def setUp(self):
+        self.path = "test_read_events_only.nwb"
+        nwbfile = NdxEventsNWBFile(
+            identifier="test",
+            session_description="test session",
+            session_start_time=datetime(2020, 1, 1, 12, 0, 0).astimezone(),
+            subject=Subject(subject_id="mouse"),
+        )
+        nwbfile.add_acquisition(TimeSeries(name="ts", data=np.arange(10.0), unit="a.u.", rate=1.0))
+        meanings_table = MeaningsTable(name="cue_meanings", description="Meanings of the cues.")
+        meanings_table.add_row(value=1, meaning="left")
+        events_table = EventsTable(name="cue_events", description="Cue events")
+        events_table.add_categorical_column(name="cue", description="The cue.", meanings=meanings_table)
+        events_table.add_row(timestamp=0.5, cue=1)
+        nwbfile.add_events_table(events_table)
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(nwbfile)
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_read_events_only(self):
+        with NWBHDF5IO(self.path, mode="r") as io:
+            nwbfile = read_events_only(io)
+            assert isinstance(nwbfile, NdxEventsNWBFile)
+            assert nwbfile.identifier == "test"
+            assert nwbfile.session_description == "test session"
+            assert len(nwbfile.acquisition) == 0
+            assert nwbfile.subject is None
+            events_table = nwbfile.events["cue_events"]
+            assert events_table.parent is nwbfile
+            assert list(events_table.cue.meanings["meaning"][:]) == ["left"]
+            np.testing.assert_array_equal(events_table.timestamp[:], [0.5])
+
+    def test_read_after_read_events_only(self):
+        with NWBHDF5IO(self.path, mode="r") as io:
+            events_only = read_events_only(io)
+            nwbfile = io.read()
+            assert nwbfile is not events_only
+            assert len(nwbfile.acquisition) == 1
+            assert nwbfile.subject.subject_id == "mouse"
+            assert nwbfile.events["cue_events"].parent is nwbfile
+            assert events_only.events["cue_events"].parent is events_only
+
+    def test_closed_file(self):
+        io = NWBHDF5IO(self.path, mode="r")
+        io.close()
+        with self.assertRaisesWith(ValueError, "Cannot read the events of a closed file."):
+            read_events_only(io)
@@ -0,0 +1,307 @@
+from datetime import datetime
+from unittest import mock
+import numpy as np
+from hdmf.backends.hdf5 import H5DataIO
+from pynwb import NWBHDF5IO
+from pynwb.testing import TestCase, remove_test_file
+
+from ndx_events import EventsTable, CategoricalVectorData, MeaningsTable, NdxEventsNWBFile
+from ndx_events import events_table_io
+
+
+class TestEventsTableWhere(TestCase):
+    def setUp(self):
+        meanings_table = MeaningsTable(name="cue_type_meanings", description="Meanings of the cue types.")
+        meanings_table.add_row(value="white circle", meaning="The cue was a white circle.")
+        meanings_table.add_row(value="green square", meaning="The cue was a green square.")
+        meanings_table.add_row(value="red triangle", meaning="The cue was a red triangle.")
+        column = CategoricalVectorData(
+            name="cue_type", description="The cue type.", meanings=meanings_table, filter_values=["n/a"]
+        )
+        self.events_table = EventsTable(
+            name="cue_events", description="Cue events", columns=[column], meanings_tables=[meanings_table]
+        )
+        self.events_table.add_column(name="trial", description="The trial number.")
+        # "blue star" is not listed in the MeaningsTable
+        cue_types = ["white circle", "n/a", "green square", "white circle", "blue star", "green square"]
+        for i, cue_type in enumerate(cue_types):
+            self.events_table.add_row(timestamp=float(i), cue_type=cue_type, trial=i)
+
+    def test_where_scan(self):
+        np.testing.assert_array_equal(
+            self.events_table.where(column="cue_type", isin=["white circle", "green square"]), [0, 2, 3, 5]
+        )
+        np.testing.assert_array_equal(self.events_table.where(column="cue_type", isin={"red triangle"}), [])
+
+    def test_where_filter_values(self):
+        np.testing.assert_array_equal(self.events_table.where(column="cue_type"), [0, 2, 3, 4, 5])
+        np.testing.assert_array_equal(self.events_table.where(column="cue_type", isin=["n/a"]), [])
+        np.testing.assert_array_equal(
+            self.events_table.where(column="cue_type", isin=["n/a"], exclude_filter_values=False), [1]
+        )
+
+    def test_where_row_index(self):
+        row_index = self.events_table.build_row_index(column="cue_type")
+        assert row_index.target.name == "cue_type_rows"
+        assert self.events_table.cue_type.meanings.colnames == ("value", "meaning", "cue_type_rows")
+        np.testing.assert_array_equal(row_index[0], [0, 3])
+        np.testing.assert_array_equal(
+            self.events_table.where(column="cue_type", isin=["white circle", "green square"]), [0, 2, 3, 5]
+        )
+        # values that are not in the MeaningsTable are not indexed, so the column is scanned
+        np.testing.assert_array_equal(self.events_table.where(column="cue_type", isin=["blue star"]), [4])
+
+    def test_where_row_index_stale(self):
+        self.events_table.build_row_index(column="cue_type")
+        assert self.events_table.cue_type.meanings.row_index_num_events == 6
+        self.events_table.add_row(timestamp=6.0, cue_type="white circle", trial=6)
+        # the index does not list the new row, so the column is scanned
+        np.testing.assert_array_equal(self.events_table.where(column="cue_type", isin=["white circle"]), [0, 3, 6])
+        msg = (
+            "Cannot build a row index for column 'cue_type' because the row indexes of MeaningsTable "
+            "'cue_type_meanings' were built for 6 rows and EventsTable 'cue_events' has 7 rows."
+        )
+        with self.assertRaisesWith(ValueError, msg):
+            self.events_table.build_row_index(column="cue_type")
+
+    def test_where_not_categorical(self):
+        with self.assertRaisesWith(ValueError, "Column 'trial' is not a CategoricalVectorData column."):
+            self.events_table.where(column="trial", isin=[1])
+
+    def test_build_row_index_meanings_not_in_table(self):
+        other_table = EventsTable(name="other_events", description="Other events")
+        other_table.add_column(
+            name="cue_type",
+            description="The cue type.",
+            col_cls=CategoricalVectorData,
+            meanings=self.events_table.cue_type.meanings,
+        )
+        msg = (
+            "Cannot build a row index for column 'cue_type' because its MeaningsTable 'cue_type_meanings' is not "
+            "stored in EventsTable 'other_events'."
+        )
+        with self.assertRaisesWith(ValueError, msg):
+            other_table.build_row_index(column="cue_type")
+
+    def test_where_row_index_roundtrip(self):
+        self.events_table.build_row_index(column="cue_type")
+        nwbfile = NdxEventsNWBFile(
+            identifier="test", session_description="test", session_start_time=datetime.now().astimezone()
+        )
+        nwbfile.add_events_table(self.events_table)
+        path = "test_query.nwb"
+        try:
+            with NWBHDF5IO(path, mode="w") as io:
+                io.write(nwbfile)
+
+            with NWBHDF5IO(path, mode="r") as io:
+                read_events_table = io.read().events["cue_events"]
+                assert "cue_type_rows" in read_events_table.cue_type.meanings.colnames
+                np.testing.assert_array_equal(read_events_table.where(column="cue_type", isin=["green square"]), [2, 5])
+                np.testing.assert_array_equal(read_events_table.where(column="cue_type"), [0, 2, 3, 4, 5])
+        finally:
+            remove_test_file(path)
+
+    def test_where_row_index_append(self):
+        self.events_table.build_row_index(column="cue_type")
+        for name in ("id", "timestamp", "cue_type", "trial"):
+            self.events_table[name].set_data_io(H5DataIO, dict(maxshape=(None,)))
+        nwbfile = NdxEventsNWBFile(
+            identifier="test", session_description="test", session_start_time=datetime.now().astimezone()
+        )
+        nwbfile.add_events_table(self.events_table)
+        path = "test_query.nwb"
+        try:
+            with NWBHDF5IO(path, mode="w") as io:
+                io.write(nwbfile)
+            with NWBHDF5IO(path, mode="a") as io:
+                read_nwbfile = io.read()
+                read_events_table = read_nwbfile.events["cue_events"]
+                read_events_table.add_row(timestamp=6.0, cue_type="green square", trial=6)
+                np.testing.assert_array_equal(
+                    read_events_table.where(column="cue_type", isin=["green square"]), [2, 5, 6]
+                )
+                io.write(read_nwbfile)
+            with NWBHDF5IO(path, mode="r") as io:
+                read_events_table = io.read().events["cue_events"]
+                assert read_events_table.cue_type.meanings.row_index_num_events == 6
+                np.testing.assert_array_equal(
+                    read_events_table.where(column="cue_type", isin=["green square"]), [2, 5, 6]
+                )
+        finally:
+            remove_test_file(path)
+
+
+class TestEventsTableWhereTime(TestCase):
+    def setUp(self):
+        self.path = "test_where_time.nwb"
+        self.timestamps = [0.5, 0.1, 0.3, 0.9, 0.3, 0.7]
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def _create_events_table(self, timestamps):
+        events_table = EventsTable(name="events", description="Events")
+        for timestamp in timestamps:
+            events_table.add_row(timestamp=timestamp)
+        return events_table
+
+    def _write(self, events_table):
+        nwbfile = NdxEventsNWBFile(
+            identifier="test", session_description="test", session_start_time=datetime.now().astimezone()
+        )
+        nwbfile.add_events_table(events_table)
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(nwbfile)
+
+    def test_where_time_scan(self):
+        events_table = self._create_events_table(self.timestamps)
+        np.testing.assert_array_equal(events_table.where_time(t_start=0.3, t_stop=0.7), [0, 2, 4])
+        np.testing.assert_array_equal(events_table.where_time(t_start=0.6), [3, 5])
+        np.testing.assert_array_equal(events_table.where_time(t_stop=0.3), [1])
+
+    def test_where_time_timestamp_order(self):
+        events_table = self._create_events_table(self.timestamps)
+        np.testing.assert_array_equal(events_table.build_timestamp_order(), [1, 2, 4, 0, 5, 3])
+        np.testing.assert_array_equal(events_table.where_time(t_start=0.3, t_stop=0.7), [0, 2, 4])
+        np.testing.assert_array_equal(events_table.where_time(t_start=1.0), [])
+
+    def test_sorted_roundtrip(self):
+        self._write(self._create_events_table(sorted(self.timestamps)))
+        with NWBHDF5IO(self.path, mode="r") as io:
+            events_table = io.read().events["events"]
+            assert events_table.timestamp.sorted
+            assert events_table.timestamp_order is None
+            np.testing.assert_array_equal(events_table.where_time(t_start=0.3, t_stop=0.7), [1, 2, 3])
+
+    def test_timestamp_order_roundtrip(self):
+        events_table = self._create_events_table(self.timestamps)
+        events_table.build_timestamp_order()
+        self._write(events_table)
+        with NWBHDF5IO(self.path, mode="r") as io:
+            events_table = io.read().events["events"]
+            assert not events_table.timestamp.sorted
+            np.testing.assert_array_equal(events_table.timestamp_order[:], [1, 2, 4, 0, 5, 3])
+            np.testing.assert_array_equal(events_table.where_time(t_start=0.3, t_stop=0.7), [0, 2, 4])
+
+    def test_add_row_invalidates_order(self):
+        events_table = self._create_events_table(self.timestamps)
+        events_table.build_timestamp_order()
+        events_table.add_row(timestamp=0.0)
+        assert events_table.timestamp_order is None
+        np.testing.assert_array_equal(events_table.where_time(t_stop=0.2), [1, 6])
+        events_table = self._create_events_table(sorted(self.timestamps))
+        events_table.timestamp.sorted = True
+        events_table.add_row(timestamp=1.0)
+        assert events_table.timestamp.sorted
+        events_table.add_row(timestamp=0.0)
+        assert not events_table.timestamp.sorted
+        np.testing.assert_array_equal(events_table.where_time(t_stop=0.2), [0, 7])
+
+    def _append(self, timestamp):
+        with NWBHDF5IO(self.path, mode="a") as io:
+            read_nwbfile = io.read()
+            events_table = read_nwbfile.events["events"]
+            events_table.add_row(timestamp=timestamp)
+            np.testing.assert_array_equal(events_table.where_time(t_stop=0.05), [6])
+            io.write(read_nwbfile)
+
+    def _create_appendable_events_table(self, timestamps):
+        events_table = self._create_events_table(timestamps)
+        for column in (events_table.id, events_table.timestamp):
+            column.set_data_io(H5DataIO, dict(maxshape=(None,)))
+        return events_table
+
+    def test_append_sorted(self):
+        self._write(self._create_appendable_events_table(sorted(self.timestamps)))
+        self._append(0.0)
+        with NWBHDF5IO(self.path, mode="r") as io:
+            events_table = io.read().events["events"]
+            assert not events_table.timestamp.sorted
+            np.testing.assert_array_equal(events_table.where_time(t_stop=0.05), [6])
+
+    def test_append_timestamp_order(self):
+        events_table = self._create_appendable_events_table(self.timestamps)
+        events_table.build_timestamp_order()
+        self._write(events_table)
+        self._append(0.0)
+        with NWBHDF5IO(self.path, mode="a") as io:
+            read_nwbfile = io.read()
+            events_table = read_nwbfile.events["events"]
+            # the order in the file does not cover the appended row, so it is dropped
+            assert events_table.timestamp_order is None
+            np.testing.assert_array_equal(events_table.where_time(t_stop=0.2), [1, 6])
+            events_table.build_timestamp_order()
+            io.write(read_nwbfile)
+        with NWBHDF5IO(self.path, mode="r") as io:
+            events_table = io.read().events["events"]
+            np.testing.assert_array_equal(events_table.timestamp_order[:], [6, 1, 2, 4, 0, 5, 3])
+
+    def test_sorted_reuses_summary(self):
+        """Test that the timestamps are read only once to compute the summary and the 'sorted' attribute."""
+        with mock.patch.object(
+            events_table_io, "compute_timestamp_summary", wraps=events_table_io.compute_timestamp_summary
+        ) as compute_timestamp_summary:
+            self._write(self._create_events_table(sorted(self.timestamps)))
+        assert compute_timestamp_summary.call_count == 1
+        with NWBHDF5IO(self.path, mode="r") as io:
+            assert io.read().events["events"].timestamp.sorted
+
+
+class TestGetAllEvents(TestCase):
+    def setUp(self):
+        self.path = "test_get_all_events.nwb"
+        meanings_table = MeaningsTable(name="cue_meanings", description="Meanings of the cues.")
+        meanings_table.add_row(value=1, meaning="left")
+        meanings_table.add_row(value=2, meaning="right")
+        cue_events = EventsTable(name="cue_events", description="Cue events")
+        cue_events.add_categorical_column(name="cue", description="The cue.", meanings=meanings_table)
+        for i in range(5):
+            cue_events.add_row(timestamp=float(i), cue=1 + i % 2)
+        reward_events = EventsTable(name="reward_events", description="Reward events")
+        reward_events.add_column(name="volume", description="The reward volume.")
+        for i in range(4):
+            reward_events.add_row(timestamp=i * 1.5 + 0.25, volume=0.1 * i)
+        self.nwbfile = NdxEventsNWBFile(
+            identifier="test",
+            session_description="test",
+            session_start_time=datetime.now().astimezone(),
+            events=[cue_events, reward_events],
+        )
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_default(self):
+        events = self.nwbfile.get_all_events()
+        assert list(events.columns) == ["cue", "volume"]
+        assert len(events) == 9
+
+    def test_time_window(self):
+        events = self.nwbfile.get_all_events(t_start=1.0, t_stop=3.5, decode_categoricals=True)
+        np.testing.assert_array_equal(events.index, [1.0, 1.75, 2.0, 3.0, 3.25])
+        assert list(events["cue"].dropna()) == ["right", "left", "right"]
+
+    def test_projection(self):
+        events = self.nwbfile.get_all_events(tables=["reward_events"], columns=["volume"], t_start=1.0)
+        np.testing.assert_array_equal(events.index, [1.75, 3.25, 4.75])
+        assert list(events.columns) == ["volume"]
+        with self.assertRaisesWith(ValueError, "Columns ['pulse'] are not in any of the selected tables."):
+            self.nwbfile.get_all_events(columns=["pulse"])
+
+    def test_long_format(self):
+        events = self.nwbfile.get_all_events(t_stop=2.0, long_format=True)
+        assert list(events.columns) == ["table", "id", "timestamp", "column", "value"]
+        assert list(events["table"].cat.categories) == ["cue_events", "reward_events"]
+        assert list(events["table"]) == ["cue_events", "reward_events", "cue_events", "reward_events"]
+        assert list(events["column"]) == ["cue", "volume", "cue", "volume"]
+        np.testing.assert_array_equal(events["value"], [1, 0.0, 2, 0.1])
+
+    def test_read_events_roundtrip(self):
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(self.nwbfile)
+        with NWBHDF5IO(self.path, mode="r") as io:
+            cue_events = io.read().events["cue_events"]
+            events = cue_events.read_events(t_start=2.0, t_stop=4.0, decode_categoricals=True)
+            np.testing.assert_array_equal(events.index, [2, 3])
+            assert list(events["cue"]) == ["left", "right"]
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import numpy as np
+from pynwb import NWBHDF5IO
+from pynwb.testing import TestCase, remove_test_file
+
+from ndx_events import EventsTableBuilder, MeaningsTable, NdxEventsNWBFile
+from ndx_events.sequences import find_sequences
+
+
+def _find_sequences_loop(timestamps, values, steps, within, overlapping):
+    """Find sequences with a Python loop over the events, for reference."""
+    sequences = list()
+    last_end = -1
+    for first in range(len(values)):
+        if values[first] not in steps[0] or (not overlapping and first <= last_end):
+            continue
+        sequence = [first]
+        for step in steps[1:]:
+            following = [row for row in range(sequence[-1] + 1, len(values)) if values[row] in step]
+            if not following:
+                break
+            sequence.append(following[0])
+        if len(sequence) == len(steps) and timestamps[sequence[-1]] - timestamps[first] <= within:
+            sequences.append(sequence)
+            last_end = sequence[-1]
+    return np.asarray(sequences, dtype=np.int64).reshape(-1, len(steps))
+
+
+def _build_table(timestamps, values):
+    meanings_table = MeaningsTable(name="pulse_value_meanings", description="Meanings of the pulse values.")
+    for value in range(40):
+        meanings_table.add_row(value=value, meaning="pulse %d" % value)
+    builder = EventsTableBuilder(name="ttl_events", description="TTL events")
+    builder.add_column(name="pulse_value", description="Pulse value.", dtype=np.uint8, meanings=meanings_table)
+    builder.add_rows(timestamp=timestamps, pulse_value=values)
+    return builder.to_events_table(), meanings_table
+
+
+class TestFindSequences(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.timestamps = np.cumsum(rng.exponential(0.5, 2000))
+        self.values = rng.choice([1, 3, 5, 31, 33, 36], 2000)
+        self.table, _ = _build_table(self.timestamps, self.values)
+        self.steps = [[1], [3], list(range(31, 37))]
+
+    def test_matches_loop(self):
+        for overlapping in (False, True):
+            expected = _find_sequences_loop(self.timestamps, self.values, self.steps, 5.0, overlapping)
+            assert len(expected) > 0
+            for chunk_size in (7, 100, 5000):
+                sequences = find_sequences(
+                    self.table, "pulse_value", [1, 3, range(31, 37)], 5.0, overlapping, chunk_size=chunk_size
+                )
+                np.testing.assert_array_equal(sequences, expected)
+
+    def test_single_step(self):
+        sequences = find_sequences(self.table, "pulse_value", [5], 0.0, chunk_size=64)
+        np.testing.assert_array_equal(sequences[:, 0], np.flatnonzero(self.values == 5))
+
+    def test_no_match(self):
+        sequences = find_sequences(self.table, "pulse_value", [1, 39], 5.0)
+        assert sequences.shape == (0, 2)
+
+    def test_unsorted(self):
+        table, _ = _build_table([0.0, 2.0, 1.0], [1, 3, 31])
+        with self.assertRaisesWith(ValueError, "The rows of the table must be sorted by timestamp to find sequences."):
+            find_sequences(table, "pulse_value", [1, 3], 5.0, chunk_size=2)
+
+    def test_events_table(self):
+        table, _ = _build_table([0.0, 1.0, 2.5, 3.0, 10.0, 11.0, 20.0], [1, 3, 31, 1, 1, 3, 36])
+        sequences = table.find_sequences("pulse_value", [1, 3, range(31, 37)], within=5.0, name="trials")
+        assert sequences.name == "trials"
+        np.testing.assert_array_equal(sequences["timestamp"].data, [0.0])
+        np.testing.assert_array_equal(sequences["duration"].data, [2.5])
+        np.testing.assert_array_equal(sequences["event_rows"].data, [[0, 1, 2]])
+        sequences = table.find_sequences("pulse_value", [1, 3, range(31, 37)], within=10.0)
+        np.testing.assert_array_equal(sequences["timestamp"].data, [0.0, 10.0])
+        np.testing.assert_array_equal(sequences["duration"].data, [2.5, 10.0])
+
+    def test_roundtrip(self):
+        path = "test_sequences.nwb"
+        table, meanings_table = _build_table(self.timestamps, self.values)
+        nwbfile = NdxEventsNWBFile(
+            identifier="test", session_description="test", session_start_time=datetime.now().astimezone()
+        )
+        nwbfile.add_events_table(table)
+        nwbfile.add_events_table(table.find_sequences("pulse_value", [1, 3, range(31, 37)], within=5.0))
+        try:
+            with NWBHDF5IO(path, mode="w") as io:
+                io.write(nwbfile)
+            with NWBHDF5IO(path, mode="r") as io:
+                read_nwbfile = io.read()
+                sequences = read_nwbfile.events["ttl_events"].find_sequences(
+                    "pulse_value", [1, 3, range(31, 37)], within=5.0, chunk_size=128
+                )
+                np.testing.assert_array_equal(
+                    sequences["event_rows"].data, read_nwbfile.events["sequences"]["event_rows"].data[:]
+                )
+        finally:
+            remove_test_file(path)
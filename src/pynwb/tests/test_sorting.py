@@ -0,0 +1,97 @@
+from datetime import datetime
+import numpy as np
+from pynwb import NWBHDF5IO
+from pynwb.testing import TestCase, remove_test_file
+
+from ndx_events import EventsTable, EventsTableBuilder, MeaningsTable, NdxEventsNWBFile
+from ndx_events.sorting import sort_events_file
+
+
+class TestSortEventsFile(TestCase):
+    def setUp(self):
+        self.source_path = "test_sorting_source.nwb"
+        self.target_path = "test_sorting_target.nwb"
+        rng = np.random.default_rng(0)
+        n = 1000
+        # rounding the timestamps creates ties, which must keep their original order
+        self.timestamps = np.round(rng.uniform(0, 100, n), 0)
+        self.cues = rng.choice(["left", "right"], n).astype(object)
+        meanings_table = MeaningsTable(name="cue_meanings", description="Meanings of the cues.")
+        meanings_table.add_row(value="left", meaning="Left cue")
+        meanings_table.add_row(value="right", meaning="Right cue")
+        builder = EventsTableBuilder(name="cue_events", description="Cue events", duration=True)
+        builder.add_column("cue", "The cue.", dtype=object, meanings=meanings_table)
+        builder.add_column("trial", "The trial number.", dtype=np.int64)
+        builder.add_rows(timestamp=self.timestamps, duration=np.full(n, 0.5), cue=self.cues, trial=np.arange(n))
+        cue_events = builder.to_events_table()
+        cue_events.build_event_counts(bin_width=1.0)
+        other_events = EventsTable(name="other_events", description="Other events")
+        other_events.add_categorical_column(name="cue", description="The cue.", meanings=meanings_table)
+        other_events.add_row(timestamp=2.0, cue="right")
+        other_events.add_row(timestamp=float("nan"), cue="left")
+        other_events.add_row(timestamp=1.0, cue="left")
+        nwbfile = NdxEventsNWBFile(
+            identifier="test",
+            session_description="test",
+            session_start_time=datetime.now().astimezone(),
+            events=[cue_events, other_events],
+        )
+        with NWBHDF5IO(self.source_path, mode="w") as io:
+            io.write(nwbfile)
+
+    def tearDown(self):
+        remove_test_file(self.source_path)
+        remove_test_file(self.target_path)
+
+    def test_sort(self):
+        assert sort_events_file(self.source_path, self.target_path, chunk_size=64) == ["cue_events", "other_events"]
+        order = np.argsort(self.timestamps, kind="stable")
+        with NWBHDF5IO(self.target_path, mode="r") as io:
+            nwbfile = io.read()
+            cue_events = nwbfile.events["cue_events"]
+            np.testing.assert_array_equal(cue_events.timestamp[:], self.timestamps[order])
+            np.testing.assert_array_equal(cue_events.id[:], order)
+            np.testing.assert_array_equal(cue_events.trial[:], order)
+            assert list(cue_events.cue[:]) == list(self.cues[order])
+            assert cue_events.timestamp.sorted
+            assert cue_events.num_events == 1000
+            assert cue_events.summary()["value_counts"]["cue"]["left"] == np.sum(self.cues == "left")
+            assert cue_events.event_counts is not None
+            assert nwbfile.events["other_events"].cue.meanings is cue_events.cue.meanings
+
+            other_events = nwbfile.events["other_events"]
+            np.testing.assert_array_equal(other_events.timestamp[:], [1.0, 2.0, np.nan])
+            assert list(other_events.cue[:]) == ["left", "right", "left"]
+            assert not other_events.timestamp.sorted
+
+    def test_sort_sparse_durations(self):
+        timestamps = np.array([3.0, 1.0, 4.0, 1.5, 9.0, 2.0, 6.0])
+        durations = np.array([np.nan, 0.1, np.nan, np.nan, 0.9, 0.2, np.nan])
+        builder = EventsTableBuilder(name="licks", description="Licks", duration=True)
+        builder.add_rows(timestamp=timestamps, duration=durations)
+        nwbfile = NdxEventsNWBFile(
+            identifier="test",
+            session_description="test",
+            session_start_time=datetime.now().astimezone(),
+            events=[builder.to_events_table(sparse_duration=True)],
+        )
+        with NWBHDF5IO(self.source_path, mode="w") as io:
+            io.write(nwbfile)
+        sort_events_file(self.source_path, self.target_path, chunk_size=3)
+        order = np.argsort(timestamps, kind="stable")
+        with NWBHDF5IO(self.target_path, mode="r") as io:
+            licks = io.read().events["licks"]
+            assert "duration" not in licks.colnames
+            np.testing.assert_array_equal(licks.timestamp[:], timestamps[order])
+            np.testing.assert_array_equal(licks.get_durations()[:], durations[order])
+            np.testing.assert_array_equal(licks.duration_rows[:], [0, 2, 6])
+            np.testing.assert_allclose(
+                licks.duration_quantiles, np.nanquantile(durations, licks.duration_quantile_levels)
+            )
+
+    def test_sort_selected_tables(self):
+        assert sort_events_file(self.source_path, self.target_path, tables=["other_events"]) == ["other_events"]
+        with NWBHDF5IO(self.target_path, mode="r") as io:
+            other_events = io.read().events["other_events"]
+            assert "cue_meanings" in other_events.meanings_tables
+            np.testing.assert_array_equal(other_events.id[:], [2, 0, 1])
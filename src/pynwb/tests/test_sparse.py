@@ -0,0 +1,223 @@
+from datetime import datetime
+import importlib.util
+
+import h5py
+import numpy as np
+from hdmf.build import BuildManager
+from hdmf.common.io.table import DynamicTableMap
+from pynwb import NWBHDF5IO, get_type_map
+from pynwb.testing import TestCase, remove_test_file
+
+from ndx_events import (
+    DurationVectorData,
+    EventsTable,
+    EventsTableBuilder,
+    NdxEventsNWBFile,
+    SparseDurations,
+    TimestampVectorData,
+)
+
+
+def _sparse_table(rows, values, num_rows=4, **kwargs):
+    return EventsTable(
+        name="events",
+        description="Events",
+        id=np.arange(num_rows),
+        columns=[TimestampVectorData(name="timestamp", description="Times", data=np.arange(float(num_rows)))],
+        duration_rows=rows,
+        duration_values=values,
+        **kwargs,
+    )
+
+
+class TestSparseDurations(TestCase):
+    def setUp(self):
+        self.dense = np.full(10, np.nan)
+        self.dense[[1, 4, 5, 9]] = [0.5, 1.0, 1.5, 2.0]
+        self.sparse = SparseDurations.from_dense(self.dense, chunk_size=3)
+
+    def test_from_dense(self):
+        np.testing.assert_array_equal(self.sparse.rows, [1, 4, 5, 9])
+        np.testing.assert_array_equal(self.sparse.values, [0.5, 1.0, 1.5, 2.0])
+        assert len(self.sparse) == 10
+        assert self.sparse.shape == (10,)
+
+    def test_getitem(self):
+        assert self.sparse[4] == 1.0
+        assert self.sparse[-1] == 2.0
+        assert np.isnan(self.sparse[0])
+        for key in (slice(None), slice(2, 6), slice(None, None, 3), slice(6, 9), [9, 0, 4], self.dense > 1.0):
+            np.testing.assert_array_equal(self.sparse[key], self.dense[key])
+        np.testing.assert_array_equal(np.asarray(self.sparse), self.dense)
+        np.testing.assert_array_equal(list(self.sparse), self.dense)
+
+    def test_index_error(self):
+        with self.assertRaises(IndexError):
+            self.sparse[10]
+        with self.assertRaises(IndexError):
+            self.sparse[[0, 10]]
+
+
+class TestSparseDurationsTable(TestCase):
+    def test_columns(self):
+        table = _sparse_table([1, 3], [0.5, 1.5])
+        expected = [np.nan, 0.5, np.nan, 1.5]
+        assert table.colnames == ("timestamp",)
+        assert isinstance(table.duration, DurationVectorData)
+        np.testing.assert_array_equal(table.duration.data[:], expected)
+        np.testing.assert_array_equal(table["duration"].data[1:3], expected[1:3])
+        assert table[3, "duration"] == 1.5
+        np.testing.assert_array_equal(table.to_dataframe()["duration"], expected)
+        assert list(table.to_dataframe().columns) == ["timestamp", "duration"]
+        assert "duration" not in table.to_dataframe(exclude={"duration"}).columns
+        assert table[1]["duration"].tolist() == [0.5]
+        np.testing.assert_array_equal(table[1:4]["duration"], expected[1:4])
+        np.testing.assert_array_equal(table[[3, 0]]["duration"], [1.5, np.nan])
+
+    def test_no_durations(self):
+        table = _sparse_table(None, None)
+        assert table.duration is None
+        assert table.get("duration") is None
+        assert "duration" not in table.to_dataframe().columns
+
+    def test_invalid(self):
+        with self.assertRaisesWith(
+            ValueError, "EventsTable 'events' must have both duration_rows and duration_values, or neither."
+        ):
+            _sparse_table([1], None)
+        with self.assertRaisesWith(
+            ValueError,
+            "The duration_rows (2) and duration_values (1) of EventsTable 'events' must have the same length.",
+        ):
+            _sparse_table([1, 2], [0.5])
+        with self.assertRaisesWith(
+            ValueError, "The duration_rows of EventsTable 'events' must be strictly increasing."
+        ):
+            _sparse_table([2, 1], [0.5, 1.5])
+        with self.assertRaisesWith(
+            ValueError,
+            "The duration_rows of EventsTable 'events' must be between 0 and the number of rows of the table.",
+        ):
+            _sparse_table([1, 4], [0.5, 1.5])
+        duration = DurationVectorData(name="duration", description="Durations", data=np.full(4, np.nan))
+        with self.assertRaisesWith(
+            ValueError,
+            "EventsTable 'events' cannot have both a 'duration' column and sparse durations in duration_rows and "
+            "duration_values.",
+        ):
+            EventsTable(
+                name="events",
+                description="Events",
+                id=np.arange(4),
+                columns=[
+                    TimestampVectorData(name="timestamp", description="Times", data=np.arange(4.0)),
+                    duration,
+                ],
+                duration_rows=[1],
+                duration_values=[0.5],
+            )
+
+
+class TestSparseDurationsRoundtrip(TestCase):
+    def setUp(self):
+        self.path = "test_sparse.nwb"
+        self.durations = np.full(100, np.nan)
+        self.durations[::10] = np.arange(10) + 0.5
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def _write(self, events_table):
+        nwbfile = NdxEventsNWBFile(
+            identifier="test", session_description="test", session_start_time=datetime.now().astimezone()
+        )
+        nwbfile.add_events_table(events_table)
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(nwbfile)
+
+    def test_roundtrip(self):
+        sparse = SparseDurations.from_dense(self.durations)
+        events_table = EventsTable(
+            name="events",
+            description="Events",
+            id=np.arange(100),
+            columns=[TimestampVectorData(name="timestamp", description="Times", data=np.arange(100.0))],
+            duration_rows=sparse.rows,
+            duration_values=sparse.values,
+        )
+        self._write(events_table)
+
+        with h5py.File(self.path, "r") as f:
+            np.testing.assert_array_equal(f["events/events/duration_values"][:], np.arange(10) + 0.5)
+            np.testing.assert_array_equal(f["events/events/duration_rows"][:], np.arange(0, 100, 10))
+            np.testing.assert_array_equal(f["events/events"].attrs["duration_quantiles"], [0.5, 2.75, 5.0, 7.25, 9.5])
+            assert "duration" not in f["events/events"]
+            assert list(f["events/events"].attrs["colnames"]) == ["timestamp"]
+
+        with NWBHDF5IO(self.path, mode="r") as io:
+            read_table = io.read().events["events"]
+            assert read_table.colnames == ("timestamp",)
+            assert isinstance(read_table.get_durations(), SparseDurations)
+            np.testing.assert_array_equal(read_table.get_durations()[:], self.durations)
+            np.testing.assert_array_equal(
+                read_table.read_events(t_start=5.0, t_stop=25.0)["duration"], self.durations[5:25]
+            )
+            np.testing.assert_array_equal(read_table.read_events()["duration"], self.durations)
+            np.testing.assert_array_equal(read_table.summary()["duration_quantiles"], [0.5, 2.75, 5.0, 7.25, 9.5])
+
+    def test_merge(self):
+        builder = EventsTableBuilder(name="events", description="Events", duration=True)
+        builder.add_rows(timestamp=np.arange(100.0), duration=self.durations)
+        self._write(builder.to_events_table(sparse_duration=True))
+        with NWBHDF5IO(self.path, mode="r") as io:
+            nwbfile = io.read()
+            np.testing.assert_array_equal(nwbfile.events["events"].duration.data[:], self.durations)
+            np.testing.assert_array_equal(nwbfile.get_all_events()["duration"], self.durations)
+            np.testing.assert_array_equal(nwbfile.get_all_events(t_start=0.0)["duration"], self.durations)
+            events = nwbfile.get_all_events(columns=["duration"], t_stop=20.0)
+            assert list(events.columns) == ["duration"]
+            np.testing.assert_array_equal(events["duration"], self.durations[:20])
+
+    def test_to_dask(self):
+        if importlib.util.find_spec("dask") is None:
+            self.skipTest("Dask is not installed.")
+        builder = EventsTableBuilder(name="events", description="Events", duration=True)
+        builder.add_rows(timestamp=np.arange(100.0), duration=self.durations)
+        self._write(builder.to_events_table(sparse_duration=True))
+        with NWBHDF5IO(self.path, mode="r") as io:
+            df = io.read().events["events"].to_dask(partition_size=30)
+            assert list(df.columns) == ["timestamp", "duration"]
+            np.testing.assert_array_equal(df.compute()["duration"], self.durations)
+
+    def test_read_as_dynamic_table(self):
+        """A reader that maps EventsTable like any DynamicTable can read a table with sparse durations."""
+        builder = EventsTableBuilder(name="events", description="Events", duration=True)
+        builder.add_rows(timestamp=np.arange(100.0), duration=self.durations)
+        self._write(builder.to_events_table(sparse_duration=True))
+        type_map = get_type_map()
+        type_map.register_map(EventsTable, DynamicTableMap)
+        with NWBHDF5IO(self.path, mode="r", manager=BuildManager(type_map)) as io:
+            read_table = io.read().events["events"]
+            assert type(io.manager.type_map.get_map(read_table)) is DynamicTableMap
+            assert read_table.colnames == ("timestamp",)
+            assert len(read_table.to_dataframe()) == 100
+
+    def test_builder(self):
+        builder = EventsTableBuilder(name="events", description="Events", duration=True)
+        builder.add_rows(timestamp=np.arange(100.0), duration=self.durations)
+        self._write(builder.to_events_table(sparse_duration=True))
+        with NWBHDF5IO(self.path, mode="r") as io:
+            read_table = io.read().events["events"]
+            assert "duration" not in read_table.colnames
+            assert len(read_table.duration_values) == 10
+            np.testing.assert_array_equal(read_table.get_durations()[:], self.durations)
+
+    def test_dense_roundtrip(self):
+        builder = EventsTableBuilder(name="events", description="Events", duration=True)
+        builder.add_rows(timestamp=np.arange(100.0), duration=self.durations)
+        self._write(builder.to_events_table())
+        with NWBHDF5IO(self.path, mode="r") as io:
+            read_table = io.read().events["events"]
+            assert isinstance(read_table.get_durations(), h5py.Dataset)
+            assert read_table.duration_rows is None
+            assert read_table.duration_values is None
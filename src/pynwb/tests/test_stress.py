@@ -0,0 +1,147 @@
+"""Stress tests that write, read, and merge synthetic tables of half a million events.
+
+When the environment variable NDX_EVENTS_STRESS is set to 1, the tests also check that memory use stays bounded and
+that throughput does not regress by an order of magnitude. The thresholds are loose so that the tests pass on slow
+machines; they catch operations that load whole columns into memory or loop over events in Python. They depend on the
+load of the machine, so they are not checked by default, but the "Run stress tests" workflow checks them weekly.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+import unittest
+
+import numpy as np
+from pynwb import NWBHDF5IO
+from pynwb.testing import TestCase
+
+from ndx_events import SparseDurations
+from ndx_events.testing import SyntheticTable, make_synthetic_events_table, write_synthetic_file
+
+NUM_EVENTS = 500_000
+BLOCK_SIZE = 2**14
+# Bytes of the row IDs, timestamps, and categories of the largest table
+TABLE_BYTES = NUM_EVENTS * (8 + 8 + 1)
+# Whether to check the memory use and the throughput
+CHECK_PERFORMANCE = os.environ.get("NDX_EVENTS_STRESS") == "1"
+
+
+def _measure(func, *args, **kwargs):
+    """Return the result of func, the peak memory allocated while it runs, in bytes, and its duration, in seconds.
+
+    The memory use is only traced if CHECK_PERFORMANCE is True, since tracing slows down the allocations; otherwise,
+    the peak is None.
+    """
+    if not CHECK_PERFORMANCE:
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        return result, None, time.perf_counter() - start
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+        duration = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, peak, duration
+
+
+class TestSyntheticTable(TestCase):
+    def test_reproducible(self):
+        table = SyntheticTable("events", num_events=1000, categories=[1, 2], duration_fraction=0.5)
+        first = make_synthetic_events_table(table, seed=1, block_size=100)
+        second = make_synthetic_events_table(table, seed=1, block_size=100)
+        assert first.min_timestamp == second.min_timestamp
+        assert first.max_timestamp == second.max_timestamp
+        np.testing.assert_array_equal(first["category"].value_counts, second["category"].value_counts)
+        assert first["category"].value_counts.sum() == 1000
+        other = make_synthetic_events_table(table, seed=2, block_size=100)
+        assert first.max_timestamp != other.max_timestamp
+
+    def test_duration_quantiles(self):
+        table = SyntheticTable("events", num_events=1000, duration_fraction=0.5)
+        dense = make_synthetic_events_table(table, block_size=100)
+        table.sparse_duration = True
+        sparse = make_synthetic_events_table(table, block_size=100)
+        expected = np.quantile(sparse.duration_values, sparse.duration_quantile_levels)
+        np.testing.assert_allclose(dense.duration_quantiles, expected)
+        np.testing.assert_allclose(sparse.duration_quantiles, expected)
+
+    def test_invalid(self):
+        with self.assertRaisesWith(ValueError, "A synthetic table must have at least one event."):
+            SyntheticTable("events", num_events=0)
+        with self.assertRaisesWith(ValueError, "duration_fraction must be between 0 and 1."):
+            SyntheticTable("events", num_events=1, duration_fraction=2.0)
+
+
+class TestStress(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.tmpdir, "synthetic.nwb")
+        cls.tables = [
+            SyntheticTable(
+                "ttl_events", NUM_EVENTS, rate=1000.0, categories=[1, 3, 31, 66], category_weights=[4, 2, 1, 1]
+            ),
+            SyntheticTable("licks", NUM_EVENTS // 10, rate=100.0, duration_fraction=0.05, sparse_duration=True),
+        ]
+        # time the write without tracemalloc, which slows down the allocations of the namespace cache
+        start = time.perf_counter()
+        write_synthetic_file(cls.path, cls.tables, block_size=BLOCK_SIZE)
+        cls.write_duration = time.perf_counter() - start
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir)
+
+    @unittest.skipUnless(CHECK_PERFORMANCE, "set NDX_EVENTS_STRESS=1 to check the memory use and the throughput")
+    def test_write_performance(self):
+        assert NUM_EVENTS / self.write_duration > 200_000
+        path = os.path.join(self.tmpdir, "synthetic_memory.nwb")
+        _, peak, _ = _measure(write_synthetic_file, path, self.tables, block_size=BLOCK_SIZE)
+        # a few blocks of each column
+        assert peak < TABLE_BYTES / 4
+
+    def test_contents(self):
+        with NWBHDF5IO(self.path, mode="r") as io:
+            nwbfile = io.read()
+            ttl_events = nwbfile.events["ttl_events"]
+            assert len(ttl_events) == NUM_EVENTS
+            assert ttl_events["timestamp"].sorted
+            summary = ttl_events.summary()
+            assert sum(summary["value_counts"]["category"].values()) == NUM_EVENTS
+            # the mean time between events is 1 ms
+            assert abs(summary["max_timestamp"] - NUM_EVENTS / 1000.0) < 0.01 * NUM_EVENTS / 1000.0
+            licks = nwbfile.events["licks"]
+            assert "duration" not in licks.colnames
+            assert isinstance(licks.get_durations(), SparseDurations)
+            assert abs(len(licks.duration_values) - 0.05 * len(licks)) < 0.01 * len(licks)
+
+    def test_read(self):
+        with NWBHDF5IO(self.path, mode="r") as io:
+            ttl_events = io.read().events["ttl_events"]
+            # read the events of 10% of the session
+            t_stop = ttl_events.max_timestamp / 10
+            events, peak, duration = _measure(ttl_events.read_events, columns=["category"], t_stop=t_stop)
+        assert abs(len(events) - NUM_EVENTS / 10) < NUM_EVENTS / 100
+        assert (events["timestamp"] < t_stop).all()
+        if CHECK_PERFORMANCE:
+            assert peak < TABLE_BYTES / 2
+            assert len(events) / duration > 500_000
+
+    def test_merge(self):
+        with NWBHDF5IO(self.path, mode="r") as io:
+            nwbfile = io.read()
+            t_start = nwbfile.events["ttl_events"].max_timestamp / 2
+            t_stop = t_start + nwbfile.events["ttl_events"].max_timestamp / 10
+            expected = sum(len(table.where_time(t_start=t_start, t_stop=t_stop)) for table in nwbfile.events.values())
+            events, peak, duration = _measure(nwbfile.get_all_events, t_start=t_start, t_stop=t_stop)
+        assert len(events) == expected
+        assert events.index.is_monotonic_increasing
+        if CHECK_PERFORMANCE:
+            # the events of 10% of the session, with the columns of both tables
+            assert peak < TABLE_BYTES
+            assert len(events) / duration > 100_000
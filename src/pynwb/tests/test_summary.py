@@ -0,0 +1,119 @@
+from datetime import datetime
+import h5py
+import numpy as np
+from hdmf.backends.hdf5 import H5DataIO
+from pynwb import NWBHDF5IO
+from pynwb.testing import TestCase, remove_test_file
+
+from ndx_events import EventsTable, CategoricalVectorData, MeaningsTable, NdxEventsNWBFile
+from ndx_events.summary import compute_duration_quantiles
+
+
+def _create_events_table():
+    meanings_table = MeaningsTable(name="pulse_value_meanings", description="Meanings of the pulse values.")
+    meanings_table.add_row(value=1, meaning="Stimulus onset")
+    meanings_table.add_row(value=2, meaning="Stimulus offset")
+    meanings_table.add_row(value=3, meaning="Question screen onset")
+    column = CategoricalVectorData(name="pulse_value", description="Pulse value.", meanings=meanings_table)
+    events_table = EventsTable(
+        name="ttl_events", description="TTL events", columns=[column], meanings_tables=[meanings_table]
+    )
+    events_table.add_row(timestamp=1.0, duration=0.5, pulse_value=1)
+    events_table.add_row(timestamp=0.5, duration=np.nan, pulse_value=2)
+    events_table.add_row(timestamp=3.0, duration=1.5, pulse_value=1)
+    return events_table
+
+
+class TestEventsTableSummary(TestCase):
+    def test_summary_in_memory(self):
+        summary = _create_events_table().summary()
+        assert summary["num_events"] == 3
+        assert summary["min_timestamp"] == 0.5
+        assert summary["max_timestamp"] == 3.0
+        assert summary["duration_quantile_levels"] == [0.0, 0.25, 0.5, 0.75, 1.0]
+        assert summary["duration_quantiles"] == [0.5, 0.75, 1.0, 1.25, 1.5]
+        assert summary["value_counts"] == {"pulse_value": {1: 2, 2: 1, 3: 0}}
+
+    def test_summary_after_add_row(self):
+        events_table = _create_events_table()
+        events_table.num_events = 3
+        events_table.add_row(timestamp=0.1, duration=np.nan, pulse_value=3)
+        summary = events_table.summary()
+        assert summary["num_events"] == 4
+        assert summary["min_timestamp"] == 0.1
+        assert summary["value_counts"] == {"pulse_value": {1: 2, 2: 1, 3: 1}}
+
+    def test_duration_quantiles_bounded_memory(self):
+        durations = np.random.default_rng(0).exponential(1.0, 10000)
+        durations[::3] = np.nan
+        durations[100:2000] = 0.5
+        levels = [0.0, 0.1, 0.25, 0.5, 0.9, 1.0]
+        expected = np.quantile(durations[~np.isnan(durations)], levels)
+        for max_values in (1, 50, 10000):
+            quantiles = compute_duration_quantiles(durations, levels, chunk_size=999, max_values=max_values)
+            np.testing.assert_allclose(quantiles, expected, rtol=1e-12)
+
+    def test_summary_empty_table(self):
+        summary = EventsTable(name="events", description="No events").summary()
+        assert summary["num_events"] == 0
+        assert summary["min_timestamp"] is None
+        assert summary["duration_quantiles"] is None
+
+
+class TestEventsTableSummaryRoundtrip(TestCase):
+    def setUp(self):
+        self.path = "test_summary.nwb"
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def _write(self, events_table):
+        nwbfile = NdxEventsNWBFile(
+            identifier="test", session_description="test", session_start_time=datetime.now().astimezone()
+        )
+        nwbfile.add_events_table(events_table)
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(nwbfile)
+
+    def test_summary_written(self):
+        """Test that the summary attributes are computed and written at write time."""
+        self._write(_create_events_table())
+
+        with h5py.File(self.path, "r") as f:
+            attrs = f["events/ttl_events"].attrs
+            assert attrs["num_events"] == 3
+            assert attrs["min_timestamp"] == 0.5
+            assert attrs["max_timestamp"] == 3.0
+            np.testing.assert_array_equal(attrs["duration_quantiles"], [0.5, 0.75, 1.0, 1.25, 1.5])
+            np.testing.assert_array_equal(f["events/ttl_events/pulse_value"].attrs["value_counts"], [2, 1, 0])
+
+        with NWBHDF5IO(self.path, mode="r") as io:
+            read_events_table = io.read().events["ttl_events"]
+            assert read_events_table.num_events == 3
+            assert read_events_table.summary() == _create_events_table().summary()
+
+    def test_summary_updated_on_append(self):
+        """Test that the summary attributes are updated when rows are appended in append mode."""
+        events_table = _create_events_table()
+        for column in (events_table.id, events_table.timestamp, events_table.duration, events_table.pulse_value):
+            column.set_data_io(H5DataIO, dict(maxshape=(None,)))
+        self._write(events_table)
+
+        with NWBHDF5IO(self.path, mode="a") as io:
+            read_nwbfile = io.read()
+            read_events_table = read_nwbfile.events["ttl_events"]
+            read_events_table.add_row(timestamp=0.1, duration=2.5, pulse_value=3)
+            read_events_table.add_row(timestamp=3.0, duration=0.5, pulse_value=1)
+            read_events_table.add_row(timestamp=4.0, duration=0.5, pulse_value=3)
+            summary = read_events_table.summary()
+            assert summary["num_events"] == 6
+            assert summary["min_timestamp"] == 0.1
+            assert summary["value_counts"] == {"pulse_value": {1: 3, 2: 1, 3: 2}}
+            io.write(read_nwbfile)
+
+        with NWBHDF5IO(self.path, mode="r") as io:
+            summary = io.read().events["ttl_events"].summary()
+            assert summary["num_events"] == 6
+            assert summary["min_timestamp"] == 0.1
+            assert summary["duration_quantiles"][-1] == 2.5
+            assert summary["value_counts"] == {"pulse_value": {1: 3, 2: 1, 3: 2}}
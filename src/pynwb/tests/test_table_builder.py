@@ -0,0 +1,111 @@
+from datetime import datetime
+import numpy as np
+from pynwb import NWBHDF5IO
+from pynwb.testing import TestCase, remove_test_file
+
+from ndx_events import (
+    ColumnBuffer,
+    EventsTableBuilder,
+    EventsTable,
+    CategoricalVectorData,
+    MeaningsTable,
+    NdxEventsNWBFile,
+)
+
+
+class TestColumnBuffer(TestCase):
+    def test_append_and_extend(self):
+        buffer = ColumnBuffer(np.float64, capacity=2)
+        buffer.append(0.5)
+        buffer.extend([1.5, 2.5, 3.5])
+        assert len(buffer) == 4
+        np.testing.assert_array_equal(buffer.data, [0.5, 1.5, 2.5, 3.5])
+
+    def test_trim(self):
+        buffer = ColumnBuffer(np.int32, capacity=100)
+        buffer.extend(np.arange(10))
+        buffer.trim()
+        assert buffer.data.base.shape == (10,)
+        np.testing.assert_array_equal(buffer.data, np.arange(10))
+
+
+class TestEventsTableBuilder(TestCase):
+    def setUp(self):
+        self.meanings_table = MeaningsTable(name="pulse_value_meanings", description="Meanings of the pulse values.")
+        self.meanings_table.add_row(value=1, meaning="Stimulus onset")
+        self.meanings_table.add_row(value=2, meaning="Stimulus offset")
+
+        self.builder = EventsTableBuilder(name="ttl_events", description="TTL events", duration=True, capacity=1)
+        self.builder.add_column(
+            name="pulse_value", description="Pulse value.", dtype=np.uint8, meanings=self.meanings_table
+        )
+
+    def test_to_events_table(self):
+        self.builder.add_row(timestamp=0.1, duration=np.nan, pulse_value=1)
+        self.builder.add_rows(timestamp=[0.2, 0.3], duration=[0.5, np.nan], pulse_value=[2, 1])
+        assert len(self.builder) == 3
+        assert self.builder.colnames == ("timestamp", "duration", "pulse_value")
+
+        events_table = self.builder.to_events_table()
+        assert isinstance(events_table, EventsTable)
+        assert len(events_table) == 3
+        assert isinstance(events_table.timestamp.data, np.ndarray)
+        assert isinstance(events_table.id.data, np.ndarray)
+        np.testing.assert_array_equal(events_table.timestamp.data, [0.1, 0.2, 0.3])
+        np.testing.assert_array_equal(events_table.duration.data, [np.nan, 0.5, np.nan])
+        assert isinstance(events_table.pulse_value, CategoricalVectorData)
+        assert events_table.pulse_value.data.dtype == np.uint8
+        assert events_table.meanings_tables["pulse_value_meanings"] is self.meanings_table
+
+    def test_add_row_missing_column(self):
+        with self.assertRaisesWith(
+            ValueError, "add_row requires values for exactly the columns ['timestamp', 'duration', 'pulse_value']."
+        ):
+            self.builder.add_row(timestamp=0.1, pulse_value=1)
+
+    def test_add_rows_different_lengths(self):
+        with self.assertRaisesWith(ValueError, "add_rows requires arrays of the same length, got lengths [1, 2]."):
+            self.builder.add_rows(timestamp=[0.1, 0.2], duration=[0.5, 0.5], pulse_value=[1])
+
+    def test_invalid_value_adds_nothing(self):
+        self.builder.add_row(timestamp=0.1, duration=np.nan, pulse_value=1)
+        with self.assertRaises(ValueError):
+            self.builder.add_row(timestamp=0.2, duration="oops", pulse_value=1)
+        with self.assertRaisesWith(
+            ValueError, "add_row requires a single value for column 'pulse_value', got shape (2,)."
+        ):
+            self.builder.add_row(timestamp=0.2, duration=0.5, pulse_value=[1, 2])
+        with self.assertRaises(ValueError):
+            self.builder.add_rows(timestamp=[0.2, 0.3], duration=[0.5, "oops"], pulse_value=[1, 2])
+        assert len(self.builder) == 1
+        self.builder.add_row(timestamp=0.2, duration=0.5, pulse_value=2)
+        events_table = self.builder.to_events_table()
+        np.testing.assert_array_equal(events_table.timestamp.data, [0.1, 0.2])
+        np.testing.assert_array_equal(events_table.duration.data, [np.nan, 0.5])
+
+    def test_add_column_after_rows(self):
+        self.builder.add_row(timestamp=0.1, duration=np.nan, pulse_value=1)
+        with self.assertRaisesWith(ValueError, "Cannot add column 'extra' after rows have been added."):
+            self.builder.add_column(name="extra", description="Extra column.")
+
+    def test_roundtrip(self):
+        timestamps = np.arange(10000) * 0.01
+        self.builder.add_rows(
+            timestamp=timestamps, duration=np.full(10000, np.nan), pulse_value=np.arange(10000) % 2 + 1
+        )
+        nwbfile = NdxEventsNWBFile(
+            identifier="test", session_description="test", session_start_time=datetime.now().astimezone()
+        )
+        nwbfile.add_events_table(self.builder.to_events_table())
+        path = "test_table_builder.nwb"
+        try:
+            with NWBHDF5IO(path, mode="w") as io:
+                io.write(nwbfile)
+
+            with NWBHDF5IO(path, mode="r") as io:
+                read_events_table = io.read().events["ttl_events"]
+                np.testing.assert_array_equal(read_events_table.timestamp.data[:], timestamps)
+                assert read_events_table.pulse_value.data.dtype == np.uint8
+                assert read_events_table.summary()["value_counts"] == {"pulse_value": {1: 5000, 2: 5000}}
+        finally:
+            remove_test_file(path)
@@ -0,0 +1,87 @@
+from datetime import datetime
+import numpy as np
+from pynwb import NWBHDF5IO, TimeSeries
+from pynwb.testing import TestCase, remove_test_file
+
+from ndx_events import EventsTable, NdxEventsNWBFile, get_sample_indices, get_snippets
+
+
+class TestGetSampleIndices(TestCase):
+    def setUp(self):
+        self.events_table = EventsTable(name="events", description="Events")
+        for timestamp in [1.0, 0.528, 0.26, -1.0, 5.0]:
+            self.events_table.add_row(timestamp=timestamp)
+        self.data = np.arange(100, dtype=np.float64)
+
+    def test_rate(self):
+        timeseries = TimeSeries(name="ts", data=self.data, unit="a.u.", rate=100.0, starting_time=0.25)
+        indices = get_sample_indices(self.events_table["timestamp"], timeseries)
+        np.testing.assert_array_equal(indices, [75, 28, 1, -1, -1])
+        np.testing.assert_array_equal(
+            get_sample_indices(self.events_table["timestamp"], timeseries, method="previous"), [75, 27, 1, -1, -1]
+        )
+
+    def test_timestamps(self):
+        timestamps = 0.25 + np.arange(100) / 100
+        timeseries = TimeSeries(name="ts", data=self.data, unit="a.u.", timestamps=timestamps)
+        indices = get_sample_indices(self.events_table["timestamp"], timeseries, chunk_size=8)
+        np.testing.assert_array_equal(indices, [75, 28, 1, -1, -1])
+        indices = get_sample_indices(self.events_table["timestamp"], timeseries, method="previous", chunk_size=8)
+        np.testing.assert_array_equal(indices, [75, 27, 1, -1, -1])
+
+    def test_timestamps_end(self):
+        """Test that times after the last sample are mapped as with the equivalent sampling rate."""
+        times = [1.24, 1.244, 1.246, 1.249, 1.25, 1.26, np.nan]
+        with_rate = TimeSeries(name="ts", data=self.data, unit="a.u.", rate=100.0, starting_time=0.25)
+        with_timestamps = TimeSeries(name="ts", data=self.data, unit="a.u.", timestamps=0.25 + np.arange(100) / 100)
+        for method, expected in (("nearest", [99, 99, -1, -1, -1, -1, -1]), ("previous", [99, 99, 99, 99, -1, -1, -1])):
+            np.testing.assert_array_equal(get_sample_indices(times, with_rate, method=method), expected)
+            np.testing.assert_array_equal(get_sample_indices(times, with_timestamps, method=method), expected)
+        single = TimeSeries(name="ts", data=[0.0], unit="a.u.", timestamps=[1.0])
+        np.testing.assert_array_equal(get_sample_indices([0.5, 1.0, 1.5], single), [-1, 0, -1])
+
+    def test_invalid_method(self):
+        timeseries = TimeSeries(name="ts", data=self.data, unit="a.u.", rate=100.0)
+        with self.assertRaisesWith(ValueError, "method must be one of ('nearest', 'previous'), not 'next'."):
+            get_sample_indices(self.events_table["timestamp"], timeseries, method="next")
+
+
+class TestGetSnippets(TestCase):
+    def setUp(self):
+        self.path = "test_snippets.nwb"
+        self.data = np.arange(200, dtype=np.int16).reshape(100, 2)
+
+    def tearDown(self):
+        remove_test_file(self.path)
+
+    def test_get_snippets(self):
+        timeseries = TimeSeries(name="ts", data=self.data, unit="a.u.", rate=10.0)
+        snippets = get_snippets(timeseries, [50, 1, -1, 98, 52], start_offset=-2, stop_offset=3, chunk_size=16)
+        assert snippets.shape == (5, 5, 2)
+        np.testing.assert_array_equal(snippets[0], self.data[48:53])
+        np.testing.assert_array_equal(snippets[4], self.data[50:55])
+        np.testing.assert_array_equal(snippets[1, 1:], self.data[0:4])
+        assert np.isnan(snippets[1, 0]).all() and np.isnan(snippets[2]).all() and np.isnan(snippets[3, 4]).all()
+        np.testing.assert_array_equal(snippets[3, :4], self.data[96:100])
+
+    def test_get_snippets_roundtrip(self):
+        nwbfile = NdxEventsNWBFile(
+            identifier="test", session_description="test", session_start_time=datetime.now().astimezone()
+        )
+        nwbfile.add_acquisition(TimeSeries(name="ts", data=self.data, unit="a.u.", rate=10.0))
+        events_table = EventsTable(name="events", description="Events")
+        for timestamp in [0.5, 5.0, 5.2, 9.0]:
+            events_table.add_row(timestamp=timestamp)
+        nwbfile.add_events_table(events_table)
+        with NWBHDF5IO(self.path, mode="w") as io:
+            io.write(nwbfile)
+
+        with NWBHDF5IO(self.path, mode="r") as io:
+            read_nwbfile = io.read()
+            timeseries = read_nwbfile.acquisition["ts"]
+            indices = get_sample_indices(read_nwbfile.events["events"]["timestamp"], timeseries)
+            np.testing.assert_array_equal(indices, [5, 50, 52, 90])
+            snippets = get_snippets(timeseries, indices, start_offset=0, stop_offset=4, fill_value=-1, max_gap=10)
+            assert snippets.dtype == np.int16
+            for snippet, index in zip(snippets, indices):
+                np.testing.assert_array_equal(snippet, self.data[index : index + 4])
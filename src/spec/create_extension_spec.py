@@ -38,6 +38,16 @@ def main():
                 ),
                 required=False,
             ),
+            NWBAttributeSpec(
+                name="sorted",
+                dtype="bool",
+                doc=(
+                    "Optional flag indicating whether the timestamps are sorted in non-decreasing order. If True, "
+                    "readers may use binary search to find the timestamps in a time window. Written by the API when "
+                    "the file is written."
+                ),
+                required=False,
+            ),
         ],
     )
 
@@ -91,6 +101,28 @@ def main():
                 doc="The meaning of the value in the parent CategoricalVectorData object.",
             ),
         ],
+        attributes=[
+            NWBAttributeSpec(
+                name="content_hash",
+                dtype="text",
+                doc=(
+                    "Optional hash of the contents of the 'value' and 'meaning' columns, used to identify identical "
+                    "MeaningsTable objects across EventsTables and files without reading them. Written by the API "
+                    "when the file is written."
+                ),
+                required=False,
+            ),
+            NWBAttributeSpec(
+                name="row_index_num_events",
+                dtype="int",
+                doc=(
+                    "Optional number of rows of the EventsTable when the row indexes stored in this table, i.e., the "
+                    "ragged '<column>_rows' columns listing the rows of the EventsTable that have each value, were "
+                    "built. The row indexes are only used if the EventsTable still has this number of rows."
+                ),
+                required=False,
+            ),
+        ],
     )
 
     categorical_vector_data = NWBDatasetSpec(
@@ -126,6 +158,60 @@ def main():
                 shape=[None],
                 required=False,
             ),
+            NWBAttributeSpec(
+                name="value_counts",
+                doc=(
+                    "Optional precomputed number of occurrences of each value in the 'value' column of the "
+                    "referenced MeaningsTable, in the same order as that column. Values in the data that are not "
+                    "listed in the MeaningsTable are not counted. Written by the API when the file is written."
+                ),
+                dtype="int",
+                dims=["num_values"],
+                shape=[None],
+                required=False,
+            ),
+        ],
+    )
+
+    event_counts = NWBDatasetSpec(
+        neurodata_type_def="EventCounts",
+        neurodata_type_inc="NWBData",
+        doc=(
+            "A multi-resolution pyramid of the number of events in consecutive time bins, used to quickly render the "
+            "density of events at any zoom level. Level k of the pyramid has bins of width 'bin_width' * 2^k seconds, "
+            "starting at 'start_time'. The levels are concatenated along the first dimension, from the finest "
+            "(level 0) to the coarsest level, and the rows of level k are stored at "
+            "'level_offsets[k]:level_offsets[k+1]'. The first column stores the total number of events in each bin. "
+            "If 'category_column' is set, the remaining columns store the number of events with each value in the "
+            "'value' column of the MeaningsTable of that CategoricalVectorData column, in the same order."
+        ),
+        dtype="int",
+        dims=["num_bins", "num_counts"],
+        shape=[None, None],
+        attributes=[
+            NWBAttributeSpec(
+                name="start_time",
+                dtype="float",
+                doc="The start time of the first bin of every level, in seconds.",
+            ),
+            NWBAttributeSpec(
+                name="bin_width",
+                dtype="float",
+                doc="The width of the bins of the finest level (level 0), in seconds.",
+            ),
+            NWBAttributeSpec(
+                name="level_offsets",
+                dtype="int",
+                doc="The index of the first row of each level, followed by the total number of rows.",
+                dims=["num_levels_plus_one"],
+                shape=[None],
+            ),
+            NWBAttributeSpec(
+                name="category_column",
+                dtype="text",
+                doc="Optional name of the CategoricalVectorData column by which the events are counted.",
+                required=False,
+            ),
         ],
     )
 
@@ -153,6 +239,48 @@ def main():
                 ),
                 quantity="?",
             ),
+            NWBDatasetSpec(
+                name="duration_values",
+                dtype="float64",
+                doc=(
+                    "Optional durations, in seconds, of the events listed in 'duration_rows', for tables in which few "
+                    "events have a duration. Used instead of the 'duration' column, which must then be absent: the "
+                    "duration of the event in row duration_rows[i] is duration_values[i], and the durations of the "
+                    "other events are NaN. This is not a column of the table."
+                ),
+                dims=["num_durations"],
+                shape=[None],
+                quantity="?",
+            ),
+            NWBDatasetSpec(
+                name="duration_rows",
+                dtype="int",
+                doc=(
+                    "Optional sorted indices of the rows whose durations are stored in 'duration_values'. Required if "
+                    "'duration_values' is present. This is not a column of the table."
+                ),
+                dims=["num_durations"],
+                shape=[None],
+                quantity="?",
+            ),
+            NWBDatasetSpec(
+                name="timestamp_order",
+                dtype="int",
+                doc=(
+                    "Optional permutation of the row indices that sorts the 'timestamp' column in non-decreasing "
+                    "order, i.e., the i-th earliest event is in row timestamp_order[i]. Used to find the events in a "
+                    "time window with binary search when the rows of the table are not sorted by timestamp."
+                ),
+                dims=["num_events"],
+                shape=[None],
+                quantity="?",
+            ),
+            NWBDatasetSpec(
+                name="event_counts",
+                neurodata_type_inc="EventCounts",
+                doc="Optional precomputed pyramid of the number of events in time bins at multiple resolutions.",
+                quantity="?",
+            ),
         ],
         groups=[
             # NOTE: the EventsTable will automatically become a MultiContainerInterface, so adjust the auto-generated
@@ -162,7 +290,9 @@ def main():
                 doc=(
                     "Lookup tables for the meanings of the values in any CategoricalVectorData columns. "
                     "The name of the table should be the name of the corresponding CategoricalVectorData column "
-                    'followed by "_meanings".'
+                    'followed by "_meanings". A MeaningsTable that is shared by CategoricalVectorData columns of '
+                    "multiple EventsTables in the same file is stored once, in one of the EventsTables, and "
+                    "referenced by all of the columns."
                 ),
                 quantity="*",
             ),
@@ -179,6 +309,45 @@ def main():
                     "how the event time is computed, e.g., as the rise time of the first bit."
                 ),
             ),
+            # NOTE: the following attributes are a precomputed summary of the table so that catalogs of many files
+            # can be built without reading the columns. They are written by the API when the file is written.
+            NWBAttributeSpec(
+                name="num_events",
+                dtype="int",
+                doc="Optional precomputed number of events (rows) in the table.",
+                required=False,
+            ),
+            NWBAttributeSpec(
+                name="min_timestamp",
+                dtype="float",
+                doc="Optional precomputed minimum value of the 'timestamp' column, in seconds.",
+                required=False,
+            ),
+            NWBAttributeSpec(
+                name="max_timestamp",
+                dtype="float",
+                doc="Optional precomputed maximum value of the 'timestamp' column, in seconds.",
+                required=False,
+            ),
+            NWBAttributeSpec(
+                name="duration_quantile_levels",
+                dtype="float",
+                doc="Optional quantile levels, between 0 and 1, at which 'duration_quantiles' were computed.",
+                dims=["num_quantiles"],
+                shape=[None],
+                required=False,
+            ),
+            NWBAttributeSpec(
+                name="duration_quantiles",
+                dtype="float",
+                doc=(
+                    "Optional precomputed quantiles of the non-NaN values of the 'duration' column, in seconds, at the "
+                    "levels given in 'duration_quantile_levels'."
+                ),
+                dims=["num_quantiles"],
+                shape=[None],
+                required=False,
+            ),
         ],
     )
 
@@ -209,6 +378,7 @@ def main():
         duration_vector_data,
         meanings_table,
         categorical_vector_data,
+        event_counts,
         events_table,
         ndx_events_nwb_file,
     ]